@@ -0,0 +1,134 @@
+import asset as _asset
+import numpy as np
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+'''
+Process based counterpart to Jet.map. Jet runs every job on a thread pool inside this process, so
+problems built from python ODEs or functions (which are not thread safe) serialize on the GIL.
+Here each job is instead built, run, and reduced to numpy arrays inside a worker process, and the arrays
+are handed back to the parent through shared memory.
+
+Only the generator form is supported since phases and optimal control problems cannot be pickled.
+The generator and its arguments must be picklable, ie: the generator must be a module level function.
+'''
+
+
+def DefaultExtract(prob):
+    '''
+    Returns [Traj,StaticParams] for a phase, or a list of those for each phase of an
+    optimal control problem.
+    '''
+    if(hasattr(prob,'Phases')):
+        return [DefaultExtract(phase) for phase in prob.Phases]
+    return [np.array(prob.returnTraj()),np.array(prob.returnStaticParams())]
+
+
+def _pack(res,arrays):
+    if(isinstance(res,(list,tuple))):
+        return [_pack(r,arrays) for r in res]
+    arrays.append(np.ascontiguousarray(res,dtype=np.float64))
+    return len(arrays)-1
+
+def _unpack(tree,arrays):
+    if(isinstance(tree,list)):
+        return [_unpack(t,arrays) for t in tree]
+    return arrays[tree]
+
+
+def _run_job(genfun,args,extract,i):
+    prob = genfun(*args)
+    flag = int(prob.jet_run())
+
+    arrays = []
+    tree = _pack(extract(prob),arrays)
+    del prob
+
+    shapes  = [a.shape for a in arrays]
+    offsets = np.cumsum([0]+[a.size for a in arrays])
+
+    # Shared memory blocks can't be zero sized
+    shm = shared_memory.SharedMemory(create=True,size=max(8,8*int(offsets[-1])))
+    try:
+        buf = np.ndarray((offsets[-1],),dtype=np.float64,buffer=shm.buf)
+        for a,start,stop in zip(arrays,offsets[0:-1],offsets[1:]):
+            buf[start:stop] = a.ravel()
+        del buf
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+    name = shm.name
+    shm.close()
+
+    return i,flag,name,tree,shapes
+
+
+def _collect(name,tree,shapes):
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        offsets = np.cumsum([0]+[int(np.prod(s)) for s in shapes])
+        buf = np.ndarray((offsets[-1],),dtype=np.float64,buffer=shm.buf)
+        arrays = [buf[start:stop].reshape(shape).copy() for shape,start,stop in zip(shapes,offsets[0:-1],offsets[1:])]
+        del buf
+    finally:
+        shm.close()
+        shm.unlink()
+    return _unpack(tree,arrays)
+
+
+def _discard(future):
+    # Frees the shared memory of a finished job whose result was never collected
+    if(future.cancelled() or not future.done() or future.exception() is not None):
+        return
+    try:
+        shm = shared_memory.SharedMemory(name=future.result()[2])
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def map_processes(genfun,args,nprocs,extract = DefaultExtract,callback = None,context = 'spawn'):
+    '''
+    Builds and runs genfun(*args[i]) with its JetJobMode in a pool of nprocs processes.
+
+    extract(prob) runs in the worker and must return an array or a (nested) list of arrays. By default
+    it returns the trajectories and static parameters of every phase.
+
+    If callback is None, returns a list of (flag,result) in the same order as args. Otherwise
+    callback(i,flag,result) is called as each job finishes and nothing is returned.
+
+    The spawn context is used by default since forking a process with live MKL/solver threads is not safe.
+
+    If a job or the callback raises, the remaining jobs are cancelled, the exception is re-raised once
+    the running ones finish, and the shared memory of any results that were not collected is freed.
+    '''
+
+    results = [None]*len(args) if callback is None else None
+
+    pool = ProcessPoolExecutor(max_workers=nprocs,mp_context=mp.get_context(context))
+    futures = []
+    collected = set()
+    try:
+        futures = [pool.submit(_run_job,genfun,tuple(arg),extract,i) for i,arg in enumerate(args)]
+        for future in as_completed(futures):
+            collected.add(future)
+            i,flag,name,tree,shapes = future.result()
+            flag = _asset.Solvers.ConvergenceFlags(flag)
+            res  = _collect(name,tree,shapes)
+            if(callback is None):
+                results[i] = (flag,res)
+            else:
+                callback(i,flag,res)
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown(wait=True)
+        for future in futures:
+            if(future not in collected):
+                _discard(future)
+
+    return results
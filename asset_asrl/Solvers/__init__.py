@@ -15,6 +15,8 @@ PSIOPT = _asset.Solvers.PSIOPT
 QPOrderingModes = _asset.Solvers.QPOrderingModes
 QPPivotModes = _asset.Solvers.QPPivotModes
 
+from .JetProcesses import map_processes
+
 if __name__ == "__main__":
     mlist = inspect.getmembers(_asset.Solvers)
     for m in mlist:print(m[0],'= _asset.Solvers.'+str(m[0]))
@@ -0,0 +1,49 @@
+import numpy as np
+import asset_asrl as ast
+
+vf        = ast.VectorFunctions
+oc        = ast.OptimalControl
+Args      = vf.Arguments
+
+'''
+Cart pole problem shared by the Jet tests. The generator is module level so that it can
+be pickled for the worker processes of map_processes.
+'''
+
+class CartPole(oc.ODEBase):
+    def __init__(self,l,m1,m2,g):
+        args = oc.ODEArguments(4,1)
+        q1,q2,q1d,q2d = args.XVec().tolist()
+        u = args.UVar(0)
+
+        q1dd = (l*m2*vf.sin(q2)*(q2d**2) + u + m2*g*vf.cos(q2)*vf.sin(q2))/( m1 + m2*((1-vf.cos(q2)**2)))
+        q2dd = -1*(l*m2*vf.cos(q2)*vf.sin(q2)*(q2d**2) +u*vf.cos(q2) +(m1*g+m2*g)*vf.sin(q2))/( l*m1 + l*m2*((1-vf.cos(q2)**2)))
+        ode = vf.stack([q1d,q2d,q1dd,q2dd])
+        super().__init__(ode,4,1)
+
+
+def ControlCost(u,w):
+    return np.array([w*u[0]**2])
+
+
+def ProblemGenerator(d,nsegs=32,pyobjective=False):
+    '''
+    Cart pole swing up to a final position d. If pyobjective is True, the control effort
+    objective is a vf.PyScalarFunction, so the phase owns python objects.
+    '''
+    tf = 2.0
+    ts = np.linspace(0,tf,100)
+    IG = [[d*t/tf,np.pi*t/tf,0,0,t,.00] for t in ts]
+
+    phase = CartPole(.5,1,.3,9.81).phase("LGL5",IG,nsegs)
+    phase.addBoundaryValue("Front",range(0,5),[0,0,0,0,0])
+    phase.addBoundaryValue("Back",range(0,5),[d,np.pi,0,0,tf])
+    phase.addLUVarBound("Path",5,-20,20,1.0)
+    phase.addLUVarBound("Path",0,-2,2,1.0)
+    if(pyobjective):
+        phase.addIntegralObjective(vf.PyScalarFunction(1,ControlCost,args=(1.0,)),[5])
+    else:
+        phase.addIntegralObjective(Args(1)[0]**2,[5])
+    phase.optimizer.PrintLevel = 3
+    phase.setJetJobMode("optimize")
+    return phase
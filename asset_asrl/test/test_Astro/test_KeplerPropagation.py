@@ -0,0 +1,84 @@
+import numpy as np
+import asset_asrl as ast
+import unittest
+
+Astro = ast.Astro
+
+
+def RandomStates(n, seed, vmax=1.8):
+    # Mix of elliptic and hyperbolic orbits about mu = 1, only elliptic if vmax < sqrt(2)
+    rng = np.random.default_rng(seed)
+    RVs = np.zeros((n, 6))
+    for i in range(n):
+        r = rng.uniform(0.8, 1.5)
+        v = rng.uniform(0.5, vmax)*np.sqrt(1.0/r)
+        R = rng.normal(size=3)
+        V = rng.normal(size=3)
+        RVs[i, 0:3] = r*R/np.linalg.norm(R)
+        RVs[i, 3:6] = v*V/np.linalg.norm(V)
+    dts = rng.uniform(-3.0, 3.0, n)
+    return RVs, dts
+
+
+class test_KeplerPropagation(unittest.TestCase):
+
+    def test_PropagateArray(self):
+        # An odd count so that packs and leftover states both occur, and shift with the thread count
+        n = 53
+        mu = 1.0
+        RVs, dts = RandomStates(n, 11)
+
+        Ref = np.array([Astro.propagate_cartesian(RVs[i], dts[i], mu) for i in range(n)])
+
+        Base = np.zeros((n, 6))
+        Astro.propagate_cartesian(RVs, dts, mu, Base, 1, False, 1)
+        self.assertLess(abs(Base - Ref).max(), 1.0e-9)
+
+        for axis in [0, 1]:
+            for vectorize in [True, False]:
+                for thrs in [1, 3, 4]:
+                    with self.subTest(axis=axis, vectorize=vectorize, thrs=thrs):
+                        if axis == 0:
+                            X0s = np.copy(RVs.T)
+                            Xfs = np.zeros((6, n))
+                        else:
+                            X0s = np.copy(RVs)
+                            Xfs = np.zeros((n, 6))
+                        Astro.propagate_cartesian(X0s, dts, mu, Xfs, axis, vectorize, thrs)
+                        if axis == 0:
+                            Xfs = Xfs.T
+                        # Every state must get the same answer wherever it lands in a pack
+                        self.assertLess(abs(Xfs - Base).max(), 1.0e-12)
+
+    def element_test(self, prop, convert, n):
+        mu = 1.0
+        RVs, dts = RandomStates(n, 12, 1.3)
+        Elems = np.array([convert(RV, mu) for RV in RVs])
+
+        Ref = np.array([prop(Elems[i], dts[i], mu) for i in range(n)])
+
+        for axis in [0, 1]:
+            for vectorize in [True, False]:
+                for thrs in [1, 3]:
+                    with self.subTest(axis=axis, vectorize=vectorize, thrs=thrs):
+                        if axis == 0:
+                            X0s = np.copy(Elems.T)
+                            Xfs = np.zeros((6, n))
+                        else:
+                            X0s = np.copy(Elems)
+                            Xfs = np.zeros((n, 6))
+                        prop(X0s, dts, mu, Xfs, axis, vectorize, thrs)
+                        if axis == 0:
+                            Xfs = Xfs.T
+                        self.assertLess(abs(Xfs - Ref).max(), 1.0e-9)
+
+    def test_PropagateClassicArray(self):
+        self.element_test(Astro.propagate_classic, Astro.cartesian_to_classic, 53)
+
+    def test_PropagateModifiedArray(self):
+        # No vectorized propagator, so vectorize = True must fall back to the scalar one
+        self.element_test(Astro.propagate_modified, Astro.cartesian_to_modified, 53)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
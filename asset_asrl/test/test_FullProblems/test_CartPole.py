@@ -1,6 +1,10 @@
 import numpy as np
 import asset as ast
 import unittest
+import os
+import shutil
+import tempfile
+import time
 
 vf = ast.VectorFunctions
 oc = ast.OptimalControl
@@ -39,7 +43,7 @@ class test_CartPole(unittest.TestCase):
         self.MaxObjError = .1
         self.MaximumIters = 20
         
-    def problem_impl(self,tmode,cmode,nsegs):
+    def make_phase(self,tmode,cmode,nsegs,sparse=False):
         m1 = 1
         m2 =.3
         l=.5
@@ -59,12 +63,17 @@ class test_CartPole(unittest.TestCase):
         
         phase = ode.phase(tmode,IG,nsegs)
         phase.setControlMode(cmode)
+        phase.EnableSparsityDetection = sparse
         phase.addBoundaryValue("Front",range(0,5),[0,0,0,0,0])
         phase.addBoundaryValue("Back",range(0,5),[d,np.pi,0,0,tf])
         phase.addLUVarBound("Path",5,-umax,umax,1.0)
         phase.addLUVarBound("Path",0,-dmax,dmax,1.0)
         phase.addIntegralObjective(Args(1)[0]**2,[5])    
         phase.optimizer.PrintLevel= 3
+        return phase
+        
+    def problem_impl(self,tmode,cmode,nsegs,sparse=False):
+        phase = self.make_phase(tmode,cmode,nsegs,sparse)
         Flag = phase.optimize()
         
         Obj = phase.optimizer.LastObjVal
@@ -89,6 +98,256 @@ class test_CartPole(unittest.TestCase):
                     self.problem_impl(tmode,"HighestOrderSpline",nseg)
                 with self.subTest(cmode="BlockConstant"):
                     self.problem_impl(tmode,"BlockConstant",nseg)
+                    
+    def test_SparsityDetection(self):
+        
+        tmodes = ["LGL3","LGL5","Trapezoidal","CentralShooting"]
+        nsegs  = [256   ,128   ,256,256]
+        for tmode,nseg in zip(tmodes,nsegs):
+            with self.subTest(TranscriptionMode=tmode):
+                self.problem_impl(tmode,"HighestOrderSpline",nseg,True)
+
+    def test_LockFreeKKT(self):
+        
+        # Clashing KKT elements only exist with several threads
+        Trajs = []
+        Iters = []
+        for lockfree in [False,True]:
+            with self.subTest(LockFreeKKT=lockfree):
+                phase = self.make_phase("LGL5","HighestOrderSpline",128)
+                phase.setThreads(8,8)
+                phase.optimizer.LockFreeKKT = lockfree
+                Flag = phase.optimize()
+                self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+                Trajs.append(np.array(phase.returnTraj()))
+                Iters.append(phase.optimizer.LastIterNum)
+                
+        self.assertEqual(Iters[0],Iters[1])
+        self.assertLess(abs(Trajs[0]-Trajs[1]).max(), 1.0e-8)
+        
+    def test_AutoThreads(self):
+        
+        Defaults = self.make_phase("LGL5","HighestOrderSpline",64)
+        FuncDefault = Defaults.Threads
+        QPDefault = Defaults.optimizer.QPThreads
+        
+        Ref = self.make_phase("LGL5","HighestOrderSpline",1024)
+        Ref.setThreads(FuncDefault,QPDefault)
+        Ref.optimize()
+        
+        phase = self.make_phase("LGL5","HighestOrderSpline",1024)
+        phase.setThreads(1,1)
+        phase.setThreads("auto")
+        # Nothing is profiled until transcription, so the defaults apply until then
+        self.assertEqual(phase.Threads,FuncDefault)
+        self.assertEqual(phase.optimizer.QPThreads,QPDefault)
+        
+        Flag = phase.optimize()
+        self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+        self.assertGreaterEqual(phase.Threads,1)
+        self.assertLessEqual(phase.Threads,FuncDefault)
+        # A KKT matrix this size must not be forced onto one QP thread
+        self.assertEqual(phase.optimizer.QPThreads>1,QPDefault>1)
+        self.assertLess(abs(np.array(phase.returnTraj())-np.array(Ref.returnTraj())).max(), 1.0e-8)
+        
+    def test_WarmStart(self):
+        
+        phase = self.make_phase("LGL5","HighestOrderSpline",128)
+        phase.optimize()
+        Sol = np.array(phase.returnTraj())
+        
+        Pert = np.copy(Sol)
+        rng = np.random.default_rng(9)
+        Pert[:,0:4] += 1.0e-3*rng.standard_normal((len(Pert),4))
+        Pert[:,5]   += 1.0e-2*rng.standard_normal(len(Pert))
+        
+        Iters = []
+        for warm in [False,True]:
+            with self.subTest(WarmStart=warm):
+                phase = self.make_phase("LGL5","HighestOrderSpline",128)
+                phase.optimize()
+                phase.setTraj(Pert,128)
+                phase.optimizer.WarmStart = warm
+                Flag = phase.optimize()
+                self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+                self.assertLess(abs(np.array(phase.returnTraj())-Sol).max(), 1.0e-6)
+                Iters.append(phase.optimizer.LastIterNum)
+        self.assertLess(Iters[1],Iters[0])
+        
+        opt = phase.optimizer
+        Slacks = np.array(opt.LastSlacks)
+        Slacks[0] = np.nan
+        with self.assertRaises(ValueError):
+            opt.setWarmStart(opt.LastEqLmults,opt.LastIqLmults,Slacks,opt.LastMu)
+        
+    def test_ReuseQPanalysis(self):
+        
+        Ref = self.make_phase("LGL5","HighestOrderSpline",128)
+        Ref.setThreads(2,2)
+        Ref.optimize()
+        Sol = np.array(Ref.returnTraj())
+        self.assertFalse(Ref.optimizer.LastStats.ReusedAnalysis)
+        
+        # Each case re-transcribes the phase with an identical KKT pattern before solving again
+        for reuse,qpthreads,expected in [(True,2,True),(False,2,False),(True,1,False)]:
+            with self.subTest(ReuseQPanalysis=reuse,QPThreads=qpthreads):
+                phase = self.make_phase("LGL5","HighestOrderSpline",128)
+                phase.setThreads(2,2)
+                phase.optimizer.ReuseQPanalysis = reuse
+                phase.optimize()
+                phase.setThreads(2,qpthreads)
+                phase.setTraj(np.array(phase.returnTraj()),128)
+                Flag = phase.optimize()
+                self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+                self.assertEqual(phase.optimizer.LastStats.ReusedAnalysis,expected)
+                self.assertLess(abs(np.array(phase.returnTraj())-Sol).max(), 1.0e-8)
+        
+    def test_BalanceThreads(self):
+        
+        Ref = self.make_phase("LGL5","HighestOrderSpline",128)
+        Ref.setThreads(1,1)
+        Ref.optimize()
+        Sol = np.array(Ref.returnTraj())
+        
+        # Rebalancing only moves work between threads, so the solution must not change
+        for nthreads in [2,5,8]:
+            for balance in [False,True]:
+                with self.subTest(Threads=nthreads,BalanceThreads=balance):
+                    phase = self.make_phase("LGL5","HighestOrderSpline",128)
+                    phase.setThreads(nthreads,1)
+                    phase.optimizer.BalanceThreads = balance
+                    Flag = phase.optimize()
+                    self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+                    self.assertLess(abs(np.array(phase.returnTraj())-Sol).max(), 1.0e-8)
+                    
+                    # A second solve on the balanced NLP must agree as well
+                    phase.setTraj(np.array(Ref.returnTraj()),128)
+                    Flag = phase.optimize()
+                    self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+                    self.assertLess(abs(np.array(phase.returnTraj())-Sol).max(), 1.0e-8)
+        
+    def test_SolveStats(self):
+        
+        phase = self.make_phase("LGL5","HighestOrderSpline",128)
+        phase.setThreads(2,2)
+        
+        for method in ["optimize","solve_optimize"]:
+            with self.subTest(method=method):
+                t0 = time.perf_counter()
+                getattr(phase,method)()
+                wall = time.perf_counter()-t0
+                
+                stats = phase.optimizer.LastStats
+                its = stats.Iterates
+                
+                # Stats are reset by every call rather than accumulated
+                self.assertEqual(stats.Iterations,len(its))
+                self.assertEqual(stats.Iterations,phase.optimizer.LastIterNum)
+                self.assertGreaterEqual(stats.Factorizations,stats.Iterations)
+                self.assertEqual(stats.Factorizations,sum(it.Factorizations for it in its))
+                self.assertEqual(stats.LSIters,sum(it.LSiters for it in its))
+                
+                parts = ['EvalTime','AssemblyTime','FactorTime','SolveTime','LSTime','CallBackTime']
+                for name in parts:
+                    total = getattr(stats,name)
+                    self.assertGreaterEqual(total,0.0)
+                    self.assertAlmostEqual(total,sum(getattr(it,name) for it in its),delta=1.0e-9)
+                self.assertGreater(stats.EvalTime,0.0)
+                self.assertGreater(stats.FactorTime,0.0)
+                
+                for it in its:
+                    self.assertLessEqual(sum(getattr(it,name) for name in parts),it.IterTime+1.0e-6)
+                
+                # Every component is part of the total, with the remainder reported as MiscTime
+                accounted = stats.PreTime+sum(getattr(stats,name) for name in parts)
+                self.assertAlmostEqual(stats.TotalTime,accounted+stats.MiscTime,delta=1.0e-9)
+                self.assertGreaterEqual(stats.MiscTime,-1.0e-6)
+                self.assertLessEqual(stats.TotalTime,wall)
+        
+    def test_PhaseArrays(self):
+        
+        phase = self.make_phase("LGL5","HighestOrderSpline",64)
+        phase.optimize()
+        
+        # Array returns must hold exactly what the list returns do
+        pairs = [(phase.returnTraj(),phase.returnTrajArray()),
+                 (phase.returnCostateTraj(),phase.returnCostateTrajArray())]
+        for i in range(2):
+            pairs.append((phase.returnEqualConLmults(i),phase.returnEqualConLmultsArray(i)))
+            pairs.append((phase.returnEqualConVals(i),phase.returnEqualConValsArray(i)))
+            pairs.append((phase.returnInequalConLmults(i),phase.returnInequalConLmultsArray(i)))
+            pairs.append((phase.returnInequalConVals(i),phase.returnInequalConValsArray(i)))
+        for k,(lst,arr) in enumerate(pairs):
+            with self.subTest(k=k):
+                self.assertEqual(arr.shape,(len(lst),len(lst[0])))
+                self.assertTrue(np.array_equal(arr,np.array(lst)))
+        
+        TrajA = phase.returnTrajArray()
+        Wide = np.zeros((TrajA.shape[0],2*TrajA.shape[1]))
+        Wide[:,::2] = TrajA
+        Inputs = {"list":[np.copy(x) for x in TrajA],
+                  "row major":np.ascontiguousarray(TrajA),
+                  "column major":np.asfortranarray(TrajA),
+                  "strided":Wide[:,::2],
+                  "reversed rows":np.flipud(np.flipud(TrajA).copy())}
+        
+        Ref = self.make_phase("LGL5","HighestOrderSpline",64)
+        Ref.setTraj(Inputs["list"],64)
+        RefTraj = Ref.returnTrajArray()
+        for name,Input in Inputs.items():
+            with self.subTest(setTraj=name):
+                other = self.make_phase("LGL5","HighestOrderSpline",64)
+                other.setTraj(Input,64)
+                self.assertTrue(np.array_equal(other.returnTrajArray(),RefTraj))
+                Flag = other.optimize()
+                self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+                self.assertLess(abs(other.returnTrajArray()-TrajA).max(), 1.0e-8)
+        
+    def test_SparsityCache(self):
+        
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree,tmpdir,True)
+        
+        def solve(cachedir):
+            phase = self.make_phase("LGL5","HighestOrderSpline",64)
+            phase.setThreads(4,4)
+            phase.optimizer.SparsityCacheDir = cachedir
+            Flag = phase.optimize()
+            self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED)
+            return np.array(phase.returnTraj()),phase.optimizer.LastStats.CachedSparsity
+        
+        Ref,Cached = solve("")
+        self.assertFalse(Cached)
+        
+        with self.subTest("Write then load"):
+            Traj,Cached = solve(tmpdir)
+            self.assertLess(abs(Traj-Ref).max(), 1.0e-10)
+            self.assertFalse(Cached)
+            files = os.listdir(tmpdir)
+            self.assertEqual(len(files),1)
+            Traj,Cached = solve(tmpdir)
+            self.assertLess(abs(Traj-Ref).max(), 1.0e-10)
+            self.assertTrue(Cached)
+            
+        with self.subTest("Corrupt file"):
+            # Out of range indices past the header must be rejected and the file rewritten
+            path = os.path.join(tmpdir,files[0])
+            with open(path,'r+b') as f:
+                f.seek(-64,os.SEEK_END)
+                f.write(b'\x7f'*64)
+            Traj,Cached = solve(tmpdir)
+            self.assertLess(abs(Traj-Ref).max(), 1.0e-10)
+            self.assertFalse(Cached)
+            Traj,Cached = solve(tmpdir)
+            self.assertLess(abs(Traj-Ref).max(), 1.0e-10)
+            self.assertTrue(Cached)
+            self.assertEqual(os.listdir(tmpdir),files)
+            
+        with self.subTest("Missing directory"):
+            # An unusable cache directory only warns
+            Traj,Cached = solve(os.path.join(tmpdir,'missing'))
+            self.assertLess(abs(Traj-Ref).max(), 1.0e-10)
+            self.assertFalse(Cached)
 
 
 ##############################################################################        
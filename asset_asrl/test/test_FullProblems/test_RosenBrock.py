@@ -26,7 +26,7 @@ class test_RosenBrock(unittest.TestCase):
         self.KnownSol = np.array([1,1])
         self.MaximumIters = 25
         
-    def problem_impl(self,con,lsmode):
+    def problem_impl(self,con,lsmode,hessmode="EXACT",maxiters=None):
         Ipoint = [-1,-1]
         
         
@@ -35,6 +35,7 @@ class test_RosenBrock(unittest.TestCase):
         prob.addObjective(RosenBrockObj(),[0,1])
         prob.addInequalCon(con, [0,1])
         prob.optimizer.set_OptLSMode(lsmode)
+        prob.optimizer.set_HessianMode(hessmode)
         prob.optimizer.PrintLevel = 3
         Flag = prob.optimize()
         Fpoint = prob.returnVars()
@@ -45,7 +46,9 @@ class test_RosenBrock(unittest.TestCase):
         self.assertEqual(Flag,ast.Solvers.ConvergenceFlags.CONVERGED, 
                          "Problem did not converge")
         
-        self.assertLess(prob.optimizer.LastIterNum, self.MaximumIters,
+        if maxiters is None:
+            maxiters = self.MaximumIters
+        self.assertLess(prob.optimizer.LastIterNum, maxiters,
                          "Optimizer iterations exceeded expected maximum")
         
         self.assertLess(SolError, 1.0e-5,
@@ -56,6 +59,12 @@ class test_RosenBrock(unittest.TestCase):
         for lsmode in lsmodes:
             with self.subTest(LineSearchMode = lsmode):
                 self.problem_impl(DiskCon(), lsmode)
+
+    def test_QuasiNewtonHessian(self):
+        # BFGS needs more iterations than Newton, but must reach the same solution
+        for lsmode in ["AUGLANG","L1"]:
+            with self.subTest(LineSearchMode = lsmode):
+                self.problem_impl(DiskCon(), lsmode, "QN", 150)
             
         
         
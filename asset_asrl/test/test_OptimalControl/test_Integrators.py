@@ -77,6 +77,15 @@ class CauchyEulerODE(oc.ode_x.ode):
             
         return xs,xdots,ts
     
+class VanDerPolODE(oc.ode_x.ode):
+    def __init__(self,eps):
+        
+        y1,y2 = oc.ODEArguments(2).XVec().tolist()
+        
+        ode = vf.stack([y2, ((1.0 - y1**2)*y2 - y1)/eps])
+        
+        super().__init__(ode,2)
+        
 class QuatModel(oc.ode_7_3.ode):
     def __init__(self,I):
         Xvars = 7
@@ -148,6 +157,38 @@ class test_Integrators(unittest.TestCase):
             plt.show()
 
         
+    def test_DenseTable(self):
+        '''
+        Tests: Dense output table against integrate_dense and direct integration
+        '''
+        abstol = 1.0e-12
+        errtol = 1.0e-6
+        n = 200
+
+        tf = 2.0
+        X0 = np.array([1,1,1,0])
+        ode = LorenzODE(10.0, 28.0, 8.0/3.0)
+
+        integ = ode.integrator(.001)
+        integ.setAbsTol(abstol)
+        integ.Adaptive=True
+
+        Tab = integ.integrate_dense_table(X0,tf)
+        Traj = integ.integrate_dense(X0,tf,n)
+
+        for X in Traj:
+            Err = np.linalg.norm(Tab.Interpolate(X[3])[0:3]-X[0:3])
+            self.assertLess(Err, errtol,
+                            "Table does not match integrate_dense")
+
+        ts = np.random.default_rng(7).uniform(0.0, tf, 25)
+        for t in ts:
+            Xt = integ.integrate(X0,t)
+            Err = np.linalg.norm(Tab.Interpolate(t)[0:3]-Xt[0:3])
+            self.assertLess(Err, errtol,
+                            "Table does not match direct integration")
+
+        
     def test_CauchyEuler(self):
         '''
         Tests: Adaptive Integration of non-autonomous ODEs
@@ -299,6 +340,95 @@ class test_Integrators(unittest.TestCase):
             self.assertLess(Jerr, Jtol,
                              "STM Integration Error exceeds expected maximum")
             
+        integ.VariationalSTM = True
+        Xf,STM = integ.integrate_stm(X0,tf)
+        
+        Xerr = np.linalg.norm(Xf[0:6]-fx)
+        Jerr = abs(STM[0:6,0:6]-jx[0:6,0:6]).max()
+        
+        with self.subTest('Variational'):
+            self.assertLess(Xerr, Xtol,
+                             "State Integration Error exceeds expected maximum")
+            self.assertLess(Jerr, Jtol,
+                             "STM Integration Error exceeds expected maximum")
+            
+    def test_StiffSDIRK(self):
+        '''
+        Tests: Implicit integration of stiff ODEs, STMs of implicit steps
+        '''
+        ode = VanDerPolODE(1.0e-6)
+        
+        integ = ode.integrator("SDIRK43",1.0e-6)
+        integ.setAbsTol(1.0e-7)
+        integ.setRelTol(1.0e-7)
+        integ.setStepSizes(1.0e-6,1.0e-12,1.0)
+        
+        X0 = np.array([2.0,-0.66,0.0])
+        Xf = integ.integrate(X0,2.0)
+        
+        # Hairer and Wanner reference solution
+        XF = np.array([1.706167732170483,-0.8928097010248125])
+        
+        Err = np.linalg.norm(XF-Xf[0:2])
+        
+        self.assertLess(Err, 1.0e-5,
+                         "Integration Error exceeds expected maximum")
+        
+        ode = ast.Astro.Kepler.ode(1)
+        kprop = ast.Astro.Kepler.KeplerPropagator(1.0) # Ground Truth
+        
+        integ = ode.integrator("SDIRK43",.01)
+        integ.setAbsTol(1.0e-11)
+        
+        X0 = np.zeros((7))
+        X0[0]=1
+        X0[4]=1.35
+        X0[5]=.1
+        tf = 3
+        
+        KX = np.copy(X0)
+        KX[6]=tf
+        fx,jx = kprop.vf().computeall(KX,np.ones((6)))[0:2]
+        
+        Xf,STM = integ.integrate_stm(X0,tf)
+        
+        with self.subTest('Serial'):
+            self.assertLess(np.linalg.norm(Xf[0:6]-fx), 1.0e-8,
+                             "State Integration Error exceeds expected maximum")
+            self.assertLess(abs(STM[0:6,0:6]-jx[0:6,0:6]).max(), 1.0e-7,
+                             "STM Integration Error exceeds expected maximum")
+        
+        Results = integ.integrate_stm([X0]*3,np.array([tf]*3))
+        
+        with self.subTest('Batch'):
+            for Xfi,STMi in Results:
+                self.assertLess(np.linalg.norm(Xfi-Xf), 1.0e-12)
+                self.assertLess(abs(STMi-STM).max(), 1.0e-12)
+            
+    def test_FixedStepSDIRK(self):
+        '''
+        Tests: Fixed step implicit integration, failure of non-convergent implicit steps
+        '''
+        # x' = x^2, with x = 1/(1/x0 - t)
+        x,y = oc.ODEArguments(2).XVec().tolist()
+        ode = oc.ode_x.ode(vf.stack([x**2, -y]),2)
+        
+        integ = ode.integrator("SDIRK43",.01)
+        integ.Adaptive = False
+        
+        X0 = np.array([0.5,1.0,0.0])
+        Xf = integ.integrate(X0,1.0)
+        
+        self.assertLess(abs(Xf[0]-1.0), 1.0e-7)
+        self.assertLess(abs(Xf[1]-np.exp(-1.0)), 1.0e-7)
+        self.assertEqual(Xf[2], 1.0)
+        
+        # Stage equation x = 1 + gamma*h*x^2 has no real solution for this step
+        integ = ode.integrator("SDIRK43",1.5)
+        integ.Adaptive = False
+        with self.assertRaises(RuntimeError):
+            integ.integrate(np.array([1.0,1.0,0.0]),1.5)
+            
     def test_EventDetection(self):
         
         r  = 1.0
@@ -368,8 +498,27 @@ class test_Integrators(unittest.TestCase):
                 
                 self.assertLess(Fxerr, integ.EventTol,
                                  "Event root error exceeds tolerance")
-                
-                
+
+
+        tfs = np.linspace(tf/4,tf,11)
+        X0t0s = [X0t0]*len(tfs)
+
+        BatchRets = integ.integrate(X0t0s,tfs,Events)
+
+        for tfi,(Xfb,EventLocsb) in zip(tfs,BatchRets):
+            Xfs, EventLocss = integ.integrate(X0t0,tfi,Events)
+
+            self.assertLess(np.linalg.norm(Xfb-Xfs), 1.0e-10,
+                             "Batch and single event final states are different")
+
+            for i in range(0,len(EventLocss)):
+                self.assertTrue(len(EventLocsb[i])==len(EventLocss[i]))
+                for j in range(0,len(EventLocss[i])):
+                    Xerr = np.linalg.norm(EventLocsb[i][j][0:6]-EventLocss[i][j][0:6])
+                    self.assertLess(Xerr, 1.0e-10,
+                                     "Batch and single event states are different")
+
+
         
         
     def test_BatchCalls1(self):
@@ -498,7 +647,54 @@ class test_Integrators(unittest.TestCase):
                         
                         self.assertLess(Herr, Htol,
                                          "Hessian Integration Error exceeds expected maximum")
-                    
+
+
+    def test_ParallelBatch(self):
+
+        ode = ast.Astro.Kepler.ode(1)
+
+        integ = ode.integrator(.01)
+        integ.setAbsTol(1.0e-13)
+
+        def ApseFunc():
+            R,V = Args(7).tolist([(0,3),(3,3)])
+            return R.dot(V)
+
+        Events = [(ApseFunc(),1,1),(ApseFunc(),-1,0)]
+
+        X0 = np.zeros((7))
+        X0[0]=1
+        X0[4]=1.1
+
+        for batchsize in [1,7,100,1001]:
+
+            tfs = np.linspace(5,15,batchsize)
+            X0s = [X0]*batchsize
+
+            for nthreads in [1,3,8]:
+
+                integ.VectorizeBatchCalls = False
+                Xfs1  = integ.integrate_parallel(X0s,tfs,nthreads)
+                Rets1 = integ.integrate_parallel(X0s,tfs,Events,nthreads)
+
+                integ.VectorizeBatchCalls = True
+                Xfs2  = integ.integrate_parallel(X0s,tfs,nthreads)
+                Rets2 = integ.integrate_parallel(X0s,tfs,Events,nthreads)
+
+                for Xf1,Xf2,Ret1,Ret2 in zip(Xfs1,Xfs2,Rets1,Rets2):
+
+                    self.assertLess(np.linalg.norm(Xf1-Xf2), 1.0e-10,
+                                     "Vectorized parallel integration differs from per trajectory integration")
+
+                    self.assertLess(np.linalg.norm(Ret1[0]-Ret2[0]), 1.0e-10,
+                                     "Vectorized parallel event integration differs from per trajectory integration")
+
+                    for Locs1,Locs2 in zip(Ret1[1],Ret2[1]):
+                        self.assertTrue(len(Locs1)==len(Locs2))
+                        for L1,L2 in zip(Locs1,Locs2):
+                            self.assertLess(np.linalg.norm(L1-L2), 1.0e-10,
+                                             "Vectorized parallel event states differ from per trajectory integration")
+
 
             
             
@@ -0,0 +1,59 @@
+import numpy as np
+import asset as ast
+import unittest
+
+vf = ast.VectorFunctions
+oc = ast.OptimalControl
+
+
+def UnevenTraj(n):
+    # Clustered near t = 0 so that many data blocks fall inside one resampled block
+    ts = 10.0*np.linspace(0.0, 1.0, n)**2
+    return [np.array([np.sin(t), np.cos(t), t]) for t in ts]
+
+
+class test_LGLInterpTable(unittest.TestCase):
+
+    def test_UnevenData(self):
+        Traj = UnevenTraj(801)
+        Dense = oc.LGLInterpTable(2, Traj, len(Traj) - 1)
+
+        ts = np.random.default_rng(5).uniform(0.0, 10.0, 300)
+
+        # Resampled onto fewer, wider blocks than the input data
+        for dnum in [40, 150]:
+            Tab = oc.LGLInterpTable(2, Traj, dnum)
+            for t in ts:
+                with self.subTest(dnum=dnum, t=t):
+                    ref = Dense.Interpolate(t)
+                    fx = Tab.Interpolate(t)
+                    self.assertLess(abs(ref[0:2] - np.array([np.sin(t), np.cos(t)])).max(), 1.0e-6)
+                    self.assertLess(abs(fx[0:2] - ref[0:2]).max(), 1.0e-4)
+
+    def test_Batch(self):
+        Traj = UnevenTraj(801)
+        rng = np.random.default_rng(6)
+        # Unsorted, with repeats, and enough points to be split over threads
+        ts = rng.uniform(0.0, 10.0, 3000)
+        ts[100:200] = ts[0]
+        tsorted = np.sort(ts)
+
+        for dnum in [len(Traj) - 1, 150]:
+            Tab = oc.LGLInterpTable(2, Traj, dnum)
+            Ref  = np.array([Tab.Interpolate(t) for t in ts])
+            dRef = np.array([Tab.InterpolateDeriv(t) for t in ts])
+            for nthreads in [1, 4]:
+                with self.subTest(dnum=dnum, nthreads=nthreads):
+                    fxs = Tab.Interpolate(ts, nthreads)
+                    self.assertEqual(fxs.shape, Ref.shape)
+                    self.assertLess(abs(fxs - Ref).max(), 1.0e-14)
+                    self.assertLess(abs(Tab(ts, nthreads=nthreads) - Ref).max(), 1.0e-14)
+                    self.assertLess(abs(Tab(tsorted, nthreads) - Ref[np.argsort(ts, kind='stable')]).max(), 1.0e-14)
+
+                    fxs, dfxs = Tab.InterpolateDeriv(ts, nthreads)
+                    self.assertLess(abs(fxs - dRef[:, :, 0]).max(), 1.0e-14)
+                    self.assertLess(abs(dfxs - dRef[:, :, 1]).max(), 1.0e-14)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
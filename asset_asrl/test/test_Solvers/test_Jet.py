@@ -0,0 +1,85 @@
+import numpy as np
+import asset_asrl as ast
+import unittest
+import threading
+
+from asset_asrl.test.CartPoleProblem import ProblemGenerator
+
+solvers   = ast.Solvers
+
+
+class test_Jet(unittest.TestCase):
+
+    ds = list(np.linspace(0.6,1.4,24))
+
+    def stream(self,nt,maxlive):
+        # Counts jobs generated but not yet handed to the callback
+        lock = threading.Lock()
+        state = {'live':0,'maxlive':0}
+        seen = []
+        trajs = {}
+
+        def Generator(d):
+            with lock:
+                state['live'] += 1
+            return ProblemGenerator(d)
+
+        def Callback(i,flag,phase):
+            with lock:
+                state['maxlive'] = max(state['maxlive'],state['live'])
+                state['live'] -= 1
+            seen.append(i)
+            trajs[i] = (flag,np.array(phase.returnTraj()))
+
+        solvers.Jet.map_stream(Generator,[(d,) for d in self.ds],nt,Callback,maxlive=maxlive,verbose=False)
+        return seen,trajs,state['maxlive']
+
+    def test_MapStream(self):
+        phases = solvers.Jet.map([ProblemGenerator(d) for d in self.ds],2,False)
+        Refs = [np.array(phase.returnTraj()) for phase in phases]
+
+        # maxlive < 1 defaults to twice the thread count, and is never less than the thread count
+        for nt,maxlive,bound in [(2,3,3),(3,0,6),(4,1,4)]:
+            with self.subTest(nt=nt,maxlive=maxlive):
+                seen,trajs,peak = self.stream(nt,maxlive)
+                self.assertEqual(sorted(seen),list(range(len(self.ds))))
+                self.assertLessEqual(peak,bound)
+                for i,Ref in enumerate(Refs):
+                    flag,Traj = trajs[i]
+                    self.assertEqual(flag,solvers.ConvergenceFlags.CONVERGED)
+                    self.assertLess(abs(Traj-Ref).max(), 1.0e-8)
+
+    def test_MapStreamPyFunction(self):
+        # Jet holds the last reference to each generated phase, whose objective owns python objects
+        ds = self.ds[0:8]
+        Refs = [np.array(phase.returnTraj()) for phase in
+                solvers.Jet.map([ProblemGenerator(d) for d in ds],2,False)]
+        trajs = {}
+
+        def Callback(i,flag,phase):
+            trajs[i] = (flag,np.array(phase.returnTraj()))
+
+        solvers.Jet.map_stream(ProblemGenerator,[(d,32,True) for d in ds],2,Callback,maxlive=2,verbose=False)
+        self.assertEqual(sorted(trajs.keys()),list(range(len(ds))))
+        for i,Ref in enumerate(Refs):
+            flag,Traj = trajs[i]
+            self.assertEqual(flag,solvers.ConvergenceFlags.CONVERGED)
+            self.assertLess(abs(Traj-Ref).max(), 1.0e-6)
+
+    def test_MapStreamError(self):
+        for pyobjective in [False,True]:
+            with self.subTest(pyobjective=pyobjective):
+                def Generator(d):
+                    if(d > 1.0):
+                        raise ValueError("bad job")
+                    return ProblemGenerator(d,32,pyobjective)
+
+                seen = []
+                with self.assertRaises(ValueError):
+                    solvers.Jet.map_stream(Generator,[(d,) for d in self.ds],2,
+                                           lambda i,flag,phase: seen.append(i),maxlive=2,verbose=False)
+                self.assertLess(len(seen),len(self.ds))
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
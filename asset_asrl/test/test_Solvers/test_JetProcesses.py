@@ -0,0 +1,53 @@
+import numpy as np
+import asset_asrl as ast
+import unittest
+import os
+
+from asset_asrl.test.CartPoleProblem import ProblemGenerator
+
+solvers   = ast.Solvers
+
+
+# Extractors must be module level so the worker processes can unpickle them
+def FailingExtract(prob):
+    raise RuntimeError("extract failed")
+
+
+def SharedMemoryBlocks():
+    return set(os.listdir('/dev/shm'))
+
+
+class test_JetProcesses(unittest.TestCase):
+
+    ds = [0.8,1.0,1.2,0.9]
+    nsegs = 64
+
+    def test_Results(self):
+        Results = solvers.map_processes(ProblemGenerator,[[d,self.nsegs] for d in self.ds],2)
+        for d,(flag,res) in zip(self.ds,Results):
+            with self.subTest(d=d):
+                phase = ProblemGenerator(d,self.nsegs)
+                phase.optimize()
+                Traj,StaticParams = res
+                self.assertEqual(flag,solvers.ConvergenceFlags.CONVERGED)
+                self.assertLess(abs(Traj-np.array(phase.returnTraj())).max(), 1.0e-8)
+
+    @unittest.skipUnless(os.path.isdir('/dev/shm'), "needs /dev/shm to look for leaked blocks")
+    def test_NoLeaks(self):
+        before = SharedMemoryBlocks()
+
+        with self.subTest("Worker error"):
+            with self.assertRaises(RuntimeError):
+                solvers.map_processes(ProblemGenerator,[[d,self.nsegs] for d in self.ds],2,extract=FailingExtract)
+            self.assertEqual(SharedMemoryBlocks()-before,set())
+
+        with self.subTest("Callback error"):
+            def Callback(i,flag,res):
+                raise ValueError("callback failed")
+            with self.assertRaises(ValueError):
+                solvers.map_processes(ProblemGenerator,[[d,self.nsegs] for d in self.ds],2,callback=Callback)
+            self.assertEqual(SharedMemoryBlocks()-before,set())
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,75 @@
+import numpy as np
+import asset_asrl as ast
+import unittest
+
+vf        = ast.VectorFunctions
+Args      = vf.Arguments
+
+
+class test_BatchEvaluation(unittest.TestCase):
+
+    def make_function(self):
+        X = Args(4)
+        R = X.head(3)
+        s = X[3]
+        return vf.stack([R.normalized()*s, R.norm()*s**2, vf.sin(s)*R[0]])
+
+    def batch_test(self, Func, n, axis, vectorize, thrs):
+        IR = Func.IRows()
+        OR = Func.ORows()
+
+        np.random.seed(1)
+        Xs = np.random.uniform(.5, 2.0, size=(n, IR))
+        Ls = np.random.uniform(-1.0, 1.0, size=(n, OR))
+
+        if(axis == 0):
+            XsIn, LsIn = np.ascontiguousarray(Xs.T), np.ascontiguousarray(Ls.T)
+            FXs  = np.zeros((OR, n))
+            AGXs = np.zeros((IR, n))
+            JXs  = np.zeros((OR, IR, n))
+            AHXs = np.zeros((IR, IR, n))
+        else:
+            XsIn, LsIn = Xs, Ls
+            FXs  = np.zeros((n, OR))
+            AGXs = np.zeros((n, IR))
+            JXs  = np.zeros((n, OR, IR))
+            AHXs = np.zeros((n, IR, IR))
+
+        Func.computeall(XsIn, LsIn, FXs, JXs, AGXs, AHXs, axis, vectorize, thrs)
+
+        FXs2 = np.zeros_like(FXs)
+        Func.compute(XsIn, FXs2, axis, vectorize=vectorize, thrs=thrs)
+
+        for i in range(n):
+            fx, jx, gx, hx = Func.computeall(Xs[i], Ls[i])
+            if(axis == 0):
+                bfx, bjx, bgx, bhx = FXs[:, i], JXs[:, :, i], AGXs[:, i], AHXs[:, :, i]
+                bfx2 = FXs2[:, i]
+            else:
+                bfx, bjx, bgx, bhx = FXs[i], JXs[i], AGXs[i], AHXs[i]
+                bfx2 = FXs2[i]
+
+            self.assertLess(abs(bfx - fx).max(), 1.0e-12)
+            self.assertLess(abs(bfx2 - fx).max(), 1.0e-12)
+            self.assertLess(abs(bjx - jx).max(), 1.0e-12)
+            self.assertLess(abs(bgx - gx).max(), 1.0e-12)
+            self.assertLess(abs(bhx - hx).max(), 1.0e-12)
+
+    def test_Batched(self):
+        Func = self.make_function()
+        for axis in [0, 1]:
+            for vectorize in [True, False]:
+                for thrs in [1, 3]:
+                    with self.subTest(axis=axis, vectorize=vectorize, thrs=thrs):
+                        self.batch_test(Func, 37, axis, vectorize, thrs)
+
+    def test_BadSizes(self):
+        Func = self.make_function()
+        Xs  = np.zeros((10, Func.IRows() + 1))
+        FXs = np.zeros((10, Func.ORows()))
+        with self.assertRaises(ValueError):
+            Func.compute(Xs, FXs, 1)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,87 @@
+import numpy as np
+import asset_asrl as ast
+import unittest
+
+vf        = ast.VectorFunctions
+Args      = vf.Arguments
+
+
+class test_Compile(unittest.TestCase):
+
+    def make_functions(self):
+        X = Args(6)
+        R, V = X.head(3), X.tail(3)
+        r  = R.norm()
+        mu = vf.sin(V.dot(R)) / r**3
+        direct = vf.stack([V*mu + R/r, r*mu + V.squared_norm()])
+
+        # Tape: [R (3), V (3), r, mu, unused]
+        T = Args(9)
+        Rt, Vt, rt, mut = T.head(3), T.segment(3, 3), T[6], T[7]
+        stages = [Rt.norm(), vf.sin(Vt.dot(Rt)) / rt**3, vf.exp(Vt[0])]
+        out = vf.stack([Vt*mut + Rt/rt, rt*mut + Vt.squared_norm()])
+
+        return direct, vf.compile(6, stages, out)
+
+    def test_MatchesDirect(self):
+        direct, compiled = self.make_functions()
+        self.assertEqual(compiled.IRows(), direct.IRows())
+        self.assertEqual(compiled.ORows(), direct.ORows())
+
+        np.random.seed(2)
+        for i in range(10):
+            x = np.random.uniform(.5, 2.0, size=6)
+            l = np.random.uniform(-1.0, 1.0, size=4)
+
+            fx, jx, gx, hx = direct.computeall(x, l)
+            cfx, cjx, cgx, chx = compiled.computeall(x, l)
+
+            self.assertLess(abs(cfx - fx).max(), 1.0e-12)
+            self.assertLess(abs(compiled.compute(x) - fx).max(), 1.0e-12)
+            self.assertLess(abs(compiled.jacobian(x) - jx).max(), 1.0e-12)
+            self.assertLess(abs(cjx - jx).max(), 1.0e-12)
+            self.assertLess(abs(cgx - gx).max(), 1.0e-12)
+            self.assertLess(abs(chx - hx).max(), 1.0e-12)
+
+    def test_ScalarOutput(self):
+        X = Args(3)
+        direct = X.norm()**2 + vf.cos(X.norm())
+
+        T = Args(4)
+        compiled = vf.compile(3, [T.head(3).norm()], T[3]**2 + vf.cos(T[3]))
+
+        x = np.array([0.3, -1.2, 0.8])
+        fx, jx, gx, hx = direct.computeall(x, np.array([1.5]))
+        cfx, cjx, cgx, chx = compiled.computeall(x, np.array([1.5]))
+        self.assertLess(abs(cfx - fx).max(), 1.0e-12)
+        self.assertLess(abs(cgx - gx).max(), 1.0e-12)
+        self.assertLess(abs(chx - hx).max(), 1.0e-12)
+
+    def test_BranchOnlyStage(self):
+        X = Args(3)
+        x0 = X[0]
+        direct = vf.ifelse(x0 > 10.0, X.norm()*2.0, x0 + X[1])
+
+        # The stage's derivative is zero wherever the branch using it is inactive
+        T = Args(4)
+        compiled = vf.compile(3, [T.head(3).norm()], vf.ifelse(T[0] > 10.0, T[3]*2.0, T[0] + T[1]))
+
+        for x in [np.array([1.0, 0.5, -2.0]), np.array([20.0, 0.5, -2.0])]:
+            fx, jx, gx, hx = direct.computeall(x, np.array([1.5]))
+            cfx, cjx, cgx, chx = compiled.computeall(x, np.array([1.5]))
+            self.assertLess(abs(compiled.compute(x) - fx).max(), 1.0e-12)
+            self.assertLess(abs(cjx - jx).max(), 1.0e-12)
+            self.assertLess(abs(chx - hx).max(), 1.0e-12)
+
+    def test_BadTapes(self):
+        T = Args(4)
+        # Stage reads its own output
+        with self.assertRaises(ValueError):
+            vf.compile(3, [T.norm()], T[3]*2.0)
+        # Output is not a function of the whole tape
+        with self.assertRaises(ValueError):
+            vf.compile(3, [T.head(3).norm()], Args(3).norm())
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
@@ -0,0 +1,132 @@
+import numpy as np
+import asset_asrl as ast
+import unittest
+
+try:
+    import numba
+    from numba import types, carray
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+vf        = ast.VectorFunctions
+Args      = vf.Arguments
+
+
+def make_cfuncs():
+    dptr = types.CPointer(types.float64)
+
+    @numba.cfunc(types.void(dptr, dptr, types.intc, types.intc))
+    def func(X_, F_, irows, orows):
+        X = carray(X_, (irows,))
+        F = carray(F_, (orows,))
+        F[0] = X[0]*X[1]
+        F[1] = np.sin(X[2])
+
+    @numba.cfunc(types.void(dptr, dptr, dptr, types.intc, types.intc))
+    def jac(X_, F_, J_, irows, orows):
+        X = carray(X_, (irows,))
+        F = carray(F_, (orows,))
+        J = carray(J_, (irows, orows)).T
+        F[0] = X[0]*X[1]
+        F[1] = np.sin(X[2])
+        J[0, 0] = X[1]
+        J[0, 1] = X[0]
+        J[1, 2] = np.cos(X[2])
+
+    @numba.cfunc(types.void(dptr, dptr, dptr, types.intc, types.intc))
+    def hess(X_, L_, H_, irows, orows):
+        X = carray(X_, (irows,))
+        L = carray(L_, (orows,))
+        H = carray(H_, (irows, irows))
+        H[0, 1] = L[0]
+        H[1, 0] = L[0]
+        H[2, 2] = -L[1]*np.sin(X[2])
+
+    @numba.cfunc(types.void(dptr, dptr, types.intc))
+    def batch(X_, F_, n):
+        X = carray(X_, (n, 3))
+        F = carray(F_, (n, 2))
+        for i in range(n):
+            F[i, 0] = X[i, 0]*X[i, 1]
+            F[i, 1] = np.sin(X[i, 2])
+
+    return func, jac, hess, batch
+
+
+def make_scalar_cfunc():
+    dptr = types.CPointer(types.float64)
+
+    @numba.cfunc(types.void(dptr, dptr, types.intc, types.intc))
+    def sfunc(X_, F_, irows, orows):
+        X = carray(X_, (irows,))
+        F = carray(F_, (orows,))
+        F[0] = X[0]*X[1] + np.sin(X[2])
+
+    return sfunc
+
+
+@unittest.skipUnless(HAS_NUMBA, "numba is not installed")
+class test_NumbaFunction(unittest.TestCase):
+
+    def setUp(self):
+        X = Args(3)
+        self.direct = vf.stack([X[0]*X[1], vf.sin(X[2])])
+        self.cfuncs = make_cfuncs()
+
+    def check(self, nfunc, tol):
+        self.assertTrue(nfunc.thread_safe)
+        np.random.seed(3)
+        for i in range(5):
+            x = np.random.uniform(-1.0, 1.0, size=3)
+            l = np.random.uniform(-1.0, 1.0, size=2)
+            fx, jx, gx, hx = self.direct.computeall(x, l)
+            nfx, njx, ngx, nhx = nfunc.computeall(x, l)
+            self.assertLess(abs(nfunc.compute(x) - fx).max(), 1.0e-12)
+            self.assertLess(abs(nfx - fx).max(), 1.0e-12)
+            self.assertLess(abs(njx - jx).max(), tol)
+            self.assertLess(abs(ngx - gx).max(), tol)
+            self.assertLess(abs(nhx - hx).max(), 100*tol)
+
+    def test_FiniteDifference(self):
+        func = self.cfuncs[0]
+        self.check(vf.NumbaVectorFunction(3, 2, func.address), 1.0e-5)
+
+    def test_Analytic(self):
+        func, jac, hess, batch = self.cfuncs
+        nfunc = vf.NumbaVectorFunction(3, 2, func.address,
+                                       Jacobian=jac.address,
+                                       AdjointHessian=hess.address,
+                                       Batch=batch.address)
+        self.check(nfunc, 1.0e-12)
+
+    def test_Batched(self):
+        func, jac, hess, batch = self.cfuncs
+        nfunc = vf.NumbaVectorFunction(3, 2, func.address, Batch=batch.address)
+        np.random.seed(4)
+        Xs = np.random.uniform(-1.0, 1.0, size=(3, 37))
+        FXs = np.zeros((2, 37))
+        for vectorize in [True, False]:
+            for thrs in [1, 4]:
+                with self.subTest(vectorize=vectorize, thrs=thrs):
+                    FXs[:] = 0.0
+                    nfunc.compute(Xs, FXs, 0, vectorize, thrs)
+                    for i in range(Xs.shape[1]):
+                        fx = self.direct.compute(Xs[:, i])
+                        self.assertLess(abs(FXs[:, i] - fx).max(), 1.0e-12)
+
+    def test_ScalarPositional(self):
+        # (IRows,ORows,Func) must not be read as (IRows,Func,Jacobian) by the keyword overload
+        sfunc = make_scalar_cfunc()
+        X = Args(3)
+        direct = X[0]*X[1] + vf.sin(X[2])
+        for nfunc in [vf.NumbaScalarFunction(3, 1, sfunc.address),
+                      vf.NumbaScalarFunction(3, sfunc.address),
+                      vf.NumbaScalarFunction(3, Func=sfunc.address)]:
+            x = np.array([0.3, -0.7, 1.1])
+            self.assertLess(abs(nfunc.compute(x) - direct.compute(x)).max(), 1.0e-12)
+            self.assertLess(abs(nfunc.jacobian(x) - direct.jacobian(x)).max(), 1.0e-5)
+
+
+if __name__ == "__main__":
+    unittest.main(exit=False)
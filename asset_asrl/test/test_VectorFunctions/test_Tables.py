@@ -9,6 +9,9 @@ from scipy import interpolate
 
 
 import unittest
+import os
+import shutil
+import tempfile
 
 
 vf        = ast.VectorFunctions
@@ -107,13 +110,20 @@ class test_InterpTables(unittest.TestCase):
                 self.assertLess(gxerr, 1.0e-13)
                 self.assertLess(hxerr, 1.0e-13)
         
-    def Interp2D_test(self,Func,dFunc,d2Func,xstab,ystab,xscheck,yscheck):
+    def Interp2D_test(self,Func,dFunc,d2Func,xstab,ystab,xscheck,yscheck,mapped = False,savekind = 'cubic'):
         
         X, Y = np.meshgrid(xstab, ystab)
         
         F = Func(X,Y)
                 
         Tab = vf.InterpTable2D(xstab,ystab,F,kind='cubic')
+        if(mapped):
+            # A cubic file stores the derivatives, a linear one is re-derived on load
+            tmpdir = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree,tmpdir,True)
+            path = os.path.join(tmpdir,'table2d.bin')
+            vf.InterpTable2D(xstab,ystab,F,kind=savekind).save(path)
+            Tab = vf.InterpTable2D(path,kind='cubic')
         
         args = Args(2)
         
@@ -157,13 +167,21 @@ class test_InterpTables(unittest.TestCase):
                     self.assertLess(selffxerr, 1.0e-12)
                     self.assertLess(selfjxerr, 1.0e-12)
                     
-    def Interp3D_test(self,Func,dFunc,d2Func,xstab,ystab,zstab,xscheck,yscheck,zscheck,cache = False,indexing = 'ij'):
+    def Interp3D_test(self,Func,dFunc,d2Func,xstab,ystab,zstab,xscheck,yscheck,zscheck,cache = False,budget = None,mapped = False,indexing = 'ij'):
         
         X,Y,Z = np.meshgrid(xstab, ystab,zstab,indexing='ij')
         
         F = Func(X,Y,Z)
                 
         Tab = vf.InterpTable3D(xstab,ystab,zstab,F,kind='cubic',cache = cache)
+        if(mapped):
+            tmpdir = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree,tmpdir,True)
+            path = os.path.join(tmpdir,'table3d.bin')
+            Tab.save(path)
+            Tab = vf.InterpTable3D(path,cache = cache)
+        if(budget is not None):
+            Tab.set_cache_budget(budget)
         args = Args(3)
         
         sf1 = Tab(args)
@@ -208,13 +226,26 @@ class test_InterpTables(unittest.TestCase):
                         
                         self.assertLess(selffxerr, 1.0e-12)
                         self.assertLess(selfjxerr, 1.0e-12)  
-    def Interp4D_test(self,Func,dFunc,d2Func,xstab,ystab,zstab,wstab,xscheck,yscheck,zscheck,wscheck,cache = False,indexing = 'ij'):
+                        
+        if(budget is not None):
+            stats = Tab.cache_stats()
+            self.assertGreater(stats['hits'],0)
+            self.assertLessEqual(stats['bytes'],stats['max_bytes'])
+    def Interp4D_test(self,Func,dFunc,d2Func,xstab,ystab,zstab,wstab,xscheck,yscheck,zscheck,wscheck,cache = False,budget = None,mapped = False,indexing = 'ij'):
         
         X,Y,Z,W = np.meshgrid(xstab, ystab,zstab,wstab,indexing='ij')
         
         F = Func(X,Y,Z,W)
                 
         Tab = vf.InterpTable4D(xstab,ystab,zstab,wstab,F,kind='cubic',cache = cache)
+        if(mapped):
+            tmpdir = tempfile.mkdtemp()
+            self.addCleanup(shutil.rmtree,tmpdir,True)
+            path = os.path.join(tmpdir,'table4d.bin')
+            Tab.save(path)
+            Tab = vf.InterpTable4D(path,cache = cache)
+        if(budget is not None):
+            Tab.set_cache_budget(budget)
         args = Args(4)
         
         sf1 = Tab(args)
@@ -261,6 +292,11 @@ class test_InterpTables(unittest.TestCase):
                             
                             self.assertLess(selffxerr, 1.0e-12)
                             self.assertLess(selfjxerr, 1.0e-12)
+                            
+        if(budget is not None):
+            stats = Tab.cache_stats()
+            self.assertGreater(stats['hits'],0)
+            self.assertLessEqual(stats['bytes'],stats['max_bytes'])
     
     def test_Interp1D(self):
     
@@ -335,6 +371,36 @@ class test_InterpTables(unittest.TestCase):
             
         with self.subTest("Uneven on Uneven"):
             self.Interp2D_test(Func,dFunc,d2Func,xsu,ysu,xscheck,yscheck)
+            
+        with self.subTest("Mapped Cubic"):
+            self.Interp2D_test(Func,dFunc,d2Func,xsu,ys,xscheck,yscheck,mapped=True)
+            
+        with self.subTest("Mapped Linear as Cubic"):
+            self.Interp2D_test(Func,dFunc,d2Func,xs,ysu,xscheck,yscheck,mapped=True,savekind='linear')
+            
+    def test_SaveOverMapped(self):
+        
+        xs = np.linspace(-np.pi, np.pi,41)
+        ys = np.linspace(-np.pi, np.pi,43)
+        X, Y = np.meshgrid(xs, ys)
+        
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree,tmpdir,True)
+        path = os.path.join(tmpdir,'table2d.bin')
+        
+        vf.InterpTable2D(xs,ys,np.cos(X)*np.cos(Y),kind='cubic').save(path)
+        Tab1 = vf.InterpTable2D(path)
+        
+        # Saving over the file a live table is mapped from must not corrupt it
+        vf.InterpTable2D(xs,ys,np.sin(X)*np.sin(Y),kind='cubic').save(path)
+        Tab1.save(path)
+        Tab2 = vf.InterpTable2D(path)
+        
+        for x in np.linspace(-3,3,13):
+            for y in np.linspace(-3,3,11):
+                self.assertLess(abs(Tab1.interp(x,y)-np.cos(x)*np.cos(y)), 1.0e-4)
+                self.assertLess(abs(Tab2.interp(x,y)-Tab1.interp(x,y)), 1.0e-14)
+        self.assertEqual(len(os.listdir(tmpdir)),1)
     
     def test_Interp3D(self):
         
@@ -401,6 +467,12 @@ class test_InterpTables(unittest.TestCase):
         
         with self.subTest("Even, Uneven, Even: Cached"):
             self.Interp3D_test(Func,dFunc,d2Func,xs,ysu,zs,xscheck,yscheck,zscheck,cache=True)  
+            
+        with self.subTest("Uneven, Even, Uneven: Bounded Cache"):
+            self.Interp3D_test(Func,dFunc,d2Func,xsu,ys,zsu,xscheck,yscheck,zscheck,budget=0.25)
+            
+        with self.subTest("Uneven, Even, Uneven: Mapped"):
+            self.Interp3D_test(Func,dFunc,d2Func,xsu,ys,zsu,xscheck,yscheck,zscheck,mapped=True)
         
         
 
@@ -483,6 +555,31 @@ class test_InterpTables(unittest.TestCase):
         with self.subTest("Uneven, Uneven, Uneven, Uneven: Cached"):
             self.Interp4D_test(Func,dFunc,d2Func,xsu,ysu,zsu,wsu,xscheck,yscheck,zscheck,wscheck,cache = True)
             
+        with self.subTest("Uneven, Uneven, Uneven, Uneven: Bounded Cache"):
+            self.Interp4D_test(Func,dFunc,d2Func,xsu,ysu,zsu,wsu,xscheck,yscheck,zscheck,wscheck,budget = 0.5)
+            
+        with self.subTest("Uneven, Uneven, Uneven, Uneven: Mapped"):
+            self.Interp4D_test(Func,dFunc,d2Func,xsu,ysu,zsu,wsu,xscheck,yscheck,zscheck,wscheck,mapped = True)
+            
+    def test_SmallCacheBudget(self):
+        
+        xs = np.linspace(-1,1,20)
+        X,Y,Z = np.meshgrid(xs,xs,xs,indexing='ij')
+        F = np.cos(X)*np.cos(Y)*np.cos(Z)
+        Ref = vf.InterpTable3D(xs,xs,xs,F,kind='cubic')
+        
+        pts = np.random.default_rng(8).uniform(-1,1,(400,3))
+        
+        # Budgets of zero, one, and a few cells, all far below one cell per default shard
+        for budget in [1.0e-4,1.0e-3,4.0e-3]:
+            with self.subTest(budget=budget):
+                Tab = vf.InterpTable3D(xs,xs,xs,F,kind='cubic')
+                Tab.set_cache_budget(budget)
+                for p in pts:
+                    self.assertLess(abs(Tab.interp(*p)-Ref.interp(*p)), 1.0e-14)
+                stats = Tab.cache_stats()
+                self.assertLessEqual(stats['bytes'],stats['max_bytes'])
+            
 
 
         
@@ -0,0 +1,85 @@
+import numpy as np
+import asset_asrl as ast
+import time
+
+vf        = ast.VectorFunctions
+oc        = ast.OptimalControl
+Args      = vf.Arguments
+
+
+'''
+Compares integrate_parallel with trajectories packed into SIMD lanes on every
+thread (VectorizeBatchCalls = True) against one trajectory per task
+(VectorizeBatchCalls = False) on a dispersed set of two-body orbits.
+'''
+
+class TwoBody(oc.ODEBase):
+    def __init__(self,mu):
+        ############################################################
+        XtU  = oc.ODEArguments(6)
+        R,V  = XtU.XVec().tolist([(0,3),(3,3)])
+        ode  = vf.stack([V,-mu*R.normalized_power3()])
+        ##############################################################
+        super().__init__(ode,6)
+
+
+def ApseFunc():
+    R,V = Args(7).tolist([(0,3),(3,3)])
+    return R.dot(V)
+
+
+def Bench(integ,X0t0s,tfs,nthreads,Events=None,reps=3):
+    best = np.inf
+    for i in range(0,reps):
+        t0 = time.perf_counter()
+        if Events is None:
+            Res = integ.integrate_parallel(X0t0s,tfs,nthreads)
+        else:
+            Res = integ.integrate_parallel(X0t0s,tfs,Events,nthreads)
+        best = min(best,time.perf_counter()-t0)
+    return best,Res
+
+
+if __name__ == "__main__":
+
+    n        = 20000
+    nthreads = 8
+
+    ode   = TwoBody(1.0)
+    integ = ode.integrator(.01)
+    integ.setAbsTol(1.0e-12)
+
+    rng = np.random.default_rng(0)
+
+    X0t0s = []
+    for i in range(0,n):
+        X0t0 = np.zeros((7))
+        X0t0[0] = 1.0 + .05*rng.standard_normal()
+        X0t0[4] = 1.1 + .05*rng.standard_normal()
+        X0t0[5] = .05*rng.standard_normal()
+        X0t0s.append(X0t0)
+
+    tfs = rng.uniform(10.0,20.0,n)
+
+    # Stop each trajectory at its second periapse
+    Events = [(ApseFunc(),1,2)]
+
+    for Ev in [None,Events]:
+
+        integ.VectorizeBatchCalls = False
+        tscalar,Res1 = Bench(integ,X0t0s,tfs,nthreads,Ev)
+
+        integ.VectorizeBatchCalls = True
+        tsimd,Res2   = Bench(integ,X0t0s,tfs,nthreads,Ev)
+
+        if Ev is None:
+            err = max(np.linalg.norm(X1-X2) for X1,X2 in zip(Res1,Res2))
+        else:
+            err = max(np.linalg.norm(R1[0]-R2[0]) for R1,R2 in zip(Res1,Res2))
+
+        print("Events              :",Ev is not None)
+        print("Per trajectory tasks:",tscalar*1000,"ms")
+        print("SIMD lane blocks    :",tsimd*1000,"ms")
+        print("Speedup             :",tscalar/tsimd)
+        print("Max state difference:",err)
+        print()
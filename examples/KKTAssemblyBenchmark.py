@@ -0,0 +1,68 @@
+import numpy as np
+import asset_asrl as ast
+import os
+
+vf        = ast.VectorFunctions
+oc        = ast.OptimalControl
+Args      = vf.Arguments
+
+
+'''
+Compares KKT matrix assembly with mutex locked clashing elements (LockFreeKKT = False)
+against private per thread clash slots (LockFreeKKT = True) on a large cart pole problem,
+for 1 to 64 threads. Reports the average function evaluation and KKT assembly time per
+iteration from PSIOPT's LastStats, and checks that both modes reach the same solution.
+'''
+
+class CartPole(oc.ODEBase):
+    def __init__(self,l,m1,m2,g):
+        ############################################################
+        args = oc.ODEArguments(4,1)
+        q1,q2,q1d,q2d = args.XVec().tolist()
+        u = args.UVar(0)
+
+        q1dd = (l*m2*vf.sin(q2)*(q2d**2) + u + m2*g*vf.cos(q2)*vf.sin(q2))/( m1 + m2*((1-vf.cos(q2)**2)))
+        q2dd = -1*(l*m2*vf.cos(q2)*vf.sin(q2)*(q2d**2) +u*vf.cos(q2) +(m1*g+m2*g)*vf.sin(q2))/( l*m1 + l*m2*((1-vf.cos(q2)**2)))
+        ode = vf.stack([q1d,q2d,q1dd,q2dd])
+        ##############################################################
+        super().__init__(ode,4,1)
+
+
+def Solve(nsegs,nthreads,lockfree):
+    tf,d = 2.0,1.0
+    ts = np.linspace(0,tf,100)
+    IG = [[d*t/tf,np.pi*t/tf,0,0,t,.00] for t in ts]
+
+    phase = CartPole(.5,1,.3,9.81).phase("LGL5",IG,nsegs)
+    phase.addBoundaryValue("Front",range(0,5),[0,0,0,0,0])
+    phase.addBoundaryValue("Back",range(0,5),[d,np.pi,0,0,tf])
+    phase.addLUVarBound("Path",5,-20,20,1.0)
+    phase.addLUVarBound("Path",0,-2,2,1.0)
+    phase.addIntegralObjective(Args(1)[0]**2,[5])
+    phase.setThreads(nthreads,nthreads)
+    phase.optimizer.PrintLevel = 3
+    phase.optimizer.LockFreeKKT = lockfree
+    phase.optimize()
+
+    Stats = phase.optimizer.LastStats
+    per_iter = 1000*(Stats.EvalTime + Stats.AssemblyTime)/max(Stats.Iterations,1)
+    return per_iter,np.array(phase.returnTraj())
+
+
+if __name__ == "__main__":
+
+    nsegs = 4096
+    maxthreads = min(64,os.cpu_count())
+
+    nthreads = 1
+    while nthreads <= maxthreads:
+        tlock,Traj1 = Solve(nsegs,nthreads,False)
+        tfree,Traj2 = Solve(nsegs,nthreads,True)
+
+        print("Threads             :",nthreads)
+        print("Mutex eval+assembly :",tlock,"ms/iter")
+        print("Lock free           :",tfree,"ms/iter")
+        print("Speedup             :",tlock/tfree)
+        print("Max state difference:",abs(Traj1-Traj2).max())
+        print()
+        nthreads *= 2
@@ -1,5 +1,6 @@
 #include "KeplerUtils.h"
 
+#include "KeplerPropagator.h"
 #include "VectorFunctions/CommonFunctions/RootFinder.h"
 
 
@@ -59,4 +60,106 @@ void ASSET::KeplerUtilsBuild(FunctionRegistry& reg, py::module& m) {
   m.def("propagate_modified", [](const Vector6<double>& meelems, double dt, double mu) {
     return propagate_modified(meelems, dt, mu);
   });
+
+
+  ////////////////////////////////////////////////////////////////////////////////////////
+  ////////////////////          Array Propagators                /////////////////////////
+  ////////////////////////////////////////////////////////////////////////////////////////
+
+  using NumpyMat = Eigen::Matrix<double, -1, -1, Eigen::RowMajor>;
+  using SuperScalar = DefaultSuperScalar;
+
+  m.def(
+      "propagate_cartesian",
+      [](ConstEigenRef<NumpyMat> RVs,
+         ConstEigenRef<VectorX<double>> dts,
+         double mu,
+         EigenRef<NumpyMat> RVfs,
+         int axis,
+         bool vectorize,
+         int thrs) {
+        // Packed and leftover states both go through the expression based propagator, which is branch
+        // free, so a state's result does not depend on where it falls in the array or the thread count.
+        KeplerPropagator kprop(mu);
+
+        auto prop = [&kprop](const auto& RV, const auto& dt) {
+          using Scalar = std::decay_t<decltype(dt)>;
+          Eigen::Matrix<Scalar, 7, 1> RVdt;
+          RVdt.template head<6>() = RV;
+          RVdt[6] = dt;
+          Vector6<Scalar> RVf;
+          RVf.setZero();
+          kprop.compute(RVdt, RVf);
+          return RVf;
+        };
+
+        propagate_array(RVs, dts, RVfs, axis, vectorize, thrs, prop, prop);
+      },
+      py::arg("RVs"),
+      py::arg("dts"),
+      py::arg("mu"),
+      py::arg("RVfs"),
+      py::arg("axis"),
+      py::arg("vectorize") = true,
+      py::arg("thrs") = 1,
+      py::call_guard<py::gil_scoped_release>());
+
+  m.def(
+      "propagate_classic",
+      [](ConstEigenRef<NumpyMat> oelemss,
+         ConstEigenRef<VectorX<double>> dts,
+         double mu,
+         EigenRef<NumpyMat> noelemss,
+         int axis,
+         bool vectorize,
+         int thrs) {
+        propagate_array(
+            oelemss,
+            dts,
+            noelemss,
+            axis,
+            vectorize,
+            thrs,
+            [mu](const Vector6<double>& oelems, double dt) { return propagate_classic(oelems, dt, mu); },
+            [mu](const Vector6<SuperScalar>& oelems, const SuperScalar& dt) {
+              return propagate_classic(oelems, dt, SuperScalar(SuperScalar::Constant(mu)));
+            });
+      },
+      py::arg("oelems"),
+      py::arg("dts"),
+      py::arg("mu"),
+      py::arg("noelems"),
+      py::arg("axis"),
+      py::arg("vectorize") = true,
+      py::arg("thrs") = 1,
+      py::call_guard<py::gil_scoped_release>());
+
+  // The element conversions branch on eccentricity, so there is no vectorized path here.
+  m.def(
+      "propagate_modified",
+      [](ConstEigenRef<NumpyMat> meelemss,
+         ConstEigenRef<VectorX<double>> dts,
+         double mu,
+         EigenRef<NumpyMat> nmeelemss,
+         int axis,
+         bool vectorize,
+         int thrs) {
+        propagate_array(
+            meelemss,
+            dts,
+            nmeelemss,
+            axis,
+            vectorize,
+            thrs,
+            [mu](const Vector6<double>& meelems, double dt) { return propagate_modified(meelems, dt, mu); },
+            nullptr);
+      },
+      py::arg("meelems"),
+      py::arg("dts"),
+      py::arg("mu"),
+      py::arg("nmeelems"),
+      py::arg("axis"),
+      py::arg("vectorize") = true,
+      py::arg("thrs") = 1,
+      py::call_guard<py::gil_scoped_release>());
 }
@@ -574,8 +574,117 @@ namespace ASSET {
   }
 
   ////////////////////////////////////////////////////////////////////////////////////////
-  ////////////////////              Propagators                  /////////////////////////
+  ////////////////////          Array Propagators                /////////////////////////
   ////////////////////////////////////////////////////////////////////////////////////////
 
+  /// <summary>
+  /// Drives one of the propagators over an array of states. Each column (axis = 0) or row (axis = 1) of
+  /// X0s is one state, propagated by the matching entry of dts, and the result is written to the same
+  /// location in Xfs. Calls are split evenly across thrs threads. If a vectorized propagator is supplied
+  /// and vectorize is true, each thread makes as many fully packed SuperScalar calls as possible before
+  /// reverting to the scalar propagator.
+  /// </summary>
+  template<class ScalarProp, class VectorProp>
+  void propagate_array(ConstEigenRef<Eigen::Matrix<double, -1, -1, Eigen::RowMajor>> X0s,
+                       ConstEigenRef<VectorX<double>> dts,
+                       EigenRef<Eigen::Matrix<double, -1, -1, Eigen::RowMajor>> Xfs,
+                       int axis,
+                       bool vectorize,
+                       int thrs,
+                       ScalarProp scalar_prop,
+                       VectorProp vector_prop) {
+
+    using SuperScalar = DefaultSuperScalar;
+    constexpr int vsize = SuperScalar::SizeAtCompileTime;
+    constexpr bool HasVectorProp = !std::is_same<VectorProp, std::nullptr_t>::value;
+
+    if (axis != 0 && axis != 1) {
+      throw std::invalid_argument("axis must be 0 or 1");
+    }
+    int StateSize = (axis == 0) ? X0s.rows() : X0s.cols();
+    int NumCalls = (axis == 0) ? X0s.cols() : X0s.rows();
+
+    if (StateSize != 6) {
+      throw std::invalid_argument("States must have 6 elements");
+    }
+    if (dts.size() != NumCalls) {
+      throw std::invalid_argument("Number of states and propagation times must be the same");
+    }
+    if (Xfs.rows() != X0s.rows() || Xfs.cols() != X0s.cols()) {
+      throw std::invalid_argument("Output array must be the same shape as the input array");
+    }
+
+    auto job = [&](int id, int start, int stop) {
+      int Packs = 0;
+
+      if constexpr (HasVectorProp) {
+        Packs = vectorize ? (stop - start) / vsize : 0;
+
+        Vector6<SuperScalar> X0ss;
+        Vector6<SuperScalar> Xfss;
+        SuperScalar dtss;
+
+        for (int i = 0; i < Packs; i++) {
+          int V = start + i * vsize;
+          for (int j = 0; j < vsize; j++) {
+            for (int k = 0; k < 6; k++) {
+              X0ss[k][j] = (axis == 0) ? X0s(k, V + j) : X0s(V + j, k);
+            }
+            dtss[j] = dts[V + j];
+          }
+
+          Xfss = vector_prop(X0ss, dtss);
+
+          for (int j = 0; j < vsize; j++) {
+            for (int k = 0; k < 6; k++) {
+              if (axis == 0) {
+                Xfs(k, V + j) = Xfss[k][j];
+              } else {
+                Xfs(V + j, k) = Xfss[k][j];
+              }
+            }
+          }
+        }
+      }
+
+      Vector6<double> X0;
+      Vector6<double> Xf;
+
+      for (int i = start + Packs * vsize; i < stop; i++) {
+        if (axis == 0) {
+          X0 = X0s.col(i);
+        } else {
+          X0 = X0s.row(i).transpose();
+        }
+
+        Xf = scalar_prop(X0, dts[i]);
+
+        if (axis == 0) {
+          Xfs.col(i) = Xf;
+        } else {
+          Xfs.row(i) = Xf.transpose();
+        }
+      }
+    };
+
+    thrs = std::max(1, std::min(thrs, NumCalls));
+
+    if (thrs == 1) {
+      job(0, 0, NumCalls);
+    } else {
+      // The calling thread propagates the first chunk, the shared batch pool the rest
+      auto pool = BatchThreadPool(thrs - 1);
+      std::vector<std::future<void>> futures(thrs - 1);
+      for (int i = 1; i < thrs; i++) {
+        int start = (i * NumCalls) / thrs;
+        int stop = ((i + 1) * NumCalls) / thrs;
+        futures[i - 1] = pool->push(job, start, stop);
+      }
+      job(0, 0, NumCalls / thrs);
+      for (auto& fut: futures) {
+        fut.get();
+      }
+    }
+  }
 
 }  // namespace ASSET
\ No newline at end of file
@@ -42,7 +42,9 @@ namespace ASSET {
     /// </summary>
     /// <typeparam name="PseudoODE"></typeparam>
     template<class PseudoODE, RKOptions RKOp>
-    using StepperType = RKStepper<PseudoODE, RKOp>;
+    using StepperType = std::conditional_t<isImplicitRK(RKOp),
+                                           SDIRKStepper<PseudoODE, RKOp>,
+                                           RKStepper<PseudoODE, RKOp>>;
 
     /// <summary>
     /// Wraps stepper types with RKoptions types
@@ -178,11 +180,26 @@ namespace ASSET {
         this->RKMethod = RKOptions::DOPRI87;
         this->ErrorOrder = 7;
         this->initStepperAndController<RKOptions::DOPRI87>(dode, usecontrol, ucon, varlocs);
+      } else if (str == "SDIRK43" || str == "SDIRK4") {
+        this->RKMethod = RKOptions::SDIRK43;
+        this->ErrorOrder = 3;
+        this->initStepperAndController<RKOptions::SDIRK43>(dode, usecontrol, ucon, varlocs);
       } else {
         throw std::invalid_argument("Invalid integration method '{0:}'.");
       }
     }
 
+    std::string getMethod() const {
+      switch (this->RKMethod) {
+        case RKOptions::DOPRI54:
+          return "DOPRI54";
+        case RKOptions::SDIRK43:
+          return "SDIRK43";
+        default:
+          return "DOPRI87";
+      }
+    }
+
 
     template<RKOptions RKOp>
     void initStepperAndController(const DODE& odet,
@@ -259,10 +276,23 @@ namespace ASSET {
     double MaxStepChange = 3.0;
     bool Adaptive = true;
     bool FastAdaptiveSTM = true;
+    /// <summary>
+    /// If true, integrate_stm propagates the STM alongside the state in a single pass rather
+    /// than differentiating the stored steps afterwards.
+    /// </summary>
+    bool VariationalSTM = false;
     double EventTol = 1.0e-6;
     int MaxEventIters = 10;
     bool VectorizeBatchCalls = true;
 
+    /// <summary>
+    /// Newton iteration limit and convergence tolerance (relative to the step error tolerances)
+    /// for the stage equations of implicit methods. A step whose stages fail to converge
+    /// is retried with a smaller stepsize.
+    /// </summary>
+    int MaxImplicitIters = 10;
+    double ImplicitTol = 0.05;
+
     double StepFrac = .9;
     double ErrPowFac = 1;
 
@@ -467,8 +497,132 @@ namespace ASSET {
     }
 
 
+    /// <summary>
+    /// Takes a single step of an SDIRK method. The stage equations are solved with a
+    /// simplified Newton iteration whose matrix (I - gamma*h*df/dx) is formed from the ode's
+    /// jacobian and factored once per step. Returns false if any stage fails to converge.
+    /// </summary>
+    template<RKOptions RKOp>
+    bool implicit_stepper_compute_impl(const ODEState<double>& x,
+                                       double tf,
+                                       ODEState<double>& xf,
+                                       ODEState<double>& xf_est,
+                                       ODEDeriv<double>& xdot_prev,
+                                       bool domidpoint,
+                                       ODEState<double>& xf_mid) const {
+
+      using RKData = RKCoeffs<RKOp>;
+      constexpr int Stages = RKData::Stages;
+      using StageMatrix = Eigen::Matrix<double, DODE::XV, DODE::XV>;
+
+      const int xv = this->ode.XVars();
+      const int tvar = this->ode.TVar();
+      const double eps = std::numeric_limits<double>::epsilon();
+
+      std::array<ODEDeriv<double>, Stages> Kvals;
+      ODEState<double> xtup = x;
+      ODEDeriv<double> f0(this->ode.ORows());
+      ODEDeriv<double> fx(this->ode.ORows());
+      ODEDeriv<double> S(xv);
+      ODEDeriv<double> Y(xv);
+      ODEDeriv<double> dY(xv);
+      typename DODE::template Jacobian<double> jac(this->ode.ORows(), this->ode.IRows());
+
+      double t0 = x[tvar];
+      double h = tf - t0;
+      double gh = RKData::Gamma * h;
+
+      this->update_control(xtup);
+      f0.setZero();
+      jac.setZero();
+      this->ode.compute_jacobian(xtup, f0, jac);
+
+      StageMatrix M = -gh * jac.template leftCols<DODE::XV>(xv);
+      M.diagonal().array() += 1.0;
+      Eigen::PartialPivLU<StageMatrix> lu(M);
+
+      for (int i = 0; i < Stages; i++) {
+        S = x.template head<DODE::XV>(xv);
+        for (int j = 0; j < i; j++) {
+          S += RKData::ACoeffs[i][j] * Kvals[j];
+        }
+
+        Y = S;
+        if (i == 0)
+          Y += gh * f0;
+        else
+          Y += RKData::Gamma * Kvals[i - 1];
+
+        xtup = x;
+        xtup[tvar] = t0 + RKData::Times[i] * h;
+
+        bool converged = false;
+        double dnorm_prev = 0;
+        for (int iter = 0; iter < this->MaxImplicitIters; iter++) {
+          xtup.template head<DODE::XV>(xv) = Y;
+          this->update_control(xtup);
+          fx.setZero();
+          this->ode.compute(xtup, fx);
+
+          dY = lu.solve(Y - S - gh * fx);
+          Y -= dY;
+
+          // Newton increment measured against the step tolerances, floored at round off
+          double dnorm = (dY.array().abs()
+                          / (this->AbsTols.array() + Y.array().abs() * (this->RelTols.array() + 100.0 * eps))
+                                .max(std::numeric_limits<double>::min()))
+                             .maxCoeff();
+
+          if (dnorm <= this->ImplicitTol) {
+            converged = true;
+            break;
+          }
+          if (iter > 0 && dnorm > dnorm_prev) {
+            break;  // Diverging
+          }
+          dnorm_prev = dnorm;
+        }
+        if (!converged) {
+          return false;
+        }
+        Kvals[i] = (Y - S) / RKData::Gamma;
+      }
+
+      xtup = x;
+      xtup[tvar] = tf;
+      for (int i = 0; i < Stages; i++) {
+        xtup.template head<DODE::XV>(xv) += RKData::BCoeffs[i] * Kvals[i];
+      }
+      this->update_control(xtup);
+      xf = xtup;  // Next State
+
+      // Error estimate is filtered through the iteration matrix so that it stays
+      // bounded for stiff components
+      dY.setZero();
+      for (int i = 0; i < Stages; i++) {
+        dY += (RKData::BCoeffs[i] - RKData::CCoeffs[i]) * Kvals[i];
+      }
+      xf_est = xf;
+      xf_est.template head<DODE::XV>(xv) -= lu.solve(dY);  // Estimate
+
+      if (domidpoint) {
+        xdot_prev.setZero();
+        this->ode.compute(xf, xdot_prev);
+
+        // Cubic hermite midpoint
+        xtup = x;
+        xtup[tvar] = t0 + h / 2.0;
+        xtup.template head<DODE::XV>(xv) =
+            0.5 * (x.template head<DODE::XV>(xv) + xf.template head<DODE::XV>(xv)) + (h / 8.0) * (f0 - xdot_prev);
+        this->update_control(xtup);
+        xf_mid = xtup;
+      }
+      return true;
+    }
+
+
     template<class Scalar>
-    inline void stepper_compute(const ODEState<Scalar>& x,
+    inline bool stepper_compute(const ODEState<Scalar>& x,
                                 Scalar tf,
                                 ODEState<Scalar>& xf,
                                 ODEState<Scalar>& xf_est,
@@ -486,15 +640,152 @@ namespace ASSET {
           this->stepper_compute_impl<RKOptions::DOPRI87, Scalar>(
               x, tf, xf, xf_est, false, xdot_prev, domidpoint, xf_mid);
         } break;
+        case RKOptions::SDIRK43: {
+          if constexpr (std::is_same<Scalar, double>::value) {
+            return this->implicit_stepper_compute_impl<RKOptions::SDIRK43>(
+                x, tf, xf, xf_est, xdot_prev, domidpoint, xf_mid);
+          } else {
+            throw std::invalid_argument("Implicit integration methods cannot be vectorized.");
+          }
+        } break;
         default: {
         }
       }
+      return true;
+    }
+
+    /// <summary>
+    /// Jacobian of the ode with respect to its input, including the dependence of the controls
+    /// on the rest of the input when a controller is in use.
+    /// </summary>
+    template<class JacType>
+    void ode_compute_jacobian(ODEState<double>& xtup, ODEDeriv<double>& fx, JacType& jx) const {
+      this->update_control(xtup);
+      fx.setZero();
+      jx.setZero();
+      this->ode.compute_jacobian(xtup, fx, jx);
+
+      if constexpr (DODE::UV != 0) {
+        if (this->usecontroller) {
+          const int uloc = this->ode.TVar() + 1;
+          Eigen::VectorXd u(this->ode.UVars());
+          Eigen::MatrixXd jc(this->ode.UVars(), this->ode.IRows());
+          u.setZero();
+          jc.setZero();
+          this->controller.compute_jacobian(xtup, u, jc);
+
+          Eigen::MatrixXd ju = jx.middleCols(uloc, this->ode.UVars());
+          jx.middleCols(uloc, this->ode.UVars()).setZero();
+          jx += ju * jc;
+        }
+      }
+    }
+
+    /// <summary>
+    /// Takes a single explicit step and differentiates it with respect to the stepper input
+    /// [x,t,u,p,tf] using the same stage evaluations. Both the solution and its embedded
+    /// estimate are differentiated, so the error in the jacobian can be controlled as well.
+    /// The jacobian is identical to the one computed by the stepper.
+    /// </summary>
+    template<RKOptions RKOp>
+    void stepper_compute_stm_impl(const ODEState<double>& x,
+                                  double tf,
+                                  ODEState<double>& xf,
+                                  ODEState<double>& xf_est,
+                                  Jacobian<double>& jx,
+                                  Jacobian<double>& jx_est) const {
+
+      using RKData = RKCoeffs<RKOp>;
+      constexpr int Stages = RKData::Stages;
+      constexpr int Stgsm1 = RKData::Stages - 1;
+      constexpr bool isDiag = RKData::isDiag;
+      using KXjacType = Eigen::Matrix<double, DODE::XV, Base::IRC>;
+
+      const int xv = this->ode.XVars();
+      const int tvar = this->ode.TVar();
+      const int tfvar = this->IRows() - 1;
+
+      std::array<ODEDeriv<double>, Stages> Kvals;
+      std::array<KXjacType, Stages> KXjacs;
+      ODEState<double> xtup;
+      Jacobian<double> Xijac(this->ORows(), this->IRows());
+      typename DODE::template Jacobian<double> Kjac(this->ode.ORows(), this->ode.IRows());
+
+      double t0 = x[tvar];
+      double h = tf - t0;
+
+      auto StageImpl = [&](int i) {
+        Kvals[i].resize(this->ode.ORows());
+        this->ode_compute_jacobian(xtup, Kvals[i], Kjac);
+
+        KXjacs[i].noalias() = h * Kjac * Xijac;
+        KXjacs[i].col(tvar) -= Kvals[i];
+        KXjacs[i].col(tfvar) += Kvals[i];
+        Kvals[i] *= h;
+      };
+
+      xtup = x;
+      Xijac.setIdentity();
+      Xijac(tvar, tfvar) = 0;
+      StageImpl(0);
+
+      for (int i = 0; i < Stgsm1; i++) {
+        xtup = x;
+        xtup[tvar] = t0 + RKData::Times[i] * h;
+        Xijac.setIdentity();
+        Xijac(tvar, tvar) = 1.0 - RKData::Times[i];
+        Xijac(tvar, tfvar) = RKData::Times[i];
+
+        const int js = isDiag ? i : 0;
+        for (int j = js; j < i + 1; j++) {
+          xtup.template head<DODE::XV>(xv) += RKData::ACoeffs[i][j] * Kvals[j];
+          Xijac.template topRows<DODE::XV>(xv) += RKData::ACoeffs[i][j] * KXjacs[j];
+        }
+        StageImpl(i + 1);
+      }
+
+      auto SumImpl = [&](const auto& Coeffs, ODEState<double>& xout, Jacobian<double>& jout) {
+        xtup = x;
+        xtup[tvar] = tf;
+        Xijac.setIdentity();
+        Xijac(tvar, tvar) = 0;
+        Xijac(tvar, tfvar) = 1;
+        for (int i = 0; i < Stages; i++) {
+          xtup.template head<DODE::XV>(xv) += Coeffs[i] * Kvals[i];
+          Xijac.template topRows<DODE::XV>(xv) += Coeffs[i] * KXjacs[i];
+        }
+        this->update_control(xtup);
+        xout = xtup;
+        jout = Xijac;
+      };
+
+      SumImpl(RKData::BCoeffs, xf, jx);          // Next State
+      SumImpl(RKData::CCoeffs, xf_est, jx_est);  // Estimate
+    }
+
+    void stepper_compute_stm(const ODEState<double>& x,
+                             double tf,
+                             ODEState<double>& xf,
+                             ODEState<double>& xf_est,
+                             Jacobian<double>& jx,
+                             Jacobian<double>& jx_est) const {
+      switch (this->RKMethod) {
+        case RKOptions::DOPRI54: {
+          this->stepper_compute_stm_impl<RKOptions::DOPRI54>(x, tf, xf, xf_est, jx, jx_est);
+        } break;
+        case RKOptions::DOPRI87: {
+          this->stepper_compute_stm_impl<RKOptions::DOPRI87>(x, tf, xf, xf_est, jx, jx_est);
+        } break;
+        default: {
+          throw std::invalid_argument("Single pass STM integration is only available for explicit methods.");
+        }
+      }
     }
 
     Output<double> integrate_impl(const ODEState<double>& x,
                                   double tf,
                                   const std::vector<EventPack>& events,
-                                  std::vector<std::vector<Eigen::Vector2d>>& eventtimes,
+                                  EventLocsType& eventlocs,
                                   bool storestates,
                                   bool storederivs,
                                   bool storemidpoints,
@@ -538,7 +829,9 @@ namespace ASSET {
         std::get<0>(events[j]).compute(xi, prev_event_vals[j]);
       }
 
-      eventtimes.resize(events.size());
+      eventlocs.resize(events.size());
+      // Events are located on an interpolant of the step, which needs the midpoint and derivatives
+      bool domidpoint = storemidpoints || storederivs || events.size() > 0;
 
       if (storestates) {
         states.resize(0);
@@ -590,9 +883,23 @@ namespace ASSET {
         xdotnext = xdoti;
 
 
-        this->stepper_compute(
-            xi, tnext, xnext, xnext_est, xdotnext, storemidpoints || storederivs, xnext_mid);
+        bool converged = this->stepper_compute(xi, tnext, xnext, xnext_est, xdotnext, domidpoint, xnext_mid);
 
+        if (!converged && this->Adaptive && abs(h) > this->MinStepSize) {
+          h /= this->MaxStepChange;
+          if (abs(h) < this->MinStepSize)
+            h = this->MinStepSize * h / abs(h);
+          continueloop = true;
+          continue;
+        }
+        if (!converged) {
+          // xnext is garbage, and there is no smaller step left to try
+          throw std::runtime_error(
+              fmt::format("Implicit integrator stages failed to converge at t = {0:} with step size {1:}. "
+                          "Use an adaptive integrator or reduce the (minimum) step size.",
+                          xi[this->ode.TVar()],
+                          h));
+        }
 
         if (this->Adaptive) {
           Abserror = (xnext.head(this->ode.XVars()) - xnext_est.head(this->ode.XVars())).cwiseAbs();
@@ -632,34 +939,8 @@ namespace ASSET {
         }
 
 
-        bool eventbreak = false;
-        for (int j = 0; j < events.size(); j++) {
-          next_event_vals[j].setZero();
-          std::get<0>(events[j]).compute(xnext, next_event_vals[j]);
-
-          double vprev = prev_event_vals[j][0];
-          double vnext = next_event_vals[j][0];
-
-          int dir = std::get<1>(events[j]);
-
-          double vprod = vprev * vnext;
-
-          if (vprod < 0.0) {
-            if ((dir > 0 && vnext > 0) || (dir < 0 && vnext < 0) || dir == 0) {
-              Eigen::Vector2d times;
-              times[0] = xi[this->ode.TVar()];
-              times[1] = xnext[this->ode.TVar()];
-              eventtimes[j].push_back(times);
-              int stop = std::get<2>(events[j]);
-
-              if (stop != 0) {
-                if (eventtimes[j].size() == stop) {
-                  eventbreak = true;
-                }
-              }
-            }
-          }
-        }
+        bool eventbreak = this->check_events(
+            events, xi, xdoti, xnext_mid, xnext, xdotnext, prev_event_vals, next_event_vals, eventlocs);
 
 
         xi = xnext;
@@ -688,11 +969,132 @@ namespace ASSET {
     }
 
 
+    /// <summary>
+    /// Integrates the state and its STM together in a single adaptive pass. Each accepted step's
+    /// jacobian is chained into the STM immediately, so no step history is stored and the ode
+    /// is only evaluated once per stage. When FastAdaptiveSTM is false, the error in the STM
+    /// is included in the step size control.
+    /// </summary>
+    STMRet integrate_stm_variational(const ODEState<double>& x, double tf) const {
+
+      if (x.size() != this->ode.IRows()) {
+        throw std::invalid_argument("Incorrectly sized input state.");
+      }
+
+      double t0 = x[this->ode.TVar()];
+      double H = tf - t0;
+      int numsteps = int(abs(H / this->DefStepSize)) + 1;
+      double h = .9 * (H / double(numsteps));
+
+      const int xv = this->ode.XVars();
+
+      ODEState<double> xi = x;
+      this->update_control(xi);
+
+      ODEState<double> xnext = xi;
+      ODEState<double> xnext_est = xi;
+
+      Hessian<double> jxall(this->IRows(), this->IRows());
+      jxall.setIdentity();
+      Jacobian<double> jstep(this->ORows(), this->IRows());
+      Jacobian<double> jstep_est(this->ORows(), this->IRows());
+      Jacobian<double> jactmp(this->ORows(), this->IRows());
+      Jacobian<double> jacerr(this->ORows(), this->IRows());
+
+      ODEDeriv<double> Abserror;
+      ODEDeriv<double> Abserror_max;
+      ODEDeriv<double> Errvec;
+
+      bool HitMinimum = false;
+      int MinimumCount = 0;
+      bool continueloop = true;
+
+      while (continueloop) {
+
+        double tnext = xi[this->ode.TVar()] + h;
+
+        if (H > 0.0) {
+          if ((tnext - tf) >= 0.0) {
+            h = tf - xi[this->ode.TVar()];
+            tnext = tf;
+            continueloop = false;
+          }
+        } else {
+          if ((tnext - tf) <= 0.0) {
+            h = tf - xi[this->ode.TVar()];
+            tnext = tf;
+            continueloop = false;
+          }
+        }
+
+        this->stepper_compute_stm(xi, tnext, xnext, xnext_est, jstep, jstep_est);
+        jactmp.noalias() = jstep * jxall;
+
+        if (this->Adaptive) {
+          Abserror = (xnext.head(xv) - xnext_est.head(xv)).cwiseAbs();
+
+          Errvec = this->AbsTols + xnext.head(xv).cwiseAbs().cwiseProduct(this->RelTols);
+
+          Abserror_max = Abserror.cwiseQuotient(Errvec);
+          int worst = 0;
+          Abserror_max.maxCoeff(&worst);
+
+          double err = Abserror[worst];
+          double acc = Errvec[worst];
+
+          if (!this->FastAdaptiveSTM) {
+            jacerr.noalias() = (jstep - jstep_est) * jxall;
+            for (int k = 0; k < xv; k++) {
+              for (int j = 0; j < this->IRows(); j++) {
+                double jerr = abs(jacerr(k, j));
+                double jacc = this->AbsTols[k] + abs(jactmp(k, j)) * this->RelTols[k];
+                if (jerr * acc > err * jacc) {
+                  err = jerr;
+                  acc = jacc;
+                }
+              }
+            }
+          }
+
+          double hnext = calc_hnext(h, err, acc);
+
+          if (hnext / h > this->MaxStepChange)
+            h *= this->MaxStepChange;
+          else if (hnext / h < 1. / this->MaxStepChange)
+            h /= this->MaxStepChange;
+          else
+            h = hnext;
+
+          if (abs(h) > this->MaxStepSize)
+            h = this->MaxStepSize * h / abs(h);
+
+          if (abs(h) < this->MinStepSize) {
+            h = this->MinStepSize * h / abs(h);
+            HitMinimum = true;
+            MinimumCount++;
+          } else {
+            HitMinimum = false;
+          }
+          if ((err - acc) > 0 && !HitMinimum) {
+            continueloop = true;
+            continue;
+          }
+        }
+
+        xi = xnext;
+        jxall.template topRows<Base::ORC>(this->ORows()) = jactmp;
+      }
+
+      Jacobian<double> jx = jxall.template topRows<Base::ORC>(this->ORows());
+      return std::tuple {xi, jx};
+    }
+
+
     std::vector<Output<double>> integrate_impl_vectorized(
         const std::vector<ODEState<double>>& xs,
         const Eigen::VectorXd& tfs,
         const std::vector<EventPack>& events,
-        std::vector<std::vector<std::vector<Eigen::Vector2d>>>& eventtimes_s,
+        std::vector<EventLocsType>& eventlocs_s,
         bool storestates,
         bool storederivs,
         bool storemidpoints,
@@ -750,7 +1152,7 @@ namespace ASSET {
           std::get<0>(events[j]).compute(xis[i], prev_event_vals_s[i][j]);
         }
         if (events.size() > 0) {
-          eventtimes_s[i].resize(events.size());
+          eventlocs_s[i].resize(events.size());
         }
 
 
@@ -871,7 +1273,7 @@ namespace ASSET {
                                     xnext_SS,
                                     xnext_est_SS,
                                     xdotnext_SS,
-                                    storemidpoints || storederivs,
+                                    storemidpoints || storederivs || events.size() > 0,
                                     xnext_mid_SS);
 
               Abserror_SS =
@@ -934,32 +1336,16 @@ namespace ASSET {
 
 
                 bool eventbreak = false;
-                for (int j = 0; j < events.size(); j++) {
-                  next_event_vals_s[itmp][j].setZero();
-                  std::get<0>(events[j]).compute(xnext, next_event_vals_s[itmp][j]);
-
-                  double vprev = prev_event_vals_s[itmp][j][0];
-                  double vnext = next_event_vals_s[itmp][j][0];
-
-                  int dir = std::get<1>(events[j]);
-
-                  double vprod = vprev * vnext;
-
-                  if (vprod < 0.0) {
-                    if ((dir > 0 && vnext > 0) || (dir < 0 && vnext < 0) || dir == 0) {
-                      Eigen::Vector2d times;
-                      times[0] = xis[itmp][this->ode.TVar()];
-                      times[1] = xnext[this->ode.TVar()];
-                      eventtimes_s[itmp][j].push_back(times);
-                      int stop = std::get<2>(events[j]);
-
-                      if (stop != 0) {
-                        if (eventtimes_s[itmp][j].size() == stop) {
-                          eventbreak = true;
-                        }
-                      }
-                    }
-                  }
+                if (events.size() > 0) {
+                  eventbreak = this->check_events(events,
+                                                  xis[itmp],
+                                                  xdotis[itmp],
+                                                  xnext_mid,
+                                                  xnext,
+                                                  xdotnext,
+                                                  prev_event_vals_s[itmp],
+                                                  next_event_vals_s[itmp],
+                                                  eventlocs_s[itmp]);
                 }
 
 
@@ -1002,118 +1388,111 @@ namespace ASSET {
     }
 
 
-    std::vector<std::vector<ODEState<double>>> find_events(
-        std::shared_ptr<LGLInterpTable> tab,
-        const std::vector<EventPack>& events,
-        const std::vector<std::vector<Eigen::Vector2d>>& eventtimes) const {
-
-
-      Eigen::VectorXi vars;
-      vars.setLinSpaced(this->ode.IRows(), 0, this->ode.IRows() - 1);
-
-      InterpFunction<-1> tabfunc(tab, vars);
-
-      Vector1<double> x;
-      Vector1<double> fx;
-      Vector1<double> fl;
-
-      Vector1<double> jx;
+    /// <summary>
+    /// Evaluates all event functions at the end of an accepted step from x0 to x1. For each one
+    /// that changed sign in its specified direction, the root is located on a quintic hermite
+    /// interpolant of the step and the event state is appended to eventlocs. Returns true if a
+    /// terminal event has occurred its specified number of times.
+    /// </summary>
+    bool check_events(const std::vector<EventPack>& events,
+                      const ODEState<double>& x0,
+                      const ODEDeriv<double>& xdot0,
+                      const ODEState<double>& xmid,
+                      const ODEState<double>& x1,
+                      const ODEDeriv<double>& xdot1,
+                      const std::vector<Vector1<double>>& prev_event_vals,
+                      std::vector<Vector1<double>>& next_event_vals,
+                      EventLocsType& eventlocs) const {
+
+      bool eventbreak = false;
+      std::shared_ptr<LGLInterpTable> tab;
 
-      std::vector<std::vector<ODEState<double>>> eventstates(events.size());
+      for (int j = 0; j < events.size(); j++) {
+        next_event_vals[j].setZero();
+        std::get<0>(events[j]).compute(x1, next_event_vals[j]);
 
-      for (int i = 0; i < events.size(); i++) {
-        if (eventtimes[i].size() > 0) {
+        double vprev = prev_event_vals[j][0];
+        double vnext = next_event_vals[j][0];
 
-          auto func = std::get<0>(events[i]).eval(tabfunc);
+        int dir = std::get<1>(events[j]);
 
-          auto newton = [&](auto x0) {
-            x[0] = x0;
-            for (int k = 0; k < MaxEventIters; k++) {
-              fx.setZero();
-              jx.setZero();
-              func.compute_jacobian(x, fx, jx);
-              if (abs(fx[0]) < abs(EventTol)) {
-                break;
-              }
-              x[0] = x[0] - fx[0] / jx[0];
-            }
-            return x[0];
-          };
-
-          auto bisect =[&](auto tlow, auto thigh,int iters) {
-            double tm  = (tlow + thigh) / 2.0;
-            x[0] = tlow;
-            fl = func.compute(x);
-            int sgnfl = (fl[0] >= 0) - (fl[0] <= 0);
-
-            x[0] = tm;
-            fx = func.compute(x);
-            int sgnfx = (fx[0] >= 0) - (fx[0] <= 0);
-            
-            for (int i = 0; i < 5; i++) {
-              if (sgnfx == sgnfl) {
-                tlow = tm;
-                sgnfl = sgnfx;
-              } else {
-                thigh = tm;
-              }
+        double vprod = vprev * vnext;
 
-              tm = (tlow + thigh) / 2.0;
-              if ((thigh - tlow) / 2.0 < abs(EventTol))
-                break;
+        if (vprod < 0.0) {
+          if ((dir > 0 && vnext > 0) || (dir < 0 && vnext < 0) || dir == 0) {
 
-              x[0] = tm;
-              fx = func.compute(x);
-              sgnfx = (fx[0] >= 0) - (fx[0] <= 0);
-              
+            // Built once per step, and only if some event occurred in it
+            if (!tab) {
+              ODEDeriv<double> xdotmid(this->ode.ORows());
+              xdotmid.setZero();
+              this->ode.compute(xmid, xdotmid);
+              tab = this->make_table({x0, xmid, x1}, {xdot0, xdotmid, xdot1}, true);
             }
-            
-            return std::array<double,3> {tm,tlow,thigh};
-          };
-
-          for (auto& eventtime: eventtimes[i]) {
-
 
-            double tlow  = eventtime[0];
-            double thigh = eventtime[1];
-
-            if (thigh < tlow) {
-              std::swap(tlow, thigh);
+            eventlocs[j].push_back(this->locate_event(std::get<0>(events[j]),
+                                                      *tab,
+                                                      x0[this->ode.TVar()],
+                                                      x1[this->ode.TVar()],
+                                                      vprev,
+                                                      vnext));
+            int stop = std::get<2>(events[j]);
+
+            if (stop != 0) {
+              if (eventlocs[j].size() == stop) {
+                eventbreak = true;
+              }
             }
-
-
-            auto res = bisect(tlow, thigh, 2);
-            double tig =res[0];
-            double tlow2 = res[1];
-            double thigh2 = res[2];
-
-            double tevent = newton(tig);
-
-           if (tevent > tlow && tevent < thigh) {
-              ODEState<double> ei(this->ode.IRows());
-              ei.setZero();
-              tab->InterpolateRef(tevent, ei);
-              eventstates[i].push_back(ei);
-           } else {
-           
-             res = bisect(tlow2, thigh2, MaxEventIters);
-             tig = res[0];
-             tevent = newton(tig);
-
-             if (tevent > tlow && tevent < thigh) {
-                ODEState<double> ei(this->ode.IRows());
-                ei.setZero();
-                tab->InterpolateRef(tevent, ei);
-                eventstates[i].push_back(ei);
-             }// else give up
-           }
-
-
           }
         }
       }
+      return eventbreak;
+    }
+
+    /// <summary>
+    /// Finds the root of an event function bracketed by times ta and tb, where it has values
+    /// ga and gb, on an interpolant of the trajectory using the Illinois variant of regula falsi.
+    /// </summary>
+    ODEState<double> locate_event(const GenericFunction<-1, 1>& func,
+                                  const LGLInterpTable& tab,
+                                  double ta,
+                                  double tb,
+                                  double ga,
+                                  double gb) const {
+
+      ODEState<double> xe(this->ode.IRows());
+      Vector1<double> g;
+      int side = 0;
+      int iter = 0;
+
+      do {
+        double tc = (ta * gb - tb * ga) / (gb - ga);
+
+        xe.setZero();
+        tab.InterpolateRef(tc, xe);
+        g.setZero();
+        func.compute(xe, g);
+        double gc = g[0];
+
+        if (abs(gc) < abs(this->EventTol)) {
+          break;
+        }
 
-      return eventstates;
+        if (gc * gb > 0) {
+          tb = tc;
+          gb = gc;
+          if (side == -1)
+            ga /= 2.0;
+          side = -1;
+        } else {
+          ta = tc;
+          ga = gc;
+          if (side == 1)
+            gb /= 2.0;
+          side = 1;
+        }
+      } while (++iter < this->MaxEventIters);
+
+      return xe;
     }
 
 
@@ -1583,7 +1962,7 @@ namespace ASSET {
 
       ODEState<double> xf;
       std::vector<EventPack> events;
-      std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+      EventLocsType eventlocs;
 
 
       bool storestates = false;
@@ -1593,18 +1972,19 @@ namespace ASSET {
       std::vector<ODEDeriv<double>> dXs;
 
       xf =
-          this->integrate_impl(x0, tf, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
       return xf;
     }
 
     std::vector<ODEState<double>> integrate(const std::vector<ODEState<double>>& x0s,
                                             const Eigen::VectorXd& tfs) const {
 
-      if (!VectorizeBatchCalls) {
+      // Implicit steps solve a linear system per lane, so they are never packed into SuperScalars
+      if (!VectorizeBatchCalls || isImplicitRK(this->RKMethod)) {
 
         std::vector<ODEState<double>> xfs(x0s.size());
         std::vector<EventPack> events;
-        std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+        EventLocsType eventlocs;
 
 
         bool storestates = false;
@@ -1616,7 +1996,7 @@ namespace ASSET {
         for (int i = 0; i < x0s.size(); i++) {
 
           xfs[i] = this->integrate_impl(
-              x0s[i], tfs[i], events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+              x0s[i], tfs[i], events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
         }
 
         return xfs;
@@ -1624,7 +2004,7 @@ namespace ASSET {
       } else {
 
         std::vector<EventPack> events;
-        std::vector<std::vector<std::vector<Eigen::Vector2d>>> eventtimes;
+        std::vector<EventLocsType> eventlocs(x0s.size());
 
         bool storestates = false;
         bool storederivs = false;
@@ -1634,7 +2014,7 @@ namespace ASSET {
 
 
         return integrate_impl_vectorized(
-            x0s, tfs, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+            x0s, tfs, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
       }
     }
 
@@ -1642,7 +2022,7 @@ namespace ASSET {
     std::vector<STMRet> integrate_stm(const std::vector<ODEState<double>>& x0s,
                                       const Eigen::VectorXd& tfs) const {
 
-      if (!VectorizeBatchCalls) {
+      if (!VectorizeBatchCalls || isImplicitRK(this->RKMethod) || this->VariationalSTM) {
         std::vector<STMRet> rets(x0s.size());
         for (int i = 0; i < x0s.size(); i++) {
           rets[i] = this->integrate_stm(x0s[i], tfs[i]);
@@ -1651,7 +2031,7 @@ namespace ASSET {
       } else {
 
         std::vector<EventPack> events;
-        std::vector<std::vector<std::vector<Eigen::Vector2d>>> eventtimes;
+        std::vector<EventLocsType> eventlocs(x0s.size());
 
         bool storestates = true;
         bool storederivs = false;
@@ -1660,7 +2040,7 @@ namespace ASSET {
         std::vector<std::vector<ODEDeriv<double>>> dXs(x0s.size());
 
         auto Xfs = integrate_impl_vectorized(
-            x0s, tfs, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+            x0s, tfs, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
 
         auto Jacs = this->calculate_jacobians(Xs);
         std::vector<STMRet> rets(x0s.size());
@@ -1679,7 +2059,7 @@ namespace ASSET {
         const Eigen::VectorXd& tfs,
         const std::vector<ODEState<double>>& lfs) const {
 
-      if (!VectorizeBatchCalls) {
+      if (!VectorizeBatchCalls || isImplicitRK(this->RKMethod)) {
         std::vector<std::tuple<ODEState<double>, Jacobian<double>, Hessian<double>>> rets(x0s.size());
         for (int i = 0; i < x0s.size(); i++) {
           auto Xs = this->integrate_dense(x0s[i], tfs[i]);
@@ -1690,7 +2070,7 @@ namespace ASSET {
       } else {
 
         std::vector<EventPack> events;
-        std::vector<std::vector<std::vector<Eigen::Vector2d>>> eventtimes;
+        std::vector<EventLocsType> eventlocs(x0s.size());
 
         bool storestates = true;
         bool storederivs = false;
@@ -1700,7 +2080,7 @@ namespace ASSET {
 
 
         auto Xfs = integrate_impl_vectorized(
-            x0s, tfs, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+            x0s, tfs, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
 
         auto [Js, Hs] = this->calculate_jacobians_hessians(Xs, lfs);
         std::vector<std::tuple<ODEState<double>, Jacobian<double>, Hessian<double>>> rets(x0s.size());
@@ -1718,27 +2098,55 @@ namespace ASSET {
                             const std::vector<EventPack>& events) const {
 
       ODEState<double> xf;
-      std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+      EventLocsType eventlocs;
 
-      bool storestates = true;
-      bool storederivs = true;
-      bool storemidpoints = true;
+      bool storestates = false;
+      bool storederivs = false;
+      bool storemidpoints = false;
       std::vector<ODEState<double>> Xs;
       std::vector<ODEDeriv<double>> dXs;
 
       xf =
-          this->integrate_impl(x0, tf, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
 
-      std::vector<std::vector<ODEState<double>>> eventlocs(events.size());
-      for (auto etimes: eventtimes) {
-        if (etimes.size() > 0) {
-          auto tab = this->make_table(Xs, dXs, false);
-          eventlocs = this->find_events(tab, events, eventtimes);
-          break;
+      return std::tuple {xf, eventlocs};
+    }
+
+    std::vector<IntegEventRet> integrate(const std::vector<ODEState<double>>& x0s,
+                                         const Eigen::VectorXd& tfs,
+                                         const std::vector<EventPack>& events) const {
+
+      if (!VectorizeBatchCalls || isImplicitRK(this->RKMethod)) {
+        if (x0s.size() != tfs.size()) {
+          throw std::invalid_argument("Number of initial states and final times must match.");
         }
-      }
+        std::vector<IntegEventRet> rets(x0s.size());
+        for (int i = 0; i < x0s.size(); i++) {
+          rets[i] = this->integrate(x0s[i], tfs[i], events);
+        }
+        return rets;
+      } else {
 
-      return std::tuple {xf, eventlocs};
+        // Events are checked per lane after each packed step, so terminal events
+        // retire their trajectory from the batch without stopping the others
+        std::vector<EventLocsType> eventlocs(x0s.size());
+
+        bool storestates = false;
+        bool storederivs = false;
+        bool storemidpoints = false;
+        std::vector<std::vector<ODEState<double>>> Xs;
+        std::vector<std::vector<ODEDeriv<double>>> dXs;
+
+        auto Xfs = integrate_impl_vectorized(
+            x0s, tfs, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
+
+        std::vector<IntegEventRet> rets(x0s.size());
+        for (int i = 0; i < x0s.size(); i++) {
+          eventlocs[i].resize(events.size());
+          rets[i] = std::tuple {Xfs[i], eventlocs[i]};
+        }
+        return rets;
+      }
     }
 
 
@@ -1761,16 +2169,49 @@ namespace ASSET {
       RetType results(n);
       std::vector<std::future<void>> futures(thrs);
 
-      auto job = [&](int id, int start, int stop) {
-        for (int i = start; i < stop; i++) {
-          results[i] = this->integrate(x0s[i], tfs[i], args...);
+      if (this->VectorizeBatchCalls && !isImplicitRK(this->RKMethod)) {
+
+        // Each thread repeatedly takes the next block of trajectories from a shared counter and
+        // advances it with the vectorized batch integrator, which repacks the still running
+        // trajectories of its block into SuperScalar lanes after every step. Blocks are
+        // several times smaller than an even split so that threads whose trajectories finish
+        // early pick up more work.
+        constexpr int Lanes = DefaultSuperScalar::SizeAtCompileTime;
+        int blocksize = std::max(4 * Lanes, n / (4 * thrs) + 1);
+        int nblocks = (n + blocksize - 1) / blocksize;
+        std::atomic<int> nextblock(0);
+
+        auto job = [&](int id) {
+          std::vector<ODEState<double>> x0block;
+          Eigen::VectorXd tfblock;
+          for (int b = nextblock++; b < nblocks; b = nextblock++) {
+            int start = b * blocksize;
+            int stop = std::min(start + blocksize, n);
+
+            x0block.assign(x0s.begin() + start, x0s.begin() + stop);
+            tfblock = tfs.segment(start, stop - start);
+
+            auto blockresults = this->integrate(x0block, tfblock, args...);
+            std::move(blockresults.begin(), blockresults.end(), results.begin() + start);
+          }
+        };
+
+        for (int i = 0; i < thrs; i++) {
+          futures[i] = this->pool->push(job);
         }
-      };
+      } else {
 
-      for (int i = 0; i < thrs; i++) {
-        int start = (i * n) / thrs;
-        int stop = ((i + 1) * n) / thrs;
-        futures[i] = this->pool->push(job, start, stop);
+        auto job = [&](int id, int start, int stop) {
+          for (int i = start; i < stop; i++) {
+            results[i] = this->integrate(x0s[i], tfs[i], args...);
+          }
+        };
+
+        for (int i = 0; i < thrs; i++) {
+          int start = (i * n) / thrs;
+          int stop = ((i + 1) * n) / thrs;
+          futures[i] = this->pool->push(job, start, stop);
+        }
       }
       for (int i = 0; i < thrs; i++) {
         futures[i].get();
@@ -1795,7 +2236,7 @@ namespace ASSET {
 
       ODEState<double> xf;
       std::vector<EventPack> events;
-      std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+      EventLocsType eventlocs;
 
       bool storestates = true;
       bool storederivs = false;
@@ -1804,7 +2245,7 @@ namespace ASSET {
       std::vector<ODEDeriv<double>> dXs;
 
       xf =
-          this->integrate_impl(x0, tf, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
       return Xs;
     }
 
@@ -1814,7 +2255,7 @@ namespace ASSET {
                                   bool alloutput) const {
 
       ODEState<double> xf;
-      std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+      EventLocsType eventlocs;
 
       bool storestates = true;
       bool storederivs = true;
@@ -1823,16 +2264,7 @@ namespace ASSET {
       std::vector<ODEDeriv<double>> dXs;
 
       xf =
-          this->integrate_impl(x0, tf, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
-
-      std::vector<std::vector<ODEState<double>>> eventlocs(events.size());
-      for (auto etimes: eventtimes) {
-        if (etimes.size() > 0) {
-          auto tab = this->make_table(Xs, dXs, false);
-          eventlocs = this->find_events(tab, events, eventtimes);
-          break;
-        }
-      }
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
       if (alloutput)
         return std::tuple {Xs, eventlocs};
       else
@@ -1845,7 +2277,7 @@ namespace ASSET {
                                   const std::vector<EventPack>& events) const {
 
       ODEState<double> xf;
-      std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+      EventLocsType eventlocs;
 
       bool storestates = true;
       bool storederivs = true;
@@ -1854,10 +2286,9 @@ namespace ASSET {
       std::vector<ODEDeriv<double>> dXs;
 
       xf =
-          this->integrate_impl(x0, tf, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
 
       auto tab = this->make_table(Xs, dXs, true);
-      std::vector<std::vector<ODEState<double>>> eventlocs = this->find_events(tab, events, eventtimes);
 
       Eigen::VectorXd ts;
       ts.setLinSpaced(n, Xs[0][this->ode.TVar()], Xs.back()[this->ode.TVar()]);
@@ -1875,7 +2306,7 @@ namespace ASSET {
     DenseRet integrate_dense(const ODEState<double>& x0, double tf, int n) const {
 
       ODEState<double> xf;
-      std::vector<std::vector<Eigen::Vector2d>> eventtimes;
+      EventLocsType eventlocs;
 
       bool storestates = true;
       bool storederivs = true;
@@ -1885,7 +2316,7 @@ namespace ASSET {
       std::vector<EventPack> events;
 
       xf =
-          this->integrate_impl(x0, tf, events, eventtimes, storestates, storederivs, storemidpoints, Xs, dXs);
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
 
       auto tab = this->make_table(Xs, dXs, true);
 
@@ -1904,6 +2335,30 @@ namespace ASSET {
     }
 
 
+    /// <summary>
+    /// Integrates from x0 to tf and returns the solution as a continuous function of time.
+    /// Each accepted step is stored with the RK method's midpoint and the derivatives at all
+    /// three points, giving a quintic Hermite interpolant over every step that can be sampled
+    /// at any time, or array of times, without reintegrating.
+    /// </summary>
+    std::shared_ptr<LGLInterpTable> integrate_dense_table(const ODEState<double>& x0, double tf) const {
+
+      ODEState<double> xf;
+      EventLocsType eventlocs;
+
+      bool storestates = true;
+      bool storederivs = true;
+      bool storemidpoints = true;
+      std::vector<ODEState<double>> Xs;
+      std::vector<ODEDeriv<double>> dXs;
+      std::vector<EventPack> events;
+
+      xf =
+          this->integrate_impl(x0, tf, events, eventlocs, storestates, storederivs, storemidpoints, Xs, dXs);
+
+      return this->make_table(Xs, dXs, true);
+    }
+
     DenseRet integrate_dense(const ODEState<double>& x0,
                              double tf,
                              int NumStates,
@@ -2027,6 +2482,9 @@ namespace ASSET {
 
 
     STMRet integrate_stm(const ODEState<double>& x0, double tf) const {
+      if (this->VariationalSTM && !isImplicitRK(this->RKMethod)) {
+        return this->integrate_stm_variational(x0, tf);
+      }
       auto Xs = this->integrate_dense(x0, tf);
       Jacobian<double> jx = this->calculate_jacobian(Xs);
       return std::tuple {Xs.back(), jx};
@@ -2275,6 +2733,16 @@ namespace ASSET {
               py::arg("tfs"),
               py::call_guard<py::gil_scoped_release>());
 
+      obj.def("integrate",
+              (std::vector<IntegEventRet>(Integrator::*)(const std::vector<ODEState<double>>&,
+                                                         const Eigen::VectorXd&,
+                                                         const std::vector<EventPack>&) const)
+                  & Integrator::integrate,
+              py::arg("Xt0UPs"),
+              py::arg("tfs"),
+              py::arg("Events"),
+              py::call_guard<py::gil_scoped_release>());
+
       obj.def("integrate_stm",
               (std::vector<STMRet>(Integrator::*)(const std::vector<ODEState<double>>&,
                                                   const Eigen::VectorXd&) const)
@@ -2360,6 +2828,11 @@ namespace ASSET {
               py::arg("nstates"),
               py::arg("Events"));
 
+      obj.def("integrate_dense_table",
+              &Integrator::integrate_dense_table,
+              py::arg("Xt0UP"),
+              py::arg("tf"));
+
 
       ////////////////////////////////////////////////////////////////////////////
 
@@ -2464,6 +2937,7 @@ namespace ASSET {
       obj.def_readwrite("MinStepSize", &Integrator::MinStepSize);
       obj.def_readwrite("MaxStepChange", &Integrator::MaxStepChange);
       obj.def_readwrite("FastAdaptiveSTM", &Integrator::FastAdaptiveSTM);
+      obj.def_readwrite("VariationalSTM", &Integrator::VariationalSTM);
 
       obj.def_readwrite("StepFrac", &Integrator::StepFrac);
       obj.def_readwrite("ErrPowFac", &Integrator::ErrPowFac);
@@ -2490,6 +2964,9 @@ namespace ASSET {
       obj.def_readwrite("EventTol", &Integrator::EventTol);
       obj.def_readwrite("MaxEventIters", &Integrator::MaxEventIters);
       obj.def_readwrite("VectorizeBatchCalls", &Integrator::VectorizeBatchCalls);
+      obj.def_readwrite("MaxImplicitIters", &Integrator::MaxImplicitIters);
+      obj.def_readwrite("ImplicitTol", &Integrator::ImplicitTol);
+      obj.def("getMethod", &Integrator::getMethod);
     }
   };
 
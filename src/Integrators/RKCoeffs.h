@@ -13,14 +13,23 @@ namespace ASSET {
     RK78,
     Ralston3,
     Ralston2,
-    DOPRI5
+    DOPRI5,
+    SDIRK43
   };
 
+  /// <summary>
+  /// True for methods whose stages must be solved for implicitly.
+  /// </summary>
+  constexpr bool isImplicitRK(RKOptions opt) {
+    return opt == RKOptions::SDIRK43;
+  }
+
   static void RKFlagsBuild(py::module& m) {
     py::enum_<RKOptions>(m, "RKOptions")
         .value("RK4", RKOptions::RK4Classic)
         .value("DOPRI54", RKOptions::DOPRI54)
-        .value("DOPRI87", RKOptions::DOPRI87);
+        .value("DOPRI87", RKOptions::DOPRI87)
+        .value("SDIRK43", RKOptions::SDIRK43);
   }
 
   template<RKOptions opt>
@@ -263,4 +272,35 @@ namespace ASSET {
                                                        -0.0276768086980947};
   };
 
+  /// <summary>
+  /// L-stable, stiffly accurate SDIRK method of order 4 with an embedded order 3 solution,
+  /// Hairer and Wanner, Solving ODEs II, Table 6.5. Unlike the explicit tables above, ACoeffs
+  /// includes the (constant) diagonal Gamma and Times holds the abscissa of every stage.
+  /// </summary>
+  template<>
+  struct RKCoeffs<RKOptions::SDIRK43> {
+    static const int Stages = 5;
+    static const bool isDiag = false;
+    static const bool EmbeddedCorrector = true;
+    static const bool FSAL = false;
+
+    template<class T, int SZ>
+    using STDarray = std::array<T, SZ>;
+
+    static constexpr double Gamma = 1.0 / 4.0;
+
+    static constexpr STDarray<STDarray<double, 5>, 5> ACoeffs = {
+        STDarray<double, 5> {1.0 / 4.0, 0, 0, 0, 0},
+        STDarray<double, 5> {1.0 / 2.0, 1.0 / 4.0, 0, 0, 0},
+        STDarray<double, 5> {17.0 / 50.0, -1.0 / 25.0, 1.0 / 4.0, 0, 0},
+        STDarray<double, 5> {371.0 / 1360.0, -137.0 / 2720.0, 15.0 / 544.0, 1.0 / 4.0, 0},
+        STDarray<double, 5> {25.0 / 24.0, -49.0 / 48.0, 125.0 / 16.0, -85.0 / 12.0, 1.0 / 4.0}};
+
+    static constexpr STDarray<double, 5> Times = {1.0 / 4.0, 3.0 / 4.0, 11.0 / 20.0, 1.0 / 2.0, 1.0};
+    static constexpr STDarray<double, 5> BCoeffs = {
+        25.0 / 24.0, -49.0 / 48.0, 125.0 / 16.0, -85.0 / 12.0, 1.0 / 4.0};
+    static constexpr STDarray<double, 5> CCoeffs = {
+        59.0 / 48.0, -17.0 / 96.0, 225.0 / 32.0, -85.0 / 12.0, 0};
+  };
+
 }  // namespace ASSET
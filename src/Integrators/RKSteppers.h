@@ -382,6 +382,231 @@ namespace ASSET {
   };
 
 
+  /// <summary>
+  /// Differentiable single step of a diagonally implicit (SDIRK) method. The stage equations
+  /// are solved with Newton's method using the ode's analytic jacobian, and the jacobian of the
+  /// step follows from the implicit function theorem applied to the converged stages.
+  /// Second derivatives are taken by finite differencing the jacobian.
+  /// </summary>
+  template<class DODE, RKOptions RKOp>
+  struct SDIRKStepper
+      : VectorFunction<SDIRKStepper<DODE, RKOp>, SZ_SUM<DODE::IRC, 1>::value, DODE::IRC, Analytic, FDiffFwd> {
+    using Base =
+        VectorFunction<SDIRKStepper<DODE, RKOp>, SZ_SUM<DODE::IRC, 1>::value, DODE::IRC, Analytic, FDiffFwd>;
+    DENSE_FUNCTION_BASE_TYPES(Base);
+
+    template<class Scalar>
+    using ODEDeriv = typename DODE::template Output<Scalar>;
+    template<class Scalar>
+    using ODEState = typename DODE::template Input<Scalar>;
+    template<class Scalar>
+    using ODEJacobian = typename DODE::template Jacobian<Scalar>;
+    template<class Scalar>
+    using StageMatrix = Eigen::Matrix<Scalar, DODE::XV, DODE::XV>;
+
+    // Each stage is a small nonlinear solve, so lanes are stepped one at a time
+    static const bool IsVectorizable = false;
+
+    using RKData = RKCoeffs<RKOp>;
+    static const int Stages = RKData::Stages;
+
+    template<class T, int SZ>
+    using STDarray = std::array<T, SZ>;
+
+    DODE ode;
+    int MaxNewtonIters = 20;
+    double NewtonTol = 1.0e-10;
+
+    SDIRKStepper() {
+    }
+    SDIRKStepper(DODE ode) : ode(ode) {
+      this->setIORows(this->ode.IRows() + 1, this->ode.IRows());
+      this->setHessFDSteps(1.0e-6);
+    }
+
+    /// <summary>
+    /// Solves for the stage states Xs and the stage derivatives Kvals (scaled by h).
+    /// Full Newton is used so the stages converge to round off, which keeps the
+    /// finite differenced hessian clean.
+    /// </summary>
+    template<class Scalar, class InType>
+    void solve_stages(const Eigen::MatrixBase<InType>& x,
+                      STDarray<ODEDeriv<Scalar>, Stages>& Kvals,
+                      STDarray<ODEState<Scalar>, Stages>& Xs) const {
+      const int xv = this->ode.XVars();
+      const int tvar = this->ode.TVar();
+
+      ODEState<Scalar> x0 = x.template segment<DODE::IRC>(0, this->ode.IRows());
+      Scalar t0 = x0[tvar];
+      Scalar tf = x[this->IRows() - 1];
+      Scalar h = tf - t0;
+      Scalar gh = Scalar(RKData::Gamma) * h;
+
+      ODEDeriv<Scalar> fx(this->ode.ORows());
+      ODEDeriv<Scalar> S(xv);
+      ODEDeriv<Scalar> dY(xv);
+      ODEJacobian<Scalar> jac(this->ode.ORows(), this->ode.IRows());
+      StageMatrix<Scalar> M(xv, xv);
+
+      for (int i = 0; i < Stages; i++) {
+        S = x0.template head<DODE::XV>(xv);
+        for (int j = 0; j < i; j++) {
+          S += Scalar(RKData::ACoeffs[i][j]) * Kvals[j];
+        }
+
+        Xs[i] = x0;
+        Xs[i][tvar] = t0 + Scalar(RKData::Times[i]) * h;
+        Xs[i].template head<DODE::XV>(xv) = S;
+        if (i > 0) {
+          Xs[i].template head<DODE::XV>(xv) += Scalar(RKData::Gamma) * Kvals[i - 1];
+        }
+
+        for (int iter = 0; iter < this->MaxNewtonIters; iter++) {
+          fx.setZero();
+          jac.setZero();
+          this->ode.compute_jacobian(Xs[i], fx, jac);
+
+          M = -gh * jac.template leftCols<DODE::XV>(xv);
+          M.diagonal().array() += Scalar(1.0);
+          dY = M.partialPivLu().solve(Xs[i].template head<DODE::XV>(xv) - S - gh * fx);
+          Xs[i].template head<DODE::XV>(xv) -= dY;
+
+          Scalar scale = Scalar(1.0) + Xs[i].template head<DODE::XV>(xv).cwiseAbs().maxCoeff();
+          if (dY.cwiseAbs().maxCoeff() < this->NewtonTol * scale)
+            break;
+        }
+
+        fx.setZero();
+        this->ode.compute(Xs[i], fx);
+        Kvals[i] = fx * h;
+      }
+    }
+
+    template<class InType, class OutType>
+    inline void compute_impl(const Eigen::MatrixBase<InType>& x,
+                             Eigen::MatrixBase<OutType> const& fx_) const {
+      typedef typename InType::Scalar Scalar;
+      Eigen::MatrixBase<OutType>& fx = fx_.const_cast_derived();
+
+      STDarray<ODEDeriv<Scalar>, Stages> Kvals;
+      STDarray<ODEState<Scalar>, Stages> Xs;
+      this->template solve_stages<Scalar>(x, Kvals, Xs);
+
+      ODEState<Scalar> xtup = x.template segment<DODE::IRC>(0, this->ode.IRows());
+      xtup[this->ode.TVar()] = x[this->IRows() - 1];
+      for (int i = 0; i < Stages; i++) {
+        xtup.template head<DODE::XV>(this->ode.XVars()) += Scalar(RKData::BCoeffs[i]) * Kvals[i];
+      }
+      fx = xtup;  // Next State
+    }
+
+    template<class InType, class OutType, class JacType>
+    inline void compute_jacobian_impl(const Eigen::MatrixBase<InType>& x,
+                                      Eigen::MatrixBase<OutType> const& fx_,
+                                      Eigen::MatrixBase<JacType> const& jx_) const {
+      typedef typename InType::Scalar Scalar;
+      Eigen::MatrixBase<JacType>& jx = jx_.const_cast_derived();
+      Eigen::MatrixBase<OutType>& fx = fx_.const_cast_derived();
+
+      const int xv = this->ode.XVars();
+      const int tvar = this->ode.TVar();
+
+      STDarray<ODEDeriv<Scalar>, Stages> Kvals;
+      STDarray<ODEState<Scalar>, Stages> Xs;
+      this->template solve_stages<Scalar>(x, Kvals, Xs);
+
+      Scalar t0 = x[tvar];
+      Scalar tf = x[this->IRows() - 1];
+      Scalar h = tf - t0;
+      Scalar gh = Scalar(RKData::Gamma) * h;
+
+      ODEDeriv<Scalar> fi(this->ode.ORows());
+      ODEJacobian<Scalar> Kjac(this->ode.ORows(), this->ode.IRows());
+      Jacobian<Scalar> Xijac(this->ORows(), this->IRows());
+      StageMatrix<Scalar> M(xv, xv);
+      STDarray<Eigen::Matrix<Scalar, DODE::XV, Base::IRC>, Stages> KXjacs;
+
+      for (int i = 0; i < Stages; i++) {
+        Xijac.setIdentity();
+        Xijac(tvar, tvar) = Scalar(1.0) - Scalar(RKData::Times[i]);
+        Xijac(tvar, this->IRows() - 1) = Scalar(RKData::Times[i]);
+        for (int j = 0; j < i; j++) {
+          Xijac.template topRows<DODE::XV>(xv) += Scalar(RKData::ACoeffs[i][j]) * KXjacs[j];
+        }
+
+        fi.setZero();
+        Kjac.setZero();
+        this->ode.compute_jacobian(Xs[i], fi, Kjac);
+
+        KXjacs[i].noalias() = h * Kjac * Xijac;
+        KXjacs[i].col(tvar) -= fi;
+        KXjacs[i].col(this->IRows() - 1) += fi;
+
+        // K_i also appears through the diagonal term of its own stage state
+        M = -gh * Kjac.template leftCols<DODE::XV>(xv);
+        M.diagonal().array() += Scalar(1.0);
+        KXjacs[i] = M.partialPivLu().solve(KXjacs[i]);
+      }
+
+      ODEState<Scalar> xtup = x.template segment<DODE::IRC>(0, this->ode.IRows());
+      xtup[tvar] = tf;
+
+      Xijac.setIdentity();
+      Xijac(tvar, tvar) = Scalar(0);
+      Xijac(tvar, this->IRows() - 1) = Scalar(1);
+
+      for (int i = 0; i < Stages; i++) {
+        xtup.template head<DODE::XV>(xv) += Scalar(RKData::BCoeffs[i]) * Kvals[i];
+        Xijac.template topRows<DODE::XV>(xv) += Scalar(RKData::BCoeffs[i]) * KXjacs[i];
+      }
+      fx = xtup;  // Next State
+      jx = Xijac;
+    }
+
+
+    /// These Methods are being nulled because it is not
+    /// possible for them to be called
+
+    void constraints(ConstEigenRef<Eigen::VectorXd> X,
+                     EigenRef<Eigen::VectorXd> FX,
+                     const SolverIndexingData& data) const {};
+    void constraints_adjointgradient(ConstEigenRef<Eigen::VectorXd> X,
+                                     ConstEigenRef<Eigen::VectorXd> L,
+                                     EigenRef<Eigen::VectorXd> FX,
+                                     EigenRef<Eigen::VectorXd> AGX,
+                                     const SolverIndexingData& data) const {};
+    void constraints_jacobian(ConstEigenRef<Eigen::VectorXd> X,
+                              Eigen::Ref<Eigen::VectorXd> FX,
+                              Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat,
+                              Eigen::Ref<Eigen::VectorXi> KKTLocations,
+                              Eigen::Ref<Eigen::VectorXi> KKTClashes,
+                              std::vector<std::mutex>& KKTLocks,
+                              const SolverIndexingData& data) const {
+    }
+    void constraints_jacobian_adjointgradient(ConstEigenRef<Eigen::VectorXd> X,
+                                              ConstEigenRef<Eigen::VectorXd> L,
+                                              Eigen::Ref<Eigen::VectorXd> FX,
+                                              Eigen::Ref<Eigen::VectorXd> AGX,
+                                              Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat,
+                                              EigenRef<Eigen::VectorXi> KKTLocations,
+                                              EigenRef<Eigen::VectorXi> KKTClashes,
+                                              std::vector<std::mutex>& KKTLocks,
+                                              const SolverIndexingData& data) const {
+    }
+    void constraints_jacobian_adjointgradient_adjointhessian(
+        ConstEigenRef<Eigen::VectorXd> X,
+        ConstEigenRef<Eigen::VectorXd> L,
+        EigenRef<Eigen::VectorXd> FX,
+        EigenRef<Eigen::VectorXd> AGX,
+        Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat,
+        EigenRef<Eigen::VectorXi> KKTLocations,
+        EigenRef<Eigen::VectorXi> KKTClashes,
+        std::vector<std::mutex>& KKTLocks,
+        const SolverIndexingData& data) const {
+    }
+  };
+
+
   template<class DODE, RKOptions RKOp>
   struct RKStepper_Impl {
     static auto Definition(const DODE& ode) {
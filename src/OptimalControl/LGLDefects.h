@@ -2,6 +2,7 @@
 
 #include "LGLCoeffs.h"
 #include "TranscriptionSizing.h"
+#include "VectorFunctions/SparsityPattern.h"
 #include "VectorFunctions/VectorFunction.h"
 
 namespace ASSET {
@@ -42,6 +43,7 @@ namespace ASSET {
     using Coeffs = LGLCoeffs<CS>;
     /////////////////////////////////////////////////////////////////////////////
     DODE ode;
+    SparsityPattern Sparsity;
     static const bool IsVectorizable = DODE::IsVectorizable;
 
     LGLDefects(const DODE& od) {
@@ -53,6 +55,19 @@ namespace ASSET {
       this->setInputRows(CS * this->ode.XtUVars() + this->ode.PVars());
     }
 
+    inline bool JacobianElemIsNonZero(int row, int col) const {
+      return this->Sparsity.jacobian_nz(row, col);
+    }
+    inline bool HessianElemIsNonZero(int row, int col) const {
+      return this->Sparsity.hessian_nz(row, col);
+    }
+    inline void AddHessianElem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      this->Sparsity.add_hessian_elem(v, row, col, mpt, lpt, freeloc);
+    }
+    inline void AddJacobianElem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      this->Sparsity.add_jacobian_elem(v, row, col, mpt, lpt, freeloc);
+    }
+
     ////////////////////////////////////////////////////////////////////////////////////
     template<class InType, class OutType>
     inline void compute_impl(const Eigen::MatrixBase<InType>& x,
@@ -256,6 +256,11 @@ void ASSET::LGLInterpTable::Build(py::module& m) {
   obj.def("getTablePtr", &LGLInterpTable::getTablePtr);
   obj.def("loadUnevenData", &LGLInterpTable::loadUnevenData);
   obj.def("Interpolate", &LGLInterpTable::Interpolate<double>);
+  obj.def("Interpolate",
+          &LGLInterpTable::InterpolateBatch,
+          py::arg("ts"),
+          py::arg("nthreads") = 1,
+          py::call_guard<py::gil_scoped_release>());
 
   obj.def("NewErrorIntegral", &LGLInterpTable::NewErrorIntegral);
 
@@ -263,9 +268,19 @@ void ASSET::LGLInterpTable::Build(py::module& m) {
   obj.def("__call__",
           py::overload_cast<double>(&LGLInterpTable::Interpolate<double>, py::const_),
           py::is_operator());
+  obj.def("__call__",
+          &LGLInterpTable::InterpolateBatch,
+          py::arg("ts"),
+          py::arg("nthreads") = 1,
+          py::call_guard<py::gil_scoped_release>());
 
 
   obj.def("InterpolateDeriv", &LGLInterpTable::InterpolateDeriv<double>);
+  obj.def("InterpolateDeriv",
+          &LGLInterpTable::InterpolateDerivBatch,
+          py::arg("ts"),
+          py::arg("nthreads") = 1,
+          py::call_guard<py::gil_scoped_release>());
   obj.def("makePeriodic", &LGLInterpTable::makePeriodic);
 
   obj.def("InterpRange", &LGLInterpTable::InterpRange);
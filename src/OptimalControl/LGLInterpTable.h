@@ -1,5 +1,7 @@
 #pragma once
 
+#include <numeric>
+
 #include "FDDerivArbitrary.h"
 #include "LGLCoeffs.h"
 #include "OptimalControlFlags.h"
@@ -33,7 +35,12 @@ namespace ASSET {
     int BlockSize = 0;
     int NumBlocks = 0;
     int NumStates = 0;
-    mutable int LastBlockAccessed = 0;
+
+    /// <summary>
+    /// Start time of every block followed by the end time of the last one. Binary searched
+    /// to find the block containing a time when the data is not evenly spaced.
+    /// </summary>
+    std::vector<double> BlockTimes;
 
     bool Periodic = false;
     bool EvenData = false;
@@ -197,7 +204,6 @@ namespace ASSET {
       this->NumBlocks = (this->NumStates - 1) / (this->BlockSize - 1);
       this->DeltaT = this->TotalT / double(this->NumBlocks);
       this->EvenData = true;
-      this->LastBlockAccessed = 0;
       Eigen::VectorXd temp(this->XVars);
 
       for (int i = 0; i < this->NumStates; i++) {
@@ -224,6 +230,7 @@ namespace ASSET {
           this->XdotData.col(i) = datatmp[i].head(this->XVars);
         }
       }
+      this->makeBlockTimes();
     }
 
     void loadEvenData2(const std::vector<Eigen::VectorXd>& xtudat,
@@ -249,13 +256,13 @@ namespace ASSET {
       this->NumBlocks = (this->NumStates - 1) / (this->BlockSize - 1);
       this->DeltaT = this->TotalT / double(this->NumBlocks);
       this->EvenData = true;
-      this->LastBlockAccessed = 0;
       Eigen::VectorXd temp(this->XVars);
 
       for (int i = 0; i < this->NumStates; i++) {
         this->XtUData.col(i) = xtudat[i];
         this->XdotData.col(i) = xdotdat[i];
       }
+      this->makeBlockTimes();
     }
 
     void loadUnevenData(int dnum, const std::vector<Eigen::VectorXd>& xtudat) {
@@ -284,7 +291,6 @@ namespace ASSET {
       this->NumStates = xtudat.size();
       this->NumBlocks = (this->NumStates - 1) / (this->BlockSize - 1);
       this->EvenData = false;
-      this->LastBlockAccessed = 0;
       Eigen::VectorXd temp(this->XVars);
 
       for (int i = 0; i < this->NumStates; i++) {
@@ -295,6 +301,8 @@ namespace ASSET {
           this->XdotData.col(i) = temp;
         }
       }
+      // NDequidist below searches the new blocks, so their times must be current
+      this->makeBlockTimes();
 
       if (!this->HasOde) {
         FDDerivArbitrary<Eigen::VectorXd> dterp;
@@ -335,7 +343,6 @@ namespace ASSET {
       this->NumStates = xtudat.size();
       this->NumBlocks = (this->NumStates - 1) / (this->BlockSize - 1);
       this->EvenData = false;
-      this->LastBlockAccessed = 0;
       Eigen::VectorXd temp(this->XVars);
       for (int i = 0; i < this->NumStates; i++) {
         temp.setZero();
@@ -343,6 +350,7 @@ namespace ASSET {
         this->XtUData.col(i) = xtudat[i];
         this->XdotData.col(i) = temp;
       }
+      this->makeBlockTimes();
       std::vector<Eigen::VectorXd> nxs = this->NDequidist(dnum, 0.0, 1.0);
       this->loadEvenData(nxs);
     }
@@ -361,7 +369,6 @@ namespace ASSET {
       this->NumStates = xtudat.size();
       this->NumBlocks = (this->NumStates - 1) / (this->BlockSize - 1);
       this->EvenData = false;
-      this->LastBlockAccessed = 0;
       Eigen::VectorXd temp(this->XVars);
       for (int i = 0; i < this->NumStates; i++) {
         temp.setZero();
@@ -369,6 +376,7 @@ namespace ASSET {
         this->XtUData.col(i) = xtudat[i];
         this->XdotData.col(i) = temp;
       }
+      this->makeBlockTimes();
     }
     template<class V1, class V2>
     void loadExactData(const std::vector<V1>& xtudat, const std::vector<V2>& xdotdat) {
@@ -384,11 +392,11 @@ namespace ASSET {
       this->NumStates = xtudat.size();
       this->NumBlocks = (this->NumStates - 1) / (this->BlockSize - 1);
       this->EvenData = false;
-      this->LastBlockAccessed = 0;
       for (int i = 0; i < this->NumStates; i++) {
         this->XtUData.col(i) = xtudat[i];
         this->XdotData.col(i) = xdotdat[i];
       }
+      this->makeBlockTimes();
     }
 
 
@@ -490,6 +498,80 @@ namespace ASSET {
       this->InterpolateDerivRef(tglobal, fx);
       return fx;
     }
+
+    using RowMatrixXd = Eigen::Matrix<double, -1, -1, Eigen::RowMajor>;
+
+    /// <summary>
+    /// Calls fun(i,element,tnd) for every time in ts. Queries are visited in time order so
+    /// consecutive lookups hit the same or an adjacent block, and are optionally split
+    /// into contiguous chunks over nthreads threads. The calling thread takes the first
+    /// chunk and the rest run on the shared BatchThreadPool.
+    /// </summary>
+    template<class Func>
+    void BatchImpl(const Eigen::VectorXd& ts, int nthreads, Func&& fun) const {
+      int n = int(ts.size());
+      std::vector<int> order(n);
+      std::iota(order.begin(), order.end(), 0);
+      if (!std::is_sorted(ts.begin(), ts.end())) {
+        std::stable_sort(order.begin(), order.end(), [&](int i, int j) { return ts[i] < ts[j]; });
+      }
+
+      auto job = [&](int id, int start, int stop) {
+        int element = 0;
+        double tnd = 0;
+        for (int j = start; j < stop; j++) {
+          int i = order[j];
+          this->FindBlock(ts[i], tnd, element);
+          fun(i, element, tnd);
+        }
+      };
+
+      // Not worth handing off to threads for a handful of points each
+      nthreads = std::max(1, std::min(nthreads, n / 256));
+      if (nthreads == 1) {
+        job(0, 0, n);
+        return;
+      }
+      auto pool = BatchThreadPool(nthreads - 1);
+      std::vector<std::future<void>> futures(nthreads - 1);
+      for (int k = 1; k < nthreads; k++) {
+        futures[k - 1] = pool->push(job, (k * n) / nthreads, ((k + 1) * n) / nthreads);
+      }
+      job(0, 0, n / nthreads);
+      for (auto& fut: futures) {
+        fut.get();
+      }
+    }
+
+    /// <summary>
+    /// Interpolates the table at every time in ts. Row i of the result is the table's output at ts[i].
+    /// </summary>
+    RowMatrixXd InterpolateBatch(const Eigen::VectorXd& ts, int nthreads) const {
+      RowMatrixXd fxs(ts.size(), this->XtUVars);
+      fxs.setZero();
+      this->BatchImpl(ts, nthreads, [&](int i, int element, double tnd) {
+        this->InterpIthBlock(tnd, fxs.row(i).transpose(), element);
+      });
+      return fxs;
+    }
+
+    /// <summary>
+    /// Interpolates the table and its time derivative at every time in ts. Returns the values and
+    /// derivatives as two arrays with one row per time.
+    /// </summary>
+    std::tuple<RowMatrixXd, RowMatrixXd> InterpolateDerivBatch(const Eigen::VectorXd& ts, int nthreads) const {
+      RowMatrixXd fxs(ts.size(), this->XtUVars);
+      RowMatrixXd dfxs(ts.size(), this->XtUVars);
+      this->BatchImpl(ts, nthreads, [&](int i, int element, double tnd) {
+        Eigen::Matrix<double, -1, 2> fx(this->XtUVars, 2);
+        fx.setZero();
+        this->InterpIthBlockDeriv(tnd, fx, element);
+        fxs.row(i) = fx.col(0).transpose();
+        dfxs.row(i) = fx.col(1).transpose();
+      });
+      return std::tuple {fxs, dfxs};
+    }
+
     template<class Scalar>
     void FindBlock(Scalar tglobal, Scalar& tnd, int& element) const {
       if (this->EvenData) {
@@ -515,21 +597,25 @@ namespace ASSET {
         tnd = remainder / this->DeltaT;
         return;
       }
-      element = this->LastBlockAccessed;
-      int sd = 0;
-      do {
-        sd = this->CheckIthBlock(tglobal, element);
 
+      // Each thread remembers the last block it found. Queries from integrators and sequential
+      // constraint evaluations usually land in the same or an adjacent block, so check those
+      // before falling back to the binary search. The hint is only ever a guess, so sharing it
+      // between tables on the same thread is harmless.
+      static thread_local int BlockHint = 0;
+
+      element = BlockHint;
+      int sd = (element < this->NumBlocks) ? this->CheckIthBlock(tglobal, element) : 2;
+      if (sd == 1 || sd == -1) {
         element += sd;
-        if (element < 0) {
-          element = 0;
-          break;
-        } else if (element == this->NumBlocks) {
-          element = this->NumBlocks - 1;
-          break;
-        }
-      } while (sd != 0);
-      this->LastBlockAccessed = element;
+        if (element < 0 || element >= this->NumBlocks || this->CheckIthBlock(tglobal, element) != 0)
+          sd = 2;
+        else
+          sd = 0;
+      }
+      if (sd != 0)
+        element = this->SearchBlockTimes(tglobal);
+      BlockHint = element;
       double tb0 = this->XtUData.middleCols((this->BlockSize - 1) * element, this->BlockSize)(axis, 0);
       double tbf = this->XtUData.middleCols((this->BlockSize - 1) * element, this->BlockSize)(
           axis, this->BlockSize - 1);
@@ -896,6 +982,24 @@ namespace ASSET {
       }
     }
 
+    void makeBlockTimes() {
+      this->BlockTimes.resize(this->NumBlocks + 1);
+      for (int i = 0; i <= this->NumBlocks; i++) {
+        this->BlockTimes[i] = this->XtUData(axis, (this->BlockSize - 1) * i);
+      }
+    }
+
+    template<class Scalar>
+    int SearchBlockTimes(Scalar tglob) const {
+      auto it = (this->TF >= this->T0)
+                    ? std::upper_bound(this->BlockTimes.cbegin(), this->BlockTimes.cend(), tglob)
+                    : std::upper_bound(
+                        this->BlockTimes.cbegin(), this->BlockTimes.cend(), tglob, std::greater<>());
+      int element = int(it - this->BlockTimes.cbegin()) - 1;
+      element = std::max(element, 0);
+      return std::min(element, this->NumBlocks - 1);
+    }
+
     template<class Scalar>
     int CheckIthBlock(Scalar tglob, int i) const {
       Scalar t0 = this->XtUData.middleCols((this->BlockSize - 1) * i, this->BlockSize)(axis, 0);
@@ -36,6 +36,7 @@ namespace ASSET {
     DODE ode;
     Integrator<DODE> integrator;
     bool EnableHessianSparsity = false;
+    bool EnableSparsityDetection = false;
     bool OldShootingDefect = false;
 
     ODEPhase(const DODE& ode, TranscriptionModes Tmode)
@@ -120,6 +121,36 @@ namespace ASSET {
       }
     }
 
+    /*
+    Inputs to the dynamics defects taken from the first, middle and last segments of the current trajectory.
+    When EnableSparsityDetection is set, the defect's jacobian and hessian are probed at these points so that
+    only their structurally non-zero elements are placed in the KKT matrix.
+    */
+    std::vector<Eigen::VectorXd> defect_sparsity_samples() const {
+      std::vector<Eigen::VectorXd> samples;
+      const int cs = this->numTranCardStates;
+      const int xtu = this->ode.XtUVars();
+      const int pv = this->ode.PVars();
+      const int numdefs = (int(this->ActiveTraj.size()) - 1) / (cs - 1);
+      if (numdefs < 1)
+        return samples;
+
+      for (int k: {0, numdefs / 2, numdefs - 1}) {
+        Eigen::VectorXd x(cs * xtu + pv);
+        for (int j = 0; j < cs; j++)
+          x.segment(j * xtu, xtu) = this->ActiveTraj[k * (cs - 1) + j].head(xtu);
+        x.tail(pv) = this->ActiveTraj[k * (cs - 1)].tail(pv);
+        samples.push_back(x);
+      }
+      return samples;
+    }
+
+    template<class Defect>
+    void detect_defect_sparsity(Defect& defect) const {
+      if (this->EnableSparsityDetection)
+        defect.Sparsity.detect(defect, this->defect_sparsity_samples());
+    }
+
     virtual void transcribe_dynamics() {
       VectorXi StateT(this->ode.XtUVars());
       for (int i = 0; i < this->ode.XtUVars(); i++)
@@ -137,17 +168,20 @@ namespace ASSET {
           if constexpr (DODE::UV == 0 && DODE::PV == 0) {
             LGLType<DODE, cs.value> lgl(this->ode);
             lgl.EnableVectorization = this->EnableVectorization;
+            this->detect_defect_sparsity(lgl);
             this->DynamicsFuncIndex = this->indexer.addEquality(
                 lgl, PhaseRegionFlags::DefectPath, StateT, OParT, empty, ThreadingFlags::ByApplication);
           } else {
             LGLType<Blocked_ODE_Wrapper<DODE>, cs.value> lgl(Blocked_ODE_Wrapper<DODE>(this->ode));
             lgl.EnableVectorization = this->EnableVectorization;
+            this->detect_defect_sparsity(lgl);
             this->DynamicsFuncIndex = this->indexer.addEquality(
                 lgl, PhaseRegionFlags::BlockDefectPath, StateT, OParT, empty, ThreadingFlags::ByApplication);
           }
         } else {
           LGLType<DODE, cs.value> lgl(this->ode);
           lgl.EnableVectorization = this->EnableVectorization;
+          this->detect_defect_sparsity(lgl);
           this->DynamicsFuncIndex = this->indexer.addEquality(
               lgl, PhaseRegionFlags::DefectPath, StateT, OParT, empty, ThreadingFlags::ByApplication);
         }
@@ -174,12 +208,14 @@ namespace ASSET {
               TrapezoidalDefects<DODE> trap(this->ode);
               trap.EnableVectorization = this->EnableVectorization;
               // trap.EnableHessianSparsity = this->EnableHessianSparsity;
+              this->detect_defect_sparsity(trap);
               this->DynamicsFuncIndex = this->indexer.addEquality(
                   trap, PhaseRegionFlags::DefectPath, StateT, OParT, empty, ThreadingFlags::ByApplication);
             } else {
               TrapezoidalDefects<Blocked_ODE_Wrapper<DODE>> trap(Blocked_ODE_Wrapper<DODE>(this->ode));
               trap.EnableVectorization = this->EnableVectorization;
               trap.EnableHessianSparsity = this->EnableHessianSparsity;
+              this->detect_defect_sparsity(trap);
               this->DynamicsFuncIndex = this->indexer.addEquality(trap,
                                                                   PhaseRegionFlags::BlockDefectPath,
                                                                   StateT,
@@ -193,6 +229,7 @@ namespace ASSET {
             TrapezoidalDefects<DODE> trap(this->ode);
             trap.EnableVectorization = this->EnableVectorization;
             // trap.EnableHessianSparsity = this->EnableHessianSparsity;
+            this->detect_defect_sparsity(trap);
             this->DynamicsFuncIndex = this->indexer.addEquality(
                 trap, PhaseRegionFlags::DefectPath, StateT, OParT, empty, ThreadingFlags::ByApplication);
           }
@@ -213,12 +250,15 @@ namespace ASSET {
     }
 
     virtual ASSET::ConstraintInterface make_shooter() {
-      auto Integ = Integrator<DODE> {this->ode, this->integrator.DefStepSize};
+      auto Integ = Integrator<DODE> {this->ode, this->integrator.getMethod(), this->integrator.DefStepSize};
       Integ.Adaptive = this->integrator.Adaptive;
       Integ.FastAdaptiveSTM = this->integrator.FastAdaptiveSTM;
+      Integ.VariationalSTM = this->integrator.VariationalSTM;
       Integ.AbsTols = this->integrator.AbsTols;
       Integ.MinStepSize = this->integrator.MinStepSize;
       Integ.MaxStepSize = this->integrator.MaxStepSize;
+      Integ.MaxImplicitIters = this->integrator.MaxImplicitIters;
+      Integ.ImplicitTol = this->integrator.ImplicitTol;
       Integ.EnableVectorization = this->EnableVectorization;
       Integ.VectorizeBatchCalls = this->integrator.VectorizeBatchCalls;
 
@@ -230,6 +270,7 @@ namespace ASSET {
         auto shooter = CentralShootingDefect {this->ode, Integ};
         shooter.EnableHessianSparsity = this->EnableHessianSparsity;
         shooter.EnableVectorization = this->EnableVectorization;
+        this->detect_defect_sparsity(shooter);
         return ASSET::ConstraintInterface(shooter);
       }
     }
@@ -242,10 +283,12 @@ namespace ASSET {
       Integrator<DODE> Integ;
 
       if (this->UVars() != 0) {
-        Integ = Integrator<DODE> {
-            this->ode, this->integrator.DefStepSize, std::make_shared<LGLInterpTable>(tabtmp)};
+        Integ = Integrator<DODE> {this->ode,
+                                  this->integrator.getMethod(),
+                                  this->integrator.DefStepSize,
+                                  std::make_shared<LGLInterpTable>(tabtmp)};
       } else {
-        Integ = Integrator<DODE> {this->ode, this->integrator.DefStepSize};
+        Integ = Integrator<DODE> {this->ode, this->integrator.getMethod(), this->integrator.DefStepSize};
       }
 
 
@@ -255,6 +298,8 @@ namespace ASSET {
       Integ.RelTols = this->integrator.RelTols;
       Integ.MinStepSize = this->integrator.MinStepSize;
       Integ.MaxStepSize = this->integrator.MaxStepSize;
+      Integ.MaxImplicitIters = this->integrator.MaxImplicitIters;
+      Integ.ImplicitTol = this->integrator.ImplicitTol;
       Integ.EnableVectorization = this->EnableVectorization;
 
       ODEState<double> Xin;
@@ -428,10 +473,12 @@ namespace ASSET {
       Integrator<DODE> Integ;
 
       if (this->UVars() == 0 || this->ControlMode == BlockConstant) {
-        Integ = Integrator<DODE> {this->ode, this->integrator.DefStepSize};
+        Integ = Integrator<DODE> {this->ode, this->integrator.getMethod(), this->integrator.DefStepSize};
       } else {
-        Integ = Integrator<DODE> {
-            this->ode, this->integrator.DefStepSize, std::make_shared<LGLInterpTable>(this->Table)};
+        Integ = Integrator<DODE> {this->ode,
+                                  this->integrator.getMethod(),
+                                  this->integrator.DefStepSize,
+                                  std::make_shared<LGLInterpTable>(this->Table)};
       }
 
 
@@ -441,6 +488,8 @@ namespace ASSET {
       Integ.RelTols = this->integrator.RelTols;
       Integ.MinStepSize = this->integrator.MinStepSize;
       Integ.MaxStepSize = this->integrator.MaxStepSize;
+      Integ.MaxImplicitIters = this->integrator.MaxImplicitIters;
+      Integ.ImplicitTol = this->integrator.ImplicitTol;
       Integ.EnableVectorization = this->EnableVectorization;
 
 
@@ -532,6 +581,7 @@ namespace ASSET {
       BuildImpl(phase);
       phase.def_readwrite("integrator", &ODEPhase<DODE>::integrator);
       phase.def_readwrite("EnableHessianSparsity", &ODEPhase<DODE>::EnableHessianSparsity);
+      phase.def_readwrite("EnableSparsityDetection", &ODEPhase<DODE>::EnableSparsityDetection);
       phase.def_readwrite("OldShootingDefect", &ODEPhase<DODE>::OldShootingDefect);
     }
   };
@@ -7,21 +7,70 @@
 #include "ValueLock.h"
 
 int ASSET::ODEPhaseBase::calc_threads() {
-  if (this->Threads > 1 && false) {
-    return this->Threads;
+  /*
+  Picks the function and QP thread counts for this phase. The serial cost of one KKT evaluation is measured
+  once, by profiling a single threaded transcription at the current trajectory, and spread evenly over the
+  defects. With T threads, the busiest thread handles ceil(N/T) defects in packs of V (the SuperScalar width),
+  so we take the T that minimizes the time of that thread plus a fixed dispatch overhead for every extra thread.
+  QP threads are chosen from the size of the KKT matrix, since Pardiso does not scale on small matrices.
+  Until a trajectory is loaded there is nothing to profile, so the usual default thread counts are used.
+  */
+  constexpr double DispatchCost = 1.0e4;  // ns per additional thread per evaluation
+  constexpr int KKTRowsPerQPThread = 4000;
+
+  int HWThreads = std::max(int(std::thread::hardware_concurrency()), 1);
+  int Cores = get_core_count();
+  int Tmax = std::min(HWThreads, ASSET_DEFAULT_FUNC_THREADS);
+  int QPmax = std::min(Cores, ASSET_DEFAULT_QP_THREADS);
+  int N = std::max(this->numDefects, 1);
+  int V = this->EnableVectorization ? DefaultSuperScalar::SizeAtCompileTime : 1;
+
+  if (this->AutoThreadDefectCost <= 0.0 && this->TrajectoryLoaded) {
+    auto np = std::make_shared<NonLinearProgram>(1);
+    this->initIndexing();
+    this->transcribe_phase(0, 0, 0, np, 0);
+    np->make_NLP(this->indexer.numPhaseVars, this->indexer.numPhaseEqCons, this->indexer.numPhaseIqCons);
+
+    Eigen::SparseMatrix<double, Eigen::RowMajor> KKTmat;
+    np->analyzeSparsity(KKTmat);
+    np->profileThreading(this->makeSolverInput(), KKTmat);
+
+    double Serial = 0;
+    for (int i = 0; i < np->Objectives.size(); i++)
+      Serial += np->ObjCosts[i] * np->Objectives[i].index_data.NumAppl();
+    for (int i = 0; i < np->EqualityConstraints.size(); i++)
+      Serial += np->EqCosts[i] * np->EqualityConstraints[i].index_data.NumAppl();
+    for (int i = 0; i < np->InequalityConstraints.size(); i++)
+      Serial += np->IqCosts[i] * np->InequalityConstraints[i].index_data.NumAppl();
+
+    this->AutoThreadDefectCost = Serial / double(N);
+    this->AutoThreadKKTPerDefect = double(np->KKTdim) / double(N);
+    this->doTranscription = true;
   }
 
-  auto Cost = [](int N, int T, int Tmax, int V) {
-    int N_t = N / T;
-    int Nmt = N_t % V;
-    int NN = N % T;
-    int NN_t = NN / T;
-    int NNmt = NN_t % V;
+  if (this->AutoThreadDefectCost <= 0.0) {
+    this->initThreads();
+    return this->Threads;
+  }
+  double DefectCost = this->AutoThreadDefectCost;
 
-    double tscale = double(T) / double(std::min(T, Tmax));
+  auto Cost = [&](int T) {
+    int N_t = (N + T - 1) / T;
+    int Packs = (N_t + V - 1) / V;
+    return DefectCost * double(Packs * V) + DispatchCost * double(T - 1);
   };
 
-  return 0;
+  int BestT = 1;
+  for (int T = 2; T <= Tmax; T++) {
+    if (Cost(T) < Cost(BestT))
+      BestT = T;
+  }
+
+  int KKTdim = int(this->AutoThreadKKTPerDefect * N);
+  int QPThreads = std::clamp(KKTdim / KKTRowsPerQPThread, 1, QPmax);
+
+  OptimizationProblemBase::setThreads(BestT, QPThreads);
+  return BestT;
 }
 
 int ASSET::ODEPhaseBase::addDeltaVarEqualCon(PhaseRegionFlags reg, int var, double value, double scale) {
@@ -1043,6 +1092,9 @@ void ASSET::ODEPhaseBase::transcribe_phase(
 }
 
 void ASSET::ODEPhaseBase::transcribe(bool showstats, bool showfuns) {
+  if (this->AutoThreads)
+    this->calc_threads();
+
   this->nlp = std::make_shared<NonLinearProgram>(this->Threads);
 
   this->initIndexing();
@@ -1353,6 +1405,21 @@ void ASSET::ODEPhaseBase::Build(py::module& m) {
 
   obj.def("enable_vectorization", &ODEPhaseBase::enable_vectorization);
 
+  // Array overloads are registered first so that 2-D numpy arrays are not unpacked row by row
+  // into the list of vectors overloads
+  obj.def("setTraj",
+          py::overload_cast<ConstEigenRef<RowMatrixX<double>>, Eigen::VectorXd, Eigen::VectorXi>(
+              &ODEPhaseBase::setTraj),
+          ODEPhaseBase_setTraj1);
+  obj.def("setTraj",
+          py::overload_cast<ConstEigenRef<RowMatrixX<double>>, Eigen::VectorXd, Eigen::VectorXi, bool>(
+              &ODEPhaseBase::setTraj));
+  obj.def("setTraj",
+          py::overload_cast<ConstEigenRef<RowMatrixX<double>>, int>(&ODEPhaseBase::setTraj),
+          ODEPhaseBase_setTraj2);
+  obj.def("setTraj",
+          py::overload_cast<ConstEigenRef<RowMatrixX<double>>, int, bool>(&ODEPhaseBase::setTraj));
+
   obj.def("setTraj",
           py::overload_cast<const std::vector<Eigen::VectorXd>&, Eigen::VectorXd, Eigen::VectorXi>(
               &ODEPhaseBase::setTraj),
@@ -1388,6 +1455,13 @@ void ASSET::ODEPhaseBase::Build(py::module& m) {
 
   obj.def("transcribe", py::overload_cast<bool, bool>(&ODEPhaseBase::transcribe), ODEPhaseBase_transcribe);
 
+  obj.def("setThreads",
+          py::overload_cast<int, int>(&ODEPhaseBase::setThreads),
+          py::arg("FuncThreads"),
+          py::arg("KKTThreads"));
+  obj.def("setThreads", py::overload_cast<int>(&ODEPhaseBase::setThreads));
+  obj.def("setThreads", py::overload_cast<const std::string&>(&ODEPhaseBase::setThreads));
+
   obj.def("refineTrajManual",
           py::overload_cast<int>(&ODEPhaseBase::refineTrajManual),
           ODEPhaseBase_refineTrajManual1);
@@ -1432,6 +1506,13 @@ void ASSET::ODEPhaseBase::Build(py::module& m) {
   obj.def("returnCostateTraj", &ODEPhaseBase::returnCostateTraj, ODEPhaseBase_returnCostateTraj);
   obj.def("returnTrajError", &ODEPhaseBase::returnTrajError);
 
+  obj.def("returnTrajArray", &ODEPhaseBase::returnTrajArray, ODEPhaseBase_returnTrajArray);
+  obj.def("returnCostateTrajArray", &ODEPhaseBase::returnCostateTrajArray);
+  obj.def("returnEqualConLmultsArray", &ODEPhaseBase::returnEqualConLmultsArray);
+  obj.def("returnEqualConValsArray", &ODEPhaseBase::returnEqualConValsArray);
+  obj.def("returnInequalConLmultsArray", &ODEPhaseBase::returnInequalConLmultsArray);
+  obj.def("returnInequalConValsArray", &ODEPhaseBase::returnInequalConValsArray);
+
   obj.def("returnUSplineConLmults", &ODEPhaseBase::returnUSplineConLmults);
   obj.def("returnUSplineConVals", &ODEPhaseBase::returnUSplineConVals);
 
@@ -37,6 +37,10 @@ namespace ASSET {
     int calc_threads();
 
    protected:
+    bool AutoThreads = false;
+    double AutoThreadDefectCost = 0;  // Measured serial KKT evaluation time per defect (ns), 0 if not measured
+    double AutoThreadKKTPerDefect = 0;  // KKT matrix rows per defect from the profiling transcription
+
     PhaseIndexer indexer;
     bool doTranscription = true;
     bool EnableVectorization = true;
@@ -162,6 +166,28 @@ namespace ASSET {
       this->doTranscription = true;
     };
 
+    using OptimizationProblemBase::setThreads;
+
+    void setThreads(int functhreads, int qpthreads) override {
+      this->AutoThreads = false;
+      OptimizationProblemBase::setThreads(functhreads, qpthreads);
+    }
+    void setThreads(int functhreads) override {
+      this->AutoThreads = false;
+      OptimizationProblemBase::setThreads(functhreads);
+    }
+    void setThreads(const std::string& mode) {
+      if (mode != "auto") {
+        throw std::invalid_argument(fmt::format("Unrecognized thread mode: {0}\nValid Options Are: auto", mode));
+      }
+      this->AutoThreads = true;
+      this->AutoThreadDefectCost = 0;
+      this->AutoThreadKKTPerDefect = 0;
+      // Profiling waits for transcription, until then use the same defaults as a new problem
+      this->initThreads();
+      this->resetTranscription();
+    }
+
     void invalidatePostOptInfo() {
       this->PostOptInfoValid = false;
     };
@@ -696,6 +722,21 @@ namespace ASSET {
       this->setTraj(mesh, ndef, false);
     }
 
+    // Same as above but with the mesh as one (N x XtUPVars) array with a row per state
+
+    void setTraj(ConstEigenRef<RowMatrixX<double>> mesh, Eigen::VectorXd DBS, Eigen::VectorXi DPB, bool LerpTraj) {
+      this->setTraj(rowmatrix_to_stdvectors(mesh), DBS, DPB, LerpTraj);
+    }
+    void setTraj(ConstEigenRef<RowMatrixX<double>> mesh, Eigen::VectorXd DBS, Eigen::VectorXi DPB) {
+      this->setTraj(rowmatrix_to_stdvectors(mesh), DBS, DPB, false);
+    }
+    void setTraj(ConstEigenRef<RowMatrixX<double>> mesh, int ndef, bool LerpTraj) {
+      this->setTraj(rowmatrix_to_stdvectors(mesh), ndef, LerpTraj);
+    }
+    void setTraj(ConstEigenRef<RowMatrixX<double>> mesh, int ndef) {
+      this->setTraj(rowmatrix_to_stdvectors(mesh), ndef, false);
+    }
+
 
     void refineTrajManual(VectorXd DBS, VectorXi DPB);
 
@@ -831,6 +872,27 @@ namespace ASSET {
     std::vector<Eigen::VectorXd> returnCostateTraj() const;
     std::vector<Eigen::VectorXd> returnTrajError() const;
 
+    // Array versions of the above, each returns one contiguous matrix with a row per node/constraint
+
+    RowMatrixX<double> returnTrajArray() const {
+      return stdvectors_to_rowmatrix(this->ActiveTraj);
+    }
+    RowMatrixX<double> returnCostateTrajArray() const {
+      return stdvectors_to_rowmatrix(this->returnCostateTraj());
+    }
+    RowMatrixX<double> returnEqualConLmultsArray(int index) const {
+      return stdvectors_to_rowmatrix(this->returnEqualConLmults(index));
+    }
+    RowMatrixX<double> returnEqualConValsArray(int index) const {
+      return stdvectors_to_rowmatrix(this->returnEqualConVals(index));
+    }
+    RowMatrixX<double> returnInequalConLmultsArray(int index) const {
+      return stdvectors_to_rowmatrix(this->returnInequalConLmults(index));
+    }
+    RowMatrixX<double> returnInequalConValsArray(int index) const {
+      return stdvectors_to_rowmatrix(this->returnInequalConVals(index));
+    }
+
     /////////////////////////////////////////////////
    protected:
     virtual void transcribe_dynamics() = 0;
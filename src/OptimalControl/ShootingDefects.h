@@ -2,6 +2,7 @@
 
 #include "OptimalControlFlags.h"
 #include "VectorFunctions/ASSET_VectorFunctions.h"
+#include "VectorFunctions/SparsityPattern.h"
 #include "pch.h"
 
 
@@ -82,6 +83,7 @@ namespace ASSET {
 
     static const bool IsVectorizable = true;
     bool EnableHessianSparsity = false;
+    SparsityPattern Sparsity;
 
     DODE ode;
     Integrator integ;
@@ -90,6 +92,19 @@ namespace ASSET {
       this->setIORows(2 * this->ode.XtUVars() + this->ode.PVars(), this->ode.XVars());
     }
 
+    inline bool JacobianElemIsNonZero(int row, int col) const {
+      return this->Sparsity.jacobian_nz(row, col);
+    }
+    inline bool HessianElemIsNonZero(int row, int col) const {
+      return this->Sparsity.hessian_nz(row, col);
+    }
+    inline void AddHessianElem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      this->Sparsity.add_hessian_elem(v, row, col, mpt, lpt, freeloc);
+    }
+    inline void AddJacobianElem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      this->Sparsity.add_jacobian_elem(v, row, col, mpt, lpt, freeloc);
+    }
+
 
     CentralShootingDefect() {
     }
@@ -1,6 +1,7 @@
 #pragma once
 
 #include "TranscriptionSizing.h"
+#include "VectorFunctions/SparsityPattern.h"
 #include "VectorFunctions/VectorFunction.h"
 
 namespace ASSET {
@@ -38,6 +39,7 @@ namespace ASSET {
     DODE ode;
     bool EnableHessianSparsity = false;
     Eigen::MatrixXi nzlocs;
+    SparsityPattern Sparsity;
     static const bool IsVectorizable = DODE::IsVectorizable;
 
     void exactHessianSparsity(Eigen::VectorXd xtup1, Eigen::VectorXd xtup2) {
@@ -123,24 +125,27 @@ namespace ASSET {
     }
 
 
+    inline bool JacobianElemIsNonZero(int row, int col) const {
+      return this->Sparsity.jacobian_nz(row, col);
+    }
     inline bool HessianElemIsNonZero(int row, int col) const {
-      if (this->EnableHessianSparsity) {
+      if (this->Sparsity.Active) {
+        return this->Sparsity.hessian_nz(row, col);
+      } else if (this->EnableHessianSparsity) {
         return bool(this->nzlocs(row, col));
       } else {
         return true;
       }
     }
     inline void AddHessianElem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
-      if (this->EnableHessianSparsity) {
-        if (bool(this->nzlocs(row, col))) {
-          mpt[lpt[freeloc]] += v;
-          freeloc++;
-        }
-      } else {
+      if (this->HessianElemIsNonZero(row, col)) {
         mpt[lpt[freeloc]] += v;
         freeloc++;
       }
     }
+    inline void AddJacobianElem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      this->Sparsity.add_jacobian_elem(v, row, col, mpt, lpt, freeloc);
+    }
 
 
     template<class InType, class OutType>
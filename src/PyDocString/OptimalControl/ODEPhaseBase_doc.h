@@ -106,6 +106,10 @@ const char* const ODEPhaseBase_returnTraj =
     "Returns the active trajectory of the transcription\n\n"
     "returns: Vector containing states of active trajectory (vector of states)";
 
+const char* const ODEPhaseBase_returnTrajArray =
+    "Returns the active trajectory of the transcription as a single array\n\n"
+    "returns: Contiguous array with one row per state of the active trajectory";
+
 const char* const ODEPhaseBase_returnTrajRange =
     "Returns active trajectory states between two times"
     ":param arg0: Number of defects to return (int) (The number of states "
@@ -47,6 +47,13 @@ const char* const PSIOPT_LastQPTime =
 const char* const PSIOPT_LastIterNum =
     "int: The iteration counter of the previous iteration.";
 
+const char* const PSIOPT_LastStats =
+    "SolveStats: Timings (seconds) of function evaluation, KKT assembly, factorization, "
+    "back-solves and line search, factorization and Hessian perturbation counts, and the "
+    "IterateInfo of every iteration of the previous call to optimize/solve.";
+
+const char* const PSIOPT_getLastStats = "";
+
 const char* const PSIOPT_MaxAccIters = "";
 
 const char* const PSIOPT_ObjScale =
@@ -151,8 +158,19 @@ const char* const PSIOPT_OptLSMode =
 const char* const PSIOPT_SoeLSMode =
     "LineSearchModes: Line search algorithm used when 'solve' is called";
 
+const char* const PSIOPT_HessianMode =
+    "HessianModes: Exact or quasi-Newton Hessian used when 'optimize' is called";
+
 const char* const PSIOPT_ForceQPanalysis = "";
 
+const char* const PSIOPT_ReuseQPanalysis = "";
+
+const char* const PSIOPT_SparsityCacheDir = "";
+
+const char* const PSIOPT_BalanceThreads = "";
+
+const char* const PSIOPT_LockFreeKKT = "";
+
 const char* const PSIOPT_QPRefSteps = "";
 
 const char* const PSIOPT_QPPivotPerturb = "";
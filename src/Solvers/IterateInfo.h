@@ -1,5 +1,5 @@
 #pragma once
-
+#include "pch.h"
 
 namespace ASSET {
 
@@ -26,6 +26,7 @@ namespace ASSET {
 
     double Hpert = 0;
     int Hfacs = 0;
+    int Factorizations = 0;
 
     double KKTNormErr = 0;
     double BarrNormErr = 0;
@@ -37,6 +38,118 @@ namespace ASSET {
     double MaxEMult = 0;
     double MaxIMult = 0;
     double MeritVal = 0.0;
+
+    /////////////// Timing (seconds) ///////////////
+    double EvalTime = 0;      // Function/derivative evaluation and scatter into KKT matrix
+    double AssemblyTime = 0;  // Barrier terms, slack resets and right hand side
+    double FactorTime = 0;    // factor_impl, including perturbed refactorizations
+    double SolveTime = 0;     // Back-solves of the factored KKT matrix
+    double LSTime = 0;        // Line search, including its function evaluations
+    double CallBackTime = 0;
+    double IterTime = 0;
+
+    static void Build(py::module& m) {
+      auto obj = py::class_<IterateInfo>(m, "IterateInfo");
+
+      obj.def_readonly("iter", &IterateInfo::iter);
+      obj.def_readonly("Mu", &IterateInfo::Mu);
+      obj.def_readonly("PrimObj", &IterateInfo::PrimObj);
+      obj.def_readonly("BarrObj", &IterateInfo::BarrObj);
+      obj.def_readonly("KKTInf", &IterateInfo::KKTInf);
+      obj.def_readonly("BarrInf", &IterateInfo::BarrInf);
+      obj.def_readonly("EConInf", &IterateInfo::EConInf);
+      obj.def_readonly("IConInf", &IterateInfo::IConInf);
+      obj.def_readonly("LSiters", &IterateInfo::LSiters);
+      obj.def_readonly("alphaP", &IterateInfo::alphaP);
+      obj.def_readonly("alphaD", &IterateInfo::alphaD);
+      obj.def_readonly("alphaT", &IterateInfo::alphaT);
+      obj.def_readonly("Hpert", &IterateInfo::Hpert);
+      obj.def_readonly("Hfacs", &IterateInfo::Hfacs);
+      obj.def_readonly("Factorizations", &IterateInfo::Factorizations);
+      obj.def_readonly("MeritVal", &IterateInfo::MeritVal);
+
+      obj.def_readonly("EvalTime", &IterateInfo::EvalTime);
+      obj.def_readonly("AssemblyTime", &IterateInfo::AssemblyTime);
+      obj.def_readonly("FactorTime", &IterateInfo::FactorTime);
+      obj.def_readonly("SolveTime", &IterateInfo::SolveTime);
+      obj.def_readonly("LSTime", &IterateInfo::LSTime);
+      obj.def_readonly("CallBackTime", &IterateInfo::CallBackTime);
+      obj.def_readonly("IterTime", &IterateInfo::IterTime);
+    }
+  };
+
+  /// <summary>
+  /// Accumulated timings and counters of the last call to optimize/solve/etc, along with
+  /// the iterates of every algorithm pass it made.
+  /// </summary>
+  struct SolveStats {
+
+    int Iterations = 0;
+    int LSIters = 0;
+    int Factorizations = 0;
+    int PerturbedIters = 0;
+    int HessianPerturbations = 0;
+    bool ReusedAnalysis = false;  // True if the KKT ordering and symbolic factorization were kept from a previous solve
+    bool CachedSparsity = false;  // True if the KKT sparsity analysis was loaded from SparsityCacheDir
+
+    double TotalTime = 0;
+    double PreTime = 0;
+    double EvalTime = 0;
+    double AssemblyTime = 0;
+    double FactorTime = 0;
+    double SolveTime = 0;
+    double LSTime = 0;
+    double CallBackTime = 0;
+    double MiscTime = 0;
+
+    std::vector<IterateInfo> Iterates;
+
+    void append(const IterateInfo& it) {
+      this->Iterations++;
+      this->LSIters += it.LSiters;
+      this->Factorizations += it.Factorizations;
+      if (it.Hfacs > 0) {
+        this->PerturbedIters++;
+        this->HessianPerturbations += it.Hfacs;
+      }
+      this->EvalTime += it.EvalTime;
+      this->AssemblyTime += it.AssemblyTime;
+      this->FactorTime += it.FactorTime;
+      this->SolveTime += it.SolveTime;
+      this->LSTime += it.LSTime;
+      this->CallBackTime += it.CallBackTime;
+      this->Iterates.push_back(it);
+    }
+
+    void finish(double totaltime, double pretime) {
+      this->TotalTime = totaltime;
+      this->PreTime = pretime;
+      this->MiscTime = totaltime - pretime - this->EvalTime - this->AssemblyTime - this->FactorTime
+                       - this->SolveTime - this->LSTime - this->CallBackTime;
+    }
+
+    static void Build(py::module& m) {
+      auto obj = py::class_<SolveStats>(m, "SolveStats");
+
+      obj.def_readonly("Iterations", &SolveStats::Iterations);
+      obj.def_readonly("LSIters", &SolveStats::LSIters);
+      obj.def_readonly("Factorizations", &SolveStats::Factorizations);
+      obj.def_readonly("PerturbedIters", &SolveStats::PerturbedIters);
+      obj.def_readonly("HessianPerturbations", &SolveStats::HessianPerturbations);
+      obj.def_readonly("ReusedAnalysis", &SolveStats::ReusedAnalysis);
+      obj.def_readonly("CachedSparsity", &SolveStats::CachedSparsity);
+
+      obj.def_readonly("TotalTime", &SolveStats::TotalTime);
+      obj.def_readonly("PreTime", &SolveStats::PreTime);
+      obj.def_readonly("EvalTime", &SolveStats::EvalTime);
+      obj.def_readonly("AssemblyTime", &SolveStats::AssemblyTime);
+      obj.def_readonly("FactorTime", &SolveStats::FactorTime);
+      obj.def_readonly("SolveTime", &SolveStats::SolveTime);
+      obj.def_readonly("LSTime", &SolveStats::LSTime);
+      obj.def_readonly("CallBackTime", &SolveStats::CallBackTime);
+      obj.def_readonly("MiscTime", &SolveStats::MiscTime);
+      obj.def_readonly("Iterates", &SolveStats::Iterates);
+    }
   };
 
 }  // namespace ASSET
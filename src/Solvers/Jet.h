@@ -1,4 +1,7 @@
 #pragma once
+#include <condition_variable>
+#include <deque>
+
 #include "OptimizationProblemBase.h"
 #include "mkl.h"
 
@@ -180,6 +183,177 @@ namespace ASSET {
       return Jet::map(genfunc, optprobs, nt, verbose);
     }
     ////////////////////////////////////////////////////////////////////////////////////
+    ///////////////////////////// Streaming Map ////////////////////////////////////////
+    ////////////////////////////////////////////////////////////////////////////////////
+
+    /// <summary>
+    /// Streaming version of map. Rather than returning every problem at the end, callback(i, flag, prob)
+    /// is called on the calling thread as soon as each job finishes, in order of completion. Jet drops its
+    /// reference to each problem once the callback returns, and at most maxlive jobs are generated but not
+    /// yet consumed at any time (2*nt if maxlive < 1), so memory use does not grow with the number of jobs.
+    /// This bound only holds for the generator forms: problems passed in directly already exist in the
+    /// caller's list, and stay alive for as long as the caller holds it.
+    /// </summary>
+    template<class T, class Args1, class Args2, class CallBack>
+    static void map_stream(const std::vector<std::function<std::shared_ptr<T>(Args1)>>& genfuncs,
+                           const std::vector<Args2>& args,
+                           const Eigen::VectorXi& genfidxes,
+                           int nt,
+                           int maxlive,
+                           const CallBack& callback,
+                           bool verbose) {
+
+      using Finished = std::tuple<int, PSIOPT::ConvergenceFlags, std::shared_ptr<T>>;
+
+      int NumJobs = args.size();
+      int NumConv = 0;
+      int NumAcc = 0;
+      int NumNoConv = 0;
+      int NumDiv = 0;
+
+      // Keep a few finished jobs queued so threads are not idle while the callback runs
+      if (maxlive < 1)
+        maxlive = 2 * nt;
+      maxlive = std::max(maxlive, nt);
+
+      std::deque<Finished> finished;
+      std::mutex finished_mtx;
+      std::condition_variable finished_cv;
+      std::exception_ptr error;
+
+      ctpl::ThreadPool pool(nt);
+      Utils::Timer t;
+
+      auto Job = [&](int threadid, int i) {
+        mkl_set_num_threads_local(1);
+        std::shared_ptr<T> optprob;
+        PSIOPT::ConvergenceFlags flag = PSIOPT::ConvergenceFlags::DIVERGING;
+
+        try {
+          int gfidx = genfidxes[i];
+          if constexpr (std::is_same_v<Args2, py::args>) {
+            optprob = genfuncs[gfidx](*args[i]);
+          } else {
+            optprob = genfuncs[gfidx](args[i]);
+          }
+          flag = optprob->jet_run();
+        } catch (...) {
+          std::lock_guard<std::mutex> lock(finished_mtx);
+          if (!error)
+            error = std::current_exception();
+        }
+
+        {
+          std::lock_guard<std::mutex> lock(finished_mtx);
+          finished.emplace_back(i, flag, std::move(optprob));
+        }
+        finished_cv.notify_one();
+      };
+
+      if (verbose)
+        print_beginning();
+      t.start();
+
+      int NumPushed = 0;
+      for (; NumPushed < std::min(maxlive, NumJobs); NumPushed++) {
+        pool.push(Job, NumPushed);
+      }
+
+      for (int i = 0; i < NumJobs; i++) {
+        Finished job;
+        {
+          std::unique_lock<std::mutex> lock(finished_mtx);
+          finished_cv.wait(lock, [&]() { return !finished.empty(); });
+          job = std::move(finished.front());
+          finished.pop_front();
+        }
+
+        auto flag = std::get<1>(job);
+        try {
+          if (error)
+            std::rethrow_exception(error);
+          callback(std::get<0>(job), flag, std::move(std::get<2>(job)));
+        } catch (...) {
+          pool.stop(false);
+          // Problems may hold python objects and this runs with the GIL released
+          {
+            py::gil_scoped_acquire acquire;
+            job = Finished();
+            finished.clear();
+          }
+          throw;
+        }
+
+        // Only replace the job once its problem has been released, so that no more than maxlive exist
+        if (NumPushed < NumJobs) {
+          pool.push(Job, NumPushed);
+          NumPushed++;
+        }
+
+        if (verbose) {
+          if (flag == PSIOPT::ConvergenceFlags::CONVERGED)
+            NumConv++;
+          if (flag == PSIOPT::ConvergenceFlags::ACCEPTABLE)
+            NumAcc++;
+          if (flag == PSIOPT::ConvergenceFlags::NOTCONVERGED)
+            NumNoConv++;
+          if (flag == PSIOPT::ConvergenceFlags::DIVERGING)
+            NumDiv++;
+          double tsec = double(t.count<std::chrono::microseconds>()) / 1000000.0;
+          print_progress(i, tsec, NumJobs, NumConv, NumAcc, NumNoConv, NumDiv);
+        }
+      }
+      if (verbose)
+        print_finished();
+    }
+
+    template<class T, class Args1, class Args2, class CallBack>
+    static void map_stream(std::function<std::shared_ptr<T>(Args1)> genfunc,
+                           const std::vector<Args2>& args,
+                           int nt,
+                           int maxlive,
+                           const CallBack& callback,
+                           bool verbose) {
+
+      std::vector<std::function<std::shared_ptr<T>(Args1)>> genfuncs;
+      genfuncs.push_back(genfunc);
+      Eigen::VectorXi genfidxes(args.size());
+
+      genfidxes.setConstant(0);
+
+      Jet::map_stream(genfuncs, args, genfidxes, nt, maxlive, callback, verbose);
+    }
+
+    template<class T, class CallBack>
+    static void map_stream(const std::vector<std::shared_ptr<T>>& optprobs,
+                           int nt,
+                           int maxlive,
+                           const CallBack& callback,
+                           bool verbose) {
+
+
+      std::function<std::shared_ptr<T>(std::shared_ptr<T>)> genfunc = [](std::shared_ptr<T> optprob) {
+        return optprob;
+      };
+
+
+      Jet::map_stream(genfunc, optprobs, nt, maxlive, callback, verbose);
+    }
+
+    /*
+     * Wraps a python stream callback so that Jet's reference to each problem is released while the GIL
+     * is held. Generated problems can own python objects (ex: PyVectorFunction), and Jet holds the last
+     * reference to them, which would otherwise be dropped after the callback's wrapper releases the GIL.
+     */
+    template<class CallBack>
+    static auto release_with_gil(const CallBack& callback) {
+      return [&callback](int i, PSIOPT::ConvergenceFlags flag, auto prob) {
+        py::gil_scoped_acquire acquire;
+        auto optprob = std::move(prob);
+        callback(i, flag, optprob);
+      };
+    }
+    ////////////////////////////////////////////////////////////////////////////////////
 
     static void Build(py::module& m) {
 
@@ -214,6 +388,39 @@ namespace ASSET {
              int nt,
              bool v) { return Jet::map(genfun, args, nt, v); },
           py::call_guard<py::gil_scoped_release>());
+
+      using StreamCallBack =
+          std::function<void(int, PSIOPT::ConvergenceFlags, std::shared_ptr<OptimizationProblemBase>)>;
+
+      obj.def_static(
+          "map_stream",
+          [](const std::vector<std::shared_ptr<OptimizationProblemBase>>& optprobs,
+             int nt,
+             const StreamCallBack& callback,
+             int maxlive,
+             bool v) { Jet::map_stream(optprobs, nt, maxlive, Jet::release_with_gil(callback), v); },
+          py::arg("optprobs"),
+          py::arg("nt"),
+          py::arg("callback"),
+          py::arg("maxlive") = 0,
+          py::arg("verbose") = true,
+          py::call_guard<py::gil_scoped_release>());
+
+      obj.def_static(
+          "map_stream",
+          [](std::function<std::shared_ptr<OptimizationProblemBase>(py::detail::args_proxy)> genfun,
+             const std::vector<py::args>& args,
+             int nt,
+             const StreamCallBack& callback,
+             int maxlive,
+             bool v) { Jet::map_stream(genfun, args, nt, maxlive, Jet::release_with_gil(callback), v); },
+          py::arg("genfun"),
+          py::arg("args"),
+          py::arg("nt"),
+          py::arg("callback"),
+          py::arg("maxlive") = 0,
+          py::arg("verbose") = true,
+          py::call_guard<py::gil_scoped_release>());
     }
   };
 
@@ -22,6 +22,11 @@ in the LICENSE file in ASSET's top level directory.
 
 #include "NonLinearProgram.h"
 
+#include <cstdio>
+#include <fstream>
+
+#include "Utils/MappedFile.h"
+
 void ASSET::NonLinearProgram::make_NLP(int PV, int EQ, int IQ) {
   this->PrimalVars = PV;
   this->EqualCons = EQ;
@@ -36,6 +41,9 @@ void ASSET::NonLinearProgram::make_NLP(int PV, int EQ, int IQ) {
   this->getMATSpace();
   this->getRHSSpace();
   this->finalizeData();
+
+  this->QNReady = false;
+  this->QNHaveLast = false;
 }
 
 void ASSET::NonLinearProgram::countElems() {
@@ -71,41 +79,201 @@ void ASSET::NonLinearProgram::countElems() {
 void ASSET::NonLinearProgram::analyzeThreading() {
   /*
   This function loops over the Master list of objective and constraints and partitions them onto
-  the different threads allocated for function evaluation.
+  the different threads allocated for function evaluation. If costs have been measured by profileThreading,
+  functions pinned to a thread are placed first, and the remaining work is split into pieces and handed out
+  largest first to whichever thread currently has the least work.
   */
   this->ThrObj.clear();
   this->ThrEq.clear();
   this->ThrIq.clear();
+  this->ThrObjIds.clear();
+  this->ThrEqIds.clear();
+  this->ThrIqIds.clear();
 
   this->ThrObj.resize(this->Threads);
   this->ThrEq.resize(this->Threads);
   this->ThrIq.resize(this->Threads);
+  this->ThrObjIds.resize(this->Threads);
+  this->ThrEqIds.resize(this->Threads);
+  this->ThrIqIds.resize(this->Threads);
+
+  bool Balance = this->ObjCosts.size() == this->Objectives.size()
+                 && this->EqCosts.size() == this->EqualityConstraints.size()
+                 && this->IqCosts.size() == this->InequalityConstraints.size();
 
   int RRThr = 0;
 
-  auto analyzeOP = [&](auto& SourceFuncs, auto& TargetThrFuncs) {
-    for (auto& func: SourceFuncs) {
+  // (cost,list,piece), list is 0,1,2 for objectives, equalities, inequalities
+  std::vector<std::tuple<double, int, int>> Pieces;
+  std::vector<double> Loads(this->Threads, 0.0);
+
+  auto analyzeOP = [&](int list,
+                       auto& SourceFuncs,
+                       auto& TargetThrFuncs,
+                       auto& TargetThrIds,
+                       const auto& Costs,
+                       auto& Movable) {
+    for (int j = 0; j < SourceFuncs.size(); j++) {
+      auto& func = SourceFuncs[j];
+      double cost = Balance ? Costs[j] : 0.0;
+
       if (func.getThreadMode() == ThreadingFlags::MainThread) {  // Force to main thread
         TargetThrFuncs.back().push_back(func);
+        TargetThrIds.back().push_back(j);
+        Loads.back() += cost * func.index_data.NumAppl();
       } else if (func.getThreadMode() == ThreadingFlags::RoundRobin) {
-        TargetThrFuncs[RRThr].push_back(func);
-        if (RRThr > (this->Threads - 1))
-          RRThr = 0;
+        if (Balance) {
+          Pieces.emplace_back(cost * func.index_data.NumAppl(), list, Movable.size());
+          Movable.emplace_back(j, func);
+        } else {
+          // Unprofiled placement is unchanged from before balancing existed, which keeps every RoundRobin
+          // function on the first thread. Setting BalanceThreads spreads them by measured cost instead.
+          TargetThrFuncs[RRThr].push_back(func);
+          TargetThrIds[RRThr].push_back(j);
+          if (RRThr > (this->Threads - 1))
+            RRThr = 0;
+        }
       } else if (func.getThreadMode() >= 0) {  // Specific Thread Assignment
         int thr = std::min(func.getThreadMode(), this->Threads - 1);
         TargetThrFuncs[thr].push_back(func);
+        TargetThrIds[thr].push_back(j);
+        Loads[thr] += cost * func.index_data.NumAppl();
       } else {  // By application
-        auto TempThrFuncs = func.thread_split(this->Threads);
-        for (int i = 0; i < TempThrFuncs.size(); i++) {
-          TargetThrFuncs[i].push_back(TempThrFuncs[i]);
+        if (Balance) {
+          auto TempThrFuncs = func.thread_split(this->Threads * this->BalanceGranularity);
+          for (int i = 0; i < TempThrFuncs.size(); i++) {
+            Pieces.emplace_back(cost * TempThrFuncs[i].index_data.NumAppl(), list, Movable.size());
+            Movable.emplace_back(j, TempThrFuncs[i]);
+          }
+        } else {
+          auto TempThrFuncs = func.thread_split(this->Threads);
+          for (int i = 0; i < TempThrFuncs.size(); i++) {
+            TargetThrFuncs[i].push_back(TempThrFuncs[i]);
+            TargetThrIds[i].push_back(j);
+          }
         }
       }
     }
   };
 
-  analyzeOP(this->Objectives, this->ThrObj);
-  analyzeOP(this->EqualityConstraints, this->ThrEq);
-  analyzeOP(this->InequalityConstraints, this->ThrIq);
+  std::vector<std::pair<int, ObjectiveFunction>> MovObj;
+  std::vector<std::pair<int, ConstraintFunction>> MovEq;
+  std::vector<std::pair<int, ConstraintFunction>> MovIq;
+
+  analyzeOP(0, this->Objectives, this->ThrObj, this->ThrObjIds, this->ObjCosts, MovObj);
+  analyzeOP(1, this->EqualityConstraints, this->ThrEq, this->ThrEqIds, this->EqCosts, MovEq);
+  analyzeOP(2, this->InequalityConstraints, this->ThrIq, this->ThrIqIds, this->IqCosts, MovIq);
+
+  if (!Balance)
+    return;
+
+  // Longest processing time first, stable so that equal cost pieces keep their original order
+  std::stable_sort(Pieces.begin(), Pieces.end(), [](const auto& a, const auto& b) {
+    return std::get<0>(a) > std::get<0>(b);
+  });
+
+  std::vector<int> ObjThr(MovObj.size());
+  std::vector<int> EqThr(MovEq.size());
+  std::vector<int> IqThr(MovIq.size());
+
+  for (auto& [cost, list, piece]: Pieces) {
+    int thr = int(std::min_element(Loads.begin(), Loads.end()) - Loads.begin());
+    Loads[thr] += cost;
+    if (list == 0)
+      ObjThr[piece] = thr;
+    else if (list == 1)
+      EqThr[piece] = thr;
+    else
+      IqThr[piece] = thr;
+  }
+
+  auto placeOP = [](auto& Movable, auto& Thrs, auto& TargetThrFuncs, auto& TargetThrIds) {
+    for (int i = 0; i < Movable.size(); i++) {
+      TargetThrFuncs[Thrs[i]].push_back(Movable[i].second);
+      TargetThrIds[Thrs[i]].push_back(Movable[i].first);
+    }
+  };
+
+  placeOP(MovObj, ObjThr, this->ThrObj, this->ThrObjIds);
+  placeOP(MovEq, EqThr, this->ThrEq, this->ThrEqIds);
+  placeOP(MovIq, IqThr, this->ThrIq, this->ThrIqIds);
+}
+
+void ASSET::NonLinearProgram::profileThreading(ConstEigenRef<VectorXd> X,
+                                               Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  /*
+  Evaluates every function on the calling thread exactly as evalKKT would, keeping the fastest of a few
+  repetitions to filter out cold caches, then divides by the number of applications to get a cost per
+  application for each master function.
+  */
+  constexpr int Reps = 3;
+
+  VectorXd LE = VectorXd::Ones(this->EqualCons);
+  VectorXd LI = VectorXd::Ones(this->InequalCons);
+  double val = 0;
+
+  auto timeOP = [&](auto&& evalop) {
+    double best = std::numeric_limits<double>::infinity();
+    for (int r = 0; r < Reps; r++) {
+      Utils::Timer t;
+      t.start();
+      evalop();
+      t.stop();
+      best = std::min(best, double(t.count<std::chrono::nanoseconds>()));
+    }
+    return best;
+  };
+
+  auto profileOP = [&](auto& ThrFuncs, auto& ThrIds, int numfuncs, auto&& evalop) {
+    std::vector<double> Costs(numfuncs, 0.0);
+    std::vector<int> Appls(numfuncs, 0);
+    for (int i = 0; i < this->Threads; i++) {
+      for (int k = 0; k < ThrFuncs[i].size(); k++) {
+        int j = ThrIds[i][k];
+        Costs[j] += timeOP([&]() { evalop(ThrFuncs[i][k]); });
+        Appls[j] += ThrFuncs[i][k].index_data.NumAppl();
+      }
+    }
+    for (int j = 0; j < numfuncs; j++) {
+      Costs[j] = (Appls[j] > 0) ? Costs[j] / double(Appls[j]) : 0.0;
+    }
+    return Costs;
+  };
+
+  this->setRHSCoeffsZero();
+
+  auto ObjCostsT = profileOP(this->ThrObj, this->ThrObjIds, this->Objectives.size(), [&](auto& Obj) {
+    Obj.objective_gradient_hessian(
+        1.0, X, val, this->PGXCoeffs(), KKTmat, this->KKTLocations, this->KKTClashes, this->KKTLocks);
+  });
+  auto EqCostsT = profileOP(this->ThrEq, this->ThrEqIds, this->EqualityConstraints.size(), [&](auto& Con) {
+    Con.constraints_jacobian_adjointgradient_adjointhessian(X,
+                                                            LE,
+                                                            this->EConCoeffs(),
+                                                            this->AGXCoeffs(),
+                                                            KKTmat,
+                                                            this->KKTLocations,
+                                                            this->KKTClashes,
+                                                            this->KKTLocks);
+  });
+  auto IqCostsT = profileOP(this->ThrIq, this->ThrIqIds, this->InequalityConstraints.size(), [&](auto& Con) {
+    Con.constraints_jacobian_adjointgradient_adjointhessian(X,
+                                                            LI,
+                                                            this->IConCoeffs(),
+                                                            this->AGXCoeffs(),
+                                                            KKTmat,
+                                                            this->KKTLocations,
+                                                            this->KKTClashes,
+                                                            this->KKTLocks);
+  });
+
+  this->setRHSCoeffsZero();
+
+  this->ObjCosts = ObjCostsT;
+  this->EqCosts = EqCostsT;
+  this->IqCosts = IqCostsT;
+
+  this->make_NLP(this->PrimalVars, this->EqualCons, this->InequalCons);
 }
 
 void ASSET::NonLinearProgram::getMATSpace() {
@@ -344,6 +512,250 @@ void ASSET::NonLinearProgram::analyzeSparsity(Eigen::SparseMatrix<double, Eigen:
 }
 
 
+size_t ASSET::NonLinearProgram::topologyHash() const {
+  size_t seed = 0;
+  auto combine = [&seed](int v) { seed ^= std::hash<int> {}(v) + 0x9e3779b9 + (seed << 6) + (seed >> 2); };
+
+  combine(this->PrimalVars);
+  combine(this->EqualCons);
+  combine(this->InequalCons);
+  combine(this->Threads);
+  combine(this->numKKTElems);
+  combine(this->numRHSElems);
+
+  for (int i = 0; i < this->numKKTElems; i++) {
+    combine(this->KKTcoeffRows[i]);
+    combine(this->KKTcoeffCols[i]);
+    combine(this->KKTcoeffThrIds[i]);
+  }
+  for (int i = 0; i < this->numRHSElems; i++) {
+    combine(this->RHScoeffRows[i]);
+  }
+  return seed;
+}
+
+namespace {
+  /*
+  File layout : magic, version, hash, KKTdim, numKKTElems, nonzeros, followed by the raw int arrays
+  KKTcoeffRows, KKTcoeffCols, KKTLocations, outer indices, and inner indices. Only intended to be read
+  back by the same build on the same machine.
+  */
+  constexpr int SparsityFileMagic = 0x41534b54;
+  constexpr int SparsityFileVersion = 1;
+
+  template<class T>
+  void write_pod(std::ofstream& out, const T& v) {
+    out.write(reinterpret_cast<const char*>(&v), sizeof(T));
+  }
+  template<class T>
+  bool read_pod(std::ifstream& in, T& v) {
+    return bool(in.read(reinterpret_cast<char*>(&v), sizeof(T)));
+  }
+  void write_ints(std::ofstream& out, const int* data, int size) {
+    out.write(reinterpret_cast<const char*>(data), sizeof(int) * size);
+  }
+  bool read_ints(std::ifstream& in, int* data, int size) {
+    return bool(in.read(reinterpret_cast<char*>(data), sizeof(int) * size));
+  }
+}  // namespace
+
+bool ASSET::NonLinearProgram::saveSparsity(const std::string& path,
+                                            size_t hash,
+                                            const Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) const {
+  // Write to a temporary and rename, so concurrent processes never read a partial file
+  std::string tmppath = TempFilePath(path);
+  bool ok;
+  {
+    std::ofstream out(tmppath, std::ios::binary);
+    if (!out)
+      return false;
+    int nnz = KKTmat.nonZeros();
+    write_pod(out, SparsityFileMagic);
+    write_pod(out, SparsityFileVersion);
+    write_pod(out, hash);
+    write_pod(out, this->KKTdim);
+    write_pod(out, this->numKKTElems);
+    write_pod(out, nnz);
+    write_ints(out, this->KKTcoeffRows.data(), this->numKKTElems);
+    write_ints(out, this->KKTcoeffCols.data(), this->numKKTElems);
+    write_ints(out, this->KKTLocations.data(), this->numKKTElems);
+    write_ints(out, KKTmat.outerIndexPtr(), this->KKTdim + 1);
+    write_ints(out, KKTmat.innerIndexPtr(), nnz);
+    out.close();
+    ok = bool(out);
+  }
+  ok = ok && ReplaceFile(tmppath, path);
+  if (!ok)
+    std::remove(tmppath.c_str());
+  return ok;
+}
+
+bool ASSET::NonLinearProgram::loadSparsity(const std::string& path,
+                                            size_t hash,
+                                            Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  std::ifstream in(path, std::ios::binary);
+  if (!in)
+    return false;
+
+  int magic, version, kktdim, nkkt, nnz;
+  size_t filehash;
+  bool ok = read_pod(in, magic) && read_pod(in, version) && read_pod(in, filehash) && read_pod(in, kktdim)
+            && read_pod(in, nkkt) && read_pod(in, nnz);
+
+  if (!ok || magic != SparsityFileMagic || version != SparsityFileVersion || filehash != hash
+      || kktdim != this->KKTdim || nkkt != this->numKKTElems) {
+    return false;
+  }
+
+  VectorXi rows(nkkt);
+  VectorXi cols(nkkt);
+  VectorXi locs(nkkt);
+  Eigen::SparseMatrix<double, Eigen::RowMajor> mat(kktdim, kktdim);
+  mat.resizeNonZeros(nnz);
+
+  ok = read_ints(in, rows.data(), nkkt) && read_ints(in, cols.data(), nkkt) && read_ints(in, locs.data(), nkkt)
+       && read_ints(in, mat.outerIndexPtr(), kktdim + 1) && read_ints(in, mat.innerIndexPtr(), nnz);
+  if (!ok)
+    return false;
+
+  // A damaged file that passes the header checks must not hand out of range indices to the KKT fill
+  auto in_range = [](const VectorXi& v, int lo, int hi) {
+    return v.size() == 0 || (v.minCoeff() >= lo && v.maxCoeff() < hi);
+  };
+  if (!in_range(rows, 0, kktdim) || !in_range(cols, 0, kktdim) || !in_range(locs, 0, nnz))
+    return false;
+  const int* outer = mat.outerIndexPtr();
+  const int* inner = mat.innerIndexPtr();
+  if (outer[0] != 0 || outer[kktdim] != nnz)
+    return false;
+  for (int i = 0; i < kktdim; i++) {
+    if (outer[i + 1] < outer[i])
+      return false;
+  }
+  for (int i = 0; i < nnz; i++) {
+    if (inner[i] < 0 || inner[i] >= kktdim)
+      return false;
+  }
+
+  std::fill(mat.valuePtr(), mat.valuePtr() + nnz, 0.0);
+
+  this->KKTcoeffRows = rows;
+  this->KKTcoeffCols = cols;
+  this->KKTLocations = locs;
+  KKTmat.swap(mat);
+  return true;
+}
+
+
+
+void ASSET::NonLinearProgram::setupLockFreeKKT(Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  /*
+  Every KKT location written by more than one thread is owned by the first thread that writes it. Elements from
+  other threads at that location are redirected to a private slot for each (location,thread) pair. In lock free
+  mode functions fill KKTBufferLF, which holds a copy of the KKT values followed by the slots, and
+  reduceLockFreeKKT sums the slots into their locations and copies the values back once all threads finish.
+  Since no two threads then write the same memory, functions are handed KKTNoClashes and never lock.
+  */
+  int nnz = KKTmat.nonZeros();
+
+  this->KKTLocationsLF = this->KKTLocations;
+  this->KKTNoClashes = VectorXi::Constant(this->KKTdim, -1);
+
+  VectorXi Owner = VectorXi::Constant(nnz, -1);
+  for (int i = 0; i < this->numUserKKTElems; i++) {
+    int loc = this->KKTLocations[i];
+    if (Owner[loc] == -1)
+      Owner[loc] = this->KKTcoeffThrIds[i];
+  }
+
+  // (location,thread) of every redirected element, sorted so slots for the same location are adjacent
+  std::vector<std::pair<int, int>> Slots;
+  for (int i = 0; i < this->numUserKKTElems; i++) {
+    int loc = this->KKTLocations[i];
+    if (this->KKTcoeffThrIds[i] != Owner[loc])
+      Slots.emplace_back(loc, this->KKTcoeffThrIds[i]);
+  }
+  std::sort(Slots.begin(), Slots.end());
+  Slots.erase(std::unique(Slots.begin(), Slots.end()), Slots.end());
+
+  this->numClashSlots = Slots.size();
+  this->ClashTargets.resize(this->numClashSlots);
+  for (int s = 0; s < this->numClashSlots; s++) {
+    this->ClashTargets[s] = Slots[s].first;
+  }
+
+  for (int i = 0; i < this->numUserKKTElems; i++) {
+    int loc = this->KKTLocations[i];
+    int thr = this->KKTcoeffThrIds[i];
+    if (thr != Owner[loc]) {
+      int s = int(std::lower_bound(Slots.begin(), Slots.end(), std::pair<int, int>(loc, thr)) - Slots.begin());
+      this->KKTLocationsLF[i] = nnz + s;
+    }
+  }
+
+  // Split the reduction between threads without splitting the slots of one location
+  int th = this->ZThreads;
+  this->ClashReduceStarts.resize(th + 1);
+  for (int i = 0; i <= th; i++) {
+    int start = (i * this->numClashSlots) / th;
+    while (start > 0 && start < this->numClashSlots
+           && this->ClashTargets[start] == this->ClashTargets[start - 1])
+      start++;
+    this->ClashReduceStarts[i] = start;
+  }
+
+  int nvals = nnz + this->numClashSlots;
+  this->numKKTValsLF = nnz;
+  this->KKTBufferLF.resize(1, nvals);
+  this->KKTBufferLF.resizeNonZeros(nvals);
+  this->KKTBufferLF.outerIndexPtr()[0] = 0;
+  this->KKTBufferLF.outerIndexPtr()[1] = nvals;
+  for (int i = 0; i < nvals; i++)
+    this->KKTBufferLF.innerIndexPtr()[i] = i;
+  std::fill_n(this->KKTBufferLF.valuePtr(), nvals, 0.0);
+}
+
+void ASSET::NonLinearProgram::beginLockFreeKKT(const Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  if (!this->LockFreeKKT)
+    return;
+  if (KKTmat.nonZeros() != this->numKKTValsLF) {
+    throw std::invalid_argument(
+        "KKT matrix does not match the sparsity pattern used to set up lock free assembly.");
+  }
+  std::copy_n(KKTmat.valuePtr(), this->numKKTValsLF, this->KKTBufferLF.valuePtr());
+}
+
+void ASSET::NonLinearProgram::reduceLockFreeKKT(Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  if (!this->LockFreeKKT)
+    return;
+
+  double* bpt = this->KKTBufferLF.valuePtr();
+  double* spt = bpt + this->numKKTValsLF;
+
+  auto ReduceOp = [&](int id, int start, int stop) {
+    for (int s = start; s < stop; s++) {
+      bpt[this->ClashTargets[s]] += spt[s];
+      spt[s] = 0.0;
+    }
+  };
+
+  int th = this->ZThreads;
+  std::vector<std::future<void>> results(th - 1);
+  for (int i = 0; i < th; i++) {
+    int start = this->ClashReduceStarts[i];
+    int stop = this->ClashReduceStarts[i + 1];
+    if (i == (th - 1)) {
+      ReduceOp(0, start, stop);
+    } else {
+      results[i] = this->TP.push(ReduceOp, start, stop);
+    }
+  }
+  for (int i = 0; i < (th - 1); i++) {
+    results[i].get();
+  }
+  std::copy_n(bpt, this->numKKTValsLF, KKTmat.valuePtr());
+}
+
 void ASSET::NonLinearProgram::evalRHS(double ObjScale,
                                       ConstEigenRef<VectorXd> X,
                                       ConstEigenRef<VectorXd> LE,
@@ -470,6 +882,45 @@ void ASSET::NonLinearProgram::evalOBJ(double ObjScale, ConstEigenRef<VectorXd> X
 }
 
 
+void ASSET::NonLinearProgram::setupQuasiNewton() {
+  auto SetupOP = [&](auto& ThrFuncs, auto& ThrQN, bool dojac) {
+    ThrQN.resize(this->Threads);
+    for (int i = 0; i < this->Threads; i++) {
+      ThrQN[i].assign(ThrFuncs[i].size(), QuasiNewtonBlocks());
+      for (int k = 0; k < ThrFuncs[i].size(); k++) {
+        auto& Func = ThrFuncs[i][k];
+        bool active = (this->HessianMode == 1) || (this->HessianMode == 2 && !Func.function.thread_safe());
+        if (active) {
+          ThrQN[i][k].setup(Func.index_data,
+                            Func.function.numKKTEles(dojac, true),
+                            this->KKTcoeffRows,
+                            this->KKTcoeffCols,
+                            this->PrimalVars);
+        }
+      }
+    }
+  };
+
+  SetupOP(this->ThrObj, this->ThrObjQN, false);
+  SetupOP(this->ThrEq, this->ThrEqQN, true);
+  SetupOP(this->ThrIq, this->ThrIqQN, true);
+
+  this->QNScratchAGX.resize(this->numAGXElems);
+  this->QNScratchFXE.resize(this->numEConElems);
+  this->QNScratchFXI.resize(this->numIConElems);
+
+  this->QNReady = true;
+  this->QNHaveLast = false;
+}
+
+void ASSET::NonLinearProgram::resetQuasiNewton() {
+  for (auto* ThrQN: {&this->ThrObjQN, &this->ThrEqQN, &this->ThrIqQN})
+    for (auto& QNs: *ThrQN)
+      for (auto& QN: QNs)
+        QN.reset();
+  this->QNHaveLast = false;
+}
+
 void ASSET::NonLinearProgram::evalKKT(double ObjScale,
                                       ConstEigenRef<VectorXd> X,
                                       ConstEigenRef<VectorXd> LE,
@@ -480,42 +931,92 @@ void ASSET::NonLinearProgram::evalKKT(double ObjScale,
                                       EigenRef<VectorXd> FXE,
                                       EigenRef<VectorXd> FXI,
                                       Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  /*
+  When HessianMode is set, the selected functions only compute their jacobians and adjoint gradients. The
+  change in each constraint's adjoint gradient is measured with the current multipliers, so those functions
+  also evaluate their adjoint gradient at the previous point before their blocks are updated.
+  */
+  auto& EvalKKT = this->evalKKTMatrix(KKTmat);
   int Thrmin1 = this->Threads - 1;
   std::vector<std::future<void>> results(Thrmin1);
   std::vector<double> Vals(this->Threads, 0.0);
 
   this->setRHSCoeffsZero();
 
-  auto KKTevalOP = [&](int id, int thrnum) {
-    for (auto& Obj: this->ThrObj[thrnum])
-      Obj.objective_gradient_hessian(ObjScale,
-                                     X,
-                                     Vals[thrnum],
-                                     this->PGXCoeffs(),
-                                     KKTmat,
-                                     this->KKTLocations,
-                                     this->KKTClashes,
-                                     this->KKTLocks);
-    for (auto& Con: this->ThrEq[thrnum])
-      Con.constraints_jacobian_adjointgradient_adjointhessian(X,
-                                                              LE,
-                                                              this->EConCoeffs(),
-                                                              this->AGXCoeffs(),
-                                                              KKTmat,
-                                                              this->KKTLocations,
-                                                              this->KKTClashes,
-                                                              this->KKTLocks);
-    for (auto& Con: this->ThrIq[thrnum])
+  bool qn = (this->HessianMode != 0);
+  if (qn && !this->QNReady)
+    this->setupQuasiNewton();
+  bool qnupdate = qn && this->QNHaveLast;
+  if (qnupdate) {
+    this->QNScratchAGX.setZero();
+    this->QNScratchFXE.setZero();
+    this->QNScratchFXI.setZero();
+  }
+
+  auto ConEvalOP = [&](auto& Con,
+                       QuasiNewtonBlocks* QN,
+                       ConstEigenRef<VectorXd> L,
+                       EigenRef<VectorXd> FX,
+                       EigenRef<VectorXd> ScratchFX) {
+    if (QN != nullptr && QN->Active) {
+      if (qnupdate)
+        Con.constraints_adjointgradient(this->QNLastX, L, ScratchFX, this->QNScratchAGX);
+      Con.constraints_jacobian_adjointgradient(X,
+                                               L,
+                                               FX,
+                                               this->AGXCoeffs(),
+                                               EvalKKT,
+                                               this->evalKKTLocations(),
+                                               this->evalKKTClashes(),
+                                               this->KKTLocks);
+      if (qnupdate)
+        QN->update(X, this->QNLastX, this->AGXCoeffs(), this->QNScratchAGX, Con.index_data);
+    } else {
       Con.constraints_jacobian_adjointgradient_adjointhessian(X,
-                                                              LI,
-                                                              this->IConCoeffs(),
+                                                              L,
+                                                              FX,
                                                               this->AGXCoeffs(),
-                                                              KKTmat,
-                                                              this->KKTLocations,
-                                                              this->KKTClashes,
+                                                              EvalKKT,
+                                                              this->evalKKTLocations(),
+                                                              this->evalKKTClashes(),
                                                               this->KKTLocks);
+    }
   };
 
+  auto KKTevalOP = [&](int id, int thrnum) {
+    for (int k = 0; k < this->ThrObj[thrnum].size(); k++) {
+      auto& Obj = this->ThrObj[thrnum][k];
+      QuasiNewtonBlocks* QN = qn ? &this->ThrObjQN[thrnum][k] : nullptr;
+      if (QN != nullptr && QN->Active) {
+        Obj.objective_gradient(ObjScale, X, Vals[thrnum], this->PGXCoeffs());
+        if (qnupdate)
+          QN->update(X, this->QNLastX, this->PGXCoeffs(), this->QNLastPGX, Obj.index_data);
+      } else {
+        Obj.objective_gradient_hessian(ObjScale,
+                                       X,
+                                       Vals[thrnum],
+                                       this->PGXCoeffs(),
+                                       EvalKKT,
+                                       this->evalKKTLocations(),
+                                       this->evalKKTClashes(),
+                                       this->KKTLocks);
+      }
+    }
+    for (int k = 0; k < this->ThrEq[thrnum].size(); k++)
+      ConEvalOP(this->ThrEq[thrnum][k],
+                qn ? &this->ThrEqQN[thrnum][k] : nullptr,
+                LE,
+                this->EConCoeffs(),
+                this->QNScratchFXE);
+    for (int k = 0; k < this->ThrIq[thrnum].size(); k++)
+      ConEvalOP(this->ThrIq[thrnum][k],
+                qn ? &this->ThrIqQN[thrnum][k] : nullptr,
+                LI,
+                this->IConCoeffs(),
+                this->QNScratchFXI);
+  };
+
+  this->beginLockFreeKKT(KKTmat);
   for (int i = 0; i < Thrmin1; i++) {
     results[i] = this->TP.push(KKTevalOP, i);
   }
@@ -524,9 +1025,22 @@ void ASSET::NonLinearProgram::evalKKT(double ObjScale,
 
   for (int i = 0; i < Thrmin1; i++)
     results[i].get();
+  this->reduceLockFreeKKT(KKTmat);
   for (int i = 0; i < this->Threads; i++)
     val += Vals[i];
 
+  if (qn) {
+    // Blocks of different applications can share KKT locations, so they are summed in serially
+    for (auto* ThrQN: {&this->ThrObjQN, &this->ThrEqQN, &this->ThrIqQN})
+      for (auto& QNs: *ThrQN)
+        for (auto& QN: QNs)
+          if (QN.Active)
+            QN.scatter(KKTmat.valuePtr(), this->KKTLocations);
+    this->QNLastX = X;
+    this->QNLastPGX = this->PGXCoeffs();
+    this->QNHaveLast = true;
+  }
+
   auto fillop = [&](int id) { this->fillRHS(PGX, AGX, FXE, FXI); };
 
   std::future<void> fill = this->TP.push(fillop);
@@ -546,6 +1060,7 @@ void ASSET::NonLinearProgram::evalKKTNO(double ObjScale,
                                         EigenRef<VectorXd> FXE,
                                         EigenRef<VectorXd> FXI,
                                         Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  auto& EvalKKT = this->evalKKTMatrix(KKTmat);
   int Thrmin1 = this->Threads - 1;
   std::vector<std::future<void>> results(Thrmin1);
   std::vector<double> Vals(this->Threads, 0.0);
@@ -557,21 +1072,22 @@ void ASSET::NonLinearProgram::evalKKTNO(double ObjScale,
                                                               LE,
                                                               this->EConCoeffs(),
                                                               this->AGXCoeffs(),
-                                                              KKTmat,
-                                                              this->KKTLocations,
-                                                              this->KKTClashes,
+                                                              EvalKKT,
+                                                              this->evalKKTLocations(),
+                                                              this->evalKKTClashes(),
                                                               this->KKTLocks);
     for (auto& Con: this->ThrIq[thrnum])
       Con.constraints_jacobian_adjointgradient_adjointhessian(X,
                                                               LI,
                                                               this->IConCoeffs(),
                                                               this->AGXCoeffs(),
-                                                              KKTmat,
-                                                              this->KKTLocations,
-                                                              this->KKTClashes,
+                                                              EvalKKT,
+                                                              this->evalKKTLocations(),
+                                                              this->evalKKTClashes(),
                                                               this->KKTLocks);
   };
 
+  this->beginLockFreeKKT(KKTmat);
   for (int i = 0; i < Thrmin1; i++) {
     results[i] = this->TP.push(KKTevalOP, i);
   }
@@ -580,6 +1096,7 @@ void ASSET::NonLinearProgram::evalKKTNO(double ObjScale,
 
   for (int i = 0; i < Thrmin1; i++)
     results[i].get();
+  this->reduceLockFreeKKT(KKTmat);
   for (int i = 0; i < this->Threads; i++)
     val += Vals[i];
 
@@ -597,6 +1114,7 @@ void ASSET::NonLinearProgram::evalSOE(double ObjScale,
                                       EigenRef<VectorXd> FXE,
                                       EigenRef<VectorXd> FXI,
                                       Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  auto& EvalKKT = this->evalKKTMatrix(KKTmat);
   int Thrmin1 = this->Threads - 1;
   std::vector<std::future<void>> results(Thrmin1);
   std::vector<double> Vals(this->Threads, 0.0);
@@ -605,12 +1123,13 @@ void ASSET::NonLinearProgram::evalSOE(double ObjScale,
   auto SOEevalOP = [&](int id, int thrnum) {
     for (auto& Con: this->ThrEq[thrnum])
       Con.constraints_jacobian(
-          X, this->EConCoeffs(), KKTmat, this->KKTLocations, this->KKTClashes, this->KKTLocks);
+          X, this->EConCoeffs(), EvalKKT, this->evalKKTLocations(), this->evalKKTClashes(), this->KKTLocks);
     for (auto& Con: this->ThrIq[thrnum])
       Con.constraints_jacobian(
-          X, this->IConCoeffs(), KKTmat, this->KKTLocations, this->KKTClashes, this->KKTLocks);
+          X, this->IConCoeffs(), EvalKKT, this->evalKKTLocations(), this->evalKKTClashes(), this->KKTLocks);
   };
 
+  this->beginLockFreeKKT(KKTmat);
   for (int i = 0; i < Thrmin1; i++) {
     results[i] = this->TP.push(SOEevalOP, i);
   }
@@ -619,6 +1138,7 @@ void ASSET::NonLinearProgram::evalSOE(double ObjScale,
 
   for (int i = 0; i < Thrmin1; i++)
     results[i].get();
+  this->reduceLockFreeKKT(KKTmat);
   auto fillop = [&](int id) { this->fillRHS(PGX, AGX, FXE, FXI); };
   std::future<void> fill = this->TP.push(fillop);
   this->fillSolverCoeffs(KKTmat);
@@ -634,6 +1154,7 @@ void ASSET::NonLinearProgram::evalAUG(double ObjScale,
                                       EigenRef<VectorXd> FXE,
                                       EigenRef<VectorXd> FXI,
                                       Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+  auto& EvalKKT = this->evalKKTMatrix(KKTmat);
   int Thrmin1 = this->Threads - 1;
   std::vector<std::future<void>> results(Thrmin1);
   std::vector<double> Vals(this->Threads, 0.0);
@@ -647,21 +1168,22 @@ void ASSET::NonLinearProgram::evalAUG(double ObjScale,
                                                LE,
                                                this->EConCoeffs(),
                                                this->AGXCoeffs(),
-                                               KKTmat,
-                                               this->KKTLocations,
-                                               this->KKTClashes,
+                                               EvalKKT,
+                                               this->evalKKTLocations(),
+                                               this->evalKKTClashes(),
                                                this->KKTLocks);
     for (auto& Con: this->ThrIq[thrnum])
       Con.constraints_jacobian_adjointgradient(X,
                                                LI,
                                                this->IConCoeffs(),
                                                this->AGXCoeffs(),
-                                               KKTmat,
-                                               this->KKTLocations,
-                                               this->KKTClashes,
+                                               EvalKKT,
+                                               this->evalKKTLocations(),
+                                               this->evalKKTClashes(),
                                                this->KKTLocks);
   };
 
+  this->beginLockFreeKKT(KKTmat);
   for (int i = 0; i < Thrmin1; i++) {
     results[i] = this->TP.push(SOEevalOP, i);
   }
@@ -670,6 +1192,7 @@ void ASSET::NonLinearProgram::evalAUG(double ObjScale,
 
   for (int i = 0; i < Thrmin1; i++)
     results[i].get();
+  this->reduceLockFreeKKT(KKTmat);
   for (int i = 0; i < this->Threads; i++)
     val += Vals[i];
 
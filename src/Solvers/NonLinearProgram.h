@@ -25,6 +25,7 @@ in the LICENSE file in ASSET's top level directory.
 #pragma once
 #include "ConstraintFunction.h"
 #include "ObjectiveFunction.h"
+#include "QuasiNewtonHessian.h"
 #include "Utils/BenchUtils.h"
 #include "pch.h"
 
@@ -71,6 +72,28 @@ namespace ASSET {
     /// </summary>
     std::vector<std::vector<ConstraintFunction>> ThrIq;
 
+    /// <summary>
+    /// Index of the master function (in Objectives,EqualityConstraints,InequalityConstraints) that each
+    /// function in ThrObj,ThrEq,ThrIq was taken from.
+    /// </summary>
+    std::vector<std::vector<int>> ThrObjIds;
+    std::vector<std::vector<int>> ThrEqIds;
+    std::vector<std::vector<int>> ThrIqIds;
+
+    /// <summary>
+    /// Measured cost per application of each master function, filled by profileThreading. When these are
+    /// set, analyzeThreading assigns RoundRobin and ByApplication functions by longest-processing-time first
+    /// instead of splitting them evenly.
+    /// </summary>
+    std::vector<double> ObjCosts;
+    std::vector<double> EqCosts;
+    std::vector<double> IqCosts;
+
+    /// <summary>
+    /// Number of pieces per thread that ByApplication functions are split into when load balancing.
+    /// </summary>
+    int BalanceGranularity = 4;
+
 
     int PrimalVars = 0;   // Number of deisgn variables
     int SlackVars = 0;    // Number of slack variables appended to problem. One for every inequalcon
@@ -106,6 +129,24 @@ namespace ASSET {
     //// [i] = -1 if no fill clash, [i] = mutex lock index otherwise
     VectorXi KKTClashes;
 
+    /// <summary>
+    /// Lock free KKT assembly. Instead of locking KKTLocks, threads write clashing KKT elements into
+    /// private slots that are reduced into the KKT matrix after every evaluation. See setupLockFreeKKT.
+    /// </summary>
+    bool LockFreeKKT = false;
+    VectorXi KKTLocationsLF;     // KKTLocations with clashing elements redirected to private slots
+    VectorXi KKTNoClashes;       // All -1, passed to functions in place of KKTClashes
+    VectorXi ClashTargets;       // [s] = location in the KKT values that slot s is summed into
+    VectorXi ClashReduceStarts;  // Range of slots reduced by each thread
+    int numClashSlots = 0;
+    int numKKTValsLF = 0;
+    /// <summary>
+    /// What functions write into in lock free mode: a copy of the KKT values followed by the clash slots.
+    /// Functions address every KKT element through SparseMatrix::valuePtr(), so the buffer is held as a
+    /// 1 x (nnz + slots) matrix whose non-zeros really include the slots.
+    /// </summary>
+    Eigen::SparseMatrix<double, Eigen::RowMajor> KKTBufferLF;
+
     VectorXd RHScoeffs;
     VectorXi RHScoeffRows;
 
@@ -120,6 +161,28 @@ namespace ASSET {
     int EConDataStart = 0;
     int IConDataStart = 0;
     int ZThreads = 1;
+
+    /// <summary>
+    /// Hessian approximation used by evalKKT. 0: exact second derivatives for every function, 1: damped BFGS
+    /// blocks for every function, 2: damped BFGS blocks only for functions that are not thread safe
+    /// (ex: PyVectorFunction). See PSIOPT::HessianModes.
+    /// </summary>
+    int HessianMode = 0;
+    bool QNReady = false;
+    bool QNHaveLast = false;
+
+    /// <summary>
+    /// Quasi-Newton state of each function in ThrObj,ThrEq,ThrIq, and the primal variables and
+    /// objective gradient coefficients of the last call to evalKKT.
+    /// </summary>
+    std::vector<std::vector<QuasiNewtonBlocks>> ThrObjQN;
+    std::vector<std::vector<QuasiNewtonBlocks>> ThrEqQN;
+    std::vector<std::vector<QuasiNewtonBlocks>> ThrIqQN;
+    VectorXd QNLastX;
+    VectorXd QNLastPGX;
+    VectorXd QNScratchAGX;
+    VectorXd QNScratchFXE;
+    VectorXd QNScratchFXI;
     ////////////////////////////////////////////////////////////////////////////////////////////////////////
     ////////////////////////////////////////////////////////////////////////////////////////////////////////
 
@@ -173,6 +236,13 @@ namespace ASSET {
 
     void analyzeThreading();
 
+    /// <summary>
+    /// Times each function's full KKT evaluation at X, stores the per application costs, and rebuilds the
+    /// NLP so that work is balanced across threads. Must be called after analyzeSparsity, and analyzeSparsity
+    /// must be called again afterwards since the KKT coefficient layout changes.
+    /// </summary>
+    void profileThreading(ConstEigenRef<VectorXd> X, Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat);
+
     void getMATSpace();
 
     void getRHSSpace();
@@ -184,6 +254,70 @@ namespace ASSET {
     void finalizeData();
 
     void analyzeSparsity(Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat);
+
+    /// <summary>
+    /// Builds KKTLocationsLF and the clash slots for lock free assembly. Must be called after analyzeSparsity.
+    /// </summary>
+    void setupLockFreeKKT(Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat);
+    void beginLockFreeKKT(const Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat);
+    void reduceLockFreeKKT(Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat);
+
+    /// <summary>
+    /// Matrix that functions should fill, KKTmat itself or the lock free buffer.
+    /// </summary>
+    Eigen::SparseMatrix<double, Eigen::RowMajor>& evalKKTMatrix(
+        Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+      return this->LockFreeKKT ? this->KKTBufferLF : KKTmat;
+    }
+
+    EigenRef<VectorXi> evalKKTLocations() {
+      return this->LockFreeKKT ? this->KKTLocationsLF : this->KKTLocations;
+    }
+    EigenRef<VectorXi> evalKKTClashes() {
+      return this->LockFreeKKT ? this->KKTNoClashes : this->KKTClashes;
+    }
+
+    /// <summary>
+    /// Hash of the problem dimensions, thread count, and KKT/RHS coefficient locations, which together
+    /// determine the output of analyzeSparsity. Must be called before analyzeSparsity, since that
+    /// transposes KKTcoeffRows/KKTcoeffCols in place.
+    /// </summary>
+    size_t topologyHash() const;
+
+    /// <summary>
+    /// Writes the results of analyzeSparsity (KKT pattern and KKTLocations) to a binary file tagged with hash.
+    /// Returns false if the file could not be written, leaving any existing file untouched.
+    /// </summary>
+    bool saveSparsity(const std::string& path,
+                      size_t hash,
+                      const Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) const;
+
+    /// <summary>
+    /// Replaces analyzeSparsity with the results stored by saveSparsity. Returns false and leaves
+    /// everything untouched if the file does not exist, was written for a different topology, or
+    /// holds indices outside of the KKT matrix.
+    /// </summary>
+    bool loadSparsity(const std::string& path, size_t hash, Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat);
+
+    void setHessianMode(int mode) {
+      if (mode != this->HessianMode) {
+        this->HessianMode = mode;
+        this->QNReady = false;
+        this->QNHaveLast = false;
+      }
+    }
+
+    /// <summary>
+    /// Maps the Hessian elements of the functions selected by HessianMode to their quasi-Newton blocks.
+    /// Called by evalKKT whenever the threading or sparsity layout has changed.
+    /// </summary>
+    void setupQuasiNewton();
+
+    /// <summary>
+    /// Discards all curvature information, so the next evalKKT restarts the approximations from zero.
+    /// </summary>
+    void resetQuasiNewton();
+
     void make_compressed() {
       this->KKTcoeffThrIds.resize(0);
       this->KKTcoeffRows.resize(0);
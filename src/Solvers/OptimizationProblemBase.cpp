@@ -29,6 +29,7 @@ void ASSET::OptimizationProblemBase::Build(py::module& m) {
           py::call_guard<py::gil_scoped_release>());
   obj.def(
       "optimize_solve", &OptimizationProblemBase::optimize_solve, py::call_guard<py::gil_scoped_release>());
+  obj.def("jet_run", &OptimizationProblemBase::jet_run, py::call_guard<py::gil_scoped_release>());
 
   /// <summary>
   /// Probably need to move these enums somewhere else
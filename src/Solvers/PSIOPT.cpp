@@ -15,10 +15,68 @@ void ASSET::PSIOPT::setNLP(std::shared_ptr<NonLinearProgram> np) {
   mkl_set_num_threads(QPThreads);
 
 
-  this->nlp->analyzeSparsity(this->KKTSol.getMatrix());
+  this->ThreadsBalanced = false;
+  this->analyzeSparsity();
+}
+
+void ASSET::PSIOPT::analyzeSparsity() {
+  this->nlp->LockFreeKKT = false;
+  this->SparsityFromCache = false;
+  if (this->SparsityCacheDir.empty()) {
+    this->nlp->analyzeSparsity(this->KKTSol.getMatrix());
+  } else {
+    size_t TopologyHash = this->nlp->topologyHash();
+    std::string path = fmt::format("{0}/asset_kkt_{1:016x}.bin", this->SparsityCacheDir, TopologyHash);
+    this->SparsityFromCache = this->nlp->loadSparsity(path, TopologyHash, this->KKTSol.getMatrix());
+    if (!this->SparsityFromCache) {
+      this->nlp->analyzeSparsity(this->KKTSol.getMatrix());
+      // The cache is only an optimization, so a missing or read only directory must not stop the solve
+      if (!this->nlp->saveSparsity(path, TopologyHash, this->KKTSol.getMatrix()) && this->PrintLevel < 3) {
+        fmt::print(fmt::fg(fmt::color::yellow), "Warning: Could not write sparsity cache file: {0}\n", path);
+      }
+    }
+  }
+  if (this->LockFreeKKT) {
+    this->nlp->setupLockFreeKKT(this->KKTSol.getMatrix());
+    this->nlp->LockFreeKKT = true;
+  }
   if (storespmat)
     spmat = this->KKTSol.getMatrix();
-  this->QPanalyzed = false;
+  this->LastStats.CachedSparsity = this->SparsityFromCache;
+
+  // Pardiso's ordering and symbolic factorization only depend on the pattern of the KKT matrix,
+  // so they can be kept if the new NLP (ex: a re-transcribed continuation problem) has the same one.
+  size_t PatternHash = this->hash_KKT_pattern();
+  this->QPanalyzed = this->QPanalyzed && this->ReuseQPanalysis && (PatternHash == this->QPPatternHash);
+  this->QPPatternHash = PatternHash;
+}
+
+size_t ASSET::PSIOPT::hash_KKT_pattern() const {
+  const auto& KKTmat = this->KKTSol.getMatrix();
+
+  size_t seed = 0;
+  auto combine = [&seed](size_t v) { seed ^= v + 0x9e3779b9 + (seed << 6) + (seed >> 2); };
+  auto hashint = std::hash<int> {};
+
+  combine(hashint(KKTmat.rows()));
+  combine(hashint(KKTmat.nonZeros()));
+  combine(hashint(this->QPOrd));
+  combine(hashint(this->QPMatching));
+  combine(hashint(this->QPScaling));
+  combine(hashint(this->QPAlg));
+  combine(hashint(this->QPPivotStrategy));
+  // Pardiso's analysis is done for a given thread count and parallel solve mode
+  combine(hashint(this->QPThreads));
+  combine(hashint(this->QPParSolve));
+  combine(hashint(this->CNRMode));
+
+  for (int i = 0; i < KKTmat.outerSize() + 1; i++) {
+    combine(hashint(KKTmat.outerIndexPtr()[i]));
+  }
+  for (int i = 0; i < KKTmat.nonZeros(); i++) {
+    combine(hashint(KKTmat.innerIndexPtr()[i]));
+  }
+  return seed;
 }
 
 void ASSET::PSIOPT::max_primal_dual_step(Eigen::Ref<Eigen::VectorXd> XSL,
@@ -491,6 +549,15 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
   Utils::Timer QPtimer;
   Utils::Timer CBtimer;
 
+  auto Seconds = [](const Utils::Timer& tm) {
+    return double(tm.count<std::chrono::microseconds>()) / 1000000.0;
+  };
+
+  if (algmode == OPT && this->HessianMode != HessianModes::EXACT) {
+    // Curvature pairs from a previous solve were collected with different multipliers and barrier terms
+    this->nlp->resetQuasiNewton();
+  }
+
   double Hpert0 = this->deltaH;
   std::vector<IterateInfo> iters;
   iters.reserve(this->MaxIters);
@@ -502,6 +569,14 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
     IterateInfo Citer;
     Citer.iter = i;
 
+    Utils::Timer Itertimer(true);
+    Utils::Timer Evaltimer;
+    Utils::Timer Asmtimer;
+    Utils::Timer Factimer;
+    Utils::Timer Soltimer;
+    Utils::Timer LSItertimer;
+    Utils::Timer CBItertimer;
+
     double avgcomp = 0;
     double mincomp = 0;
     double maxcomp = 0;
@@ -516,29 +591,31 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
 
     Funtimer.start();
     /////////////////////////////////////////////////////////////
-
+    Evaltimer.start();
     this->evalNLP(algmode, ObjScale, XSL, PrimObj, PGX, RHS, this->KKTSol.getMatrix());
+    Evaltimer.stop();
 
-
-    
-
-
+    Asmtimer.start();
     if (this->InequalCons > 0) {
       this->apply_reset_slacks(this->getSlacks(XSL), this->getIqCons(RHS));
       this->barrier_hessian(this->KKTSol.getMatrix(), this->getSlacks(XSL), this->getIqLmults(XSL), Mu);
       this->complementarity(this->getSlacks(XSL), this->getIqLmults(XSL), avgcomp, mincomp, maxcomp);
     }
-
+    Asmtimer.stop();
     ///////////////////////////////////////////////////////////////
     Funtimer.stop();
     if (this->EarlyCallBackEnabled) {
       CBtimer.start();
+      CBItertimer.start();
       this->EarlyCallBack(i, ObjScale, XSL, PrimObj, PGX, RHS, this->KKTSol.getMatrix());
+      CBItertimer.stop();
       CBtimer.stop();
     }
     QPtimer.start();
     ////////////////////////////////////////////////////////////////
+    Asmtimer.start();
     RHS.head(this->PrimalVars) += PGX;
+    Asmtimer.stop();
 
     ////////////////////////////////////////////////////////////////
     double nhpert = 0;
@@ -559,7 +636,10 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
       Zfac = !cycling;
     }
 
+    Factimer.start();
     Citer.Hfacs = this->factor_impl(false, Zfac, Hpert0, Incr, Incr2, nhpert);
+    Factimer.stop();
+    Citer.Factorizations = Citer.Hfacs + (Zfac ? 1 : 0);
 
     if (Citer.Hfacs > 0) {
       Hpert0 = std::max(this->deltaH, nhpert * decrH);
@@ -572,7 +652,9 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
       switch (barmode) {
         case BarrierModes::PROBE:
           this->barrier_gradient(this->getIqLmults(XSL), this->getDualGrad(RHS));
+          Soltimer.start();
           DXSL = -this->KKTSol.solve(RHS);
+          Soltimer.stop();
           this->max_primal_dual_step(XSL, DXSL, this->BoundFraction, alphap, alphad);
           Temp = XSL + DXSL;
           Mu = this->MPCMu(this->getSlacks(Temp), this->getIqLmults(Temp), avgcomp, mincomp);
@@ -593,7 +675,9 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
       this->barrier_gradient(this->getSlacks(XSL), this->getIqLmults(XSL), Mu, this->getDualGrad(RHS));
     }
 
+    Soltimer.start();
     DXSL = -this->KKTSol.solve(RHS);
+    Soltimer.stop();
     bool GoodStep = std::isfinite(DXSL.squaredNorm());
     if (this->InequalCons > 0)
       this->max_primal_dual_step(XSL, DXSL, this->BoundFraction, alphap, alphad);
@@ -607,8 +691,10 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
 
     if (GoodStep) {
       double lsobjscale = algmode == SOE || algmode == OPTNO ? 0.0 : 1.0;
+      LSItertimer.start();
       alpha = ls_impl(
           lsmode, ObjScale * lsobjscale, Mu, PrimObj, BarrObj, XSL, DXSL, Temp, RHS, RHS2, Citer, iters);
+      LSItertimer.stop();
 
     } else {
       Citer.Hfacs = -1;
@@ -624,6 +710,14 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
     Citer.alphaT = alpha;
 
     this->fill_iter_info(XSL, RHS, PrimObj, BarrObj, Mu, Citer);
+
+    Citer.EvalTime = Seconds(Evaltimer);
+    Citer.AssemblyTime = Seconds(Asmtimer);
+    Citer.FactorTime = Seconds(Factimer);
+    Citer.SolveTime = Seconds(Soltimer);
+    Citer.LSTime = Seconds(LSItertimer);
+    Citer.CallBackTime = Seconds(CBItertimer);
+    Citer.IterTime = Seconds(Itertimer);
     iters.push_back(Citer);
 
     if (this->ReturnBest) {
@@ -654,9 +748,13 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
 
     if (this->LateCallBackEnabled) {
       CBtimer.start();
+      CBItertimer.start();
       this->LateCallBack(iters.back(), XSL, RHS);
+      CBItertimer.stop();
       CBtimer.stop();
+      iters.back().CallBackTime = Seconds(CBItertimer);
     }
+    this->LastStats.append(iters.back());
 
     ExitCode = this->convergeCheck(iters);
     if (!GoodStep)
@@ -704,7 +802,9 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
   if (this->InequalCons > 0) {
     this->LastIqCons = this->getIqCons(RHS) - this->getSlacks(XSL);
     this->LastIqLmults = this->getIqLmults(XSL);
+    this->LastSlacks = this->getSlacks(XSL);
   }
+  this->LastMu = Mu;
 
 
   Runtimer.stop();
@@ -725,7 +825,7 @@ Eigen::VectorXd ASSET::PSIOPT::alg_impl(AlgorithmModes algmode,
   return XSL;
 }
 
-Eigen::VectorXd ASSET::PSIOPT::init_impl(const Eigen::VectorXd& x, double Mu, bool docompute) {
+Eigen::VectorXd ASSET::PSIOPT::init_impl(const Eigen::VectorXd& x, double Mu, bool docompute, bool warm) {
 
 
   Utils::Timer kktt;
@@ -753,14 +853,19 @@ Eigen::VectorXd ASSET::PSIOPT::init_impl(const Eigen::VectorXd& x, double Mu, bo
   Eigen::VectorXd hp(this->SlackVars);
 
   for (int i = 0; i < this->SlackVars; i++) {
-    double fxi = this->getIqCons(RHS)[i];
-    if (fxi < -this->BoundPush) {
-      this->getSlacks(XSL)[i] = abs(fxi);
+    if (warm) {
+      this->getSlacks(XSL)[i] = std::max(this->LastSlacks[i], this->WarmStartPush);
+      this->getIqLmults(XSL)[i] = std::max(this->LastIqLmults[i], this->WarmStartPush);
     } else {
-      this->getSlacks(XSL)[i] = this->BoundPush;
+      double fxi = this->getIqCons(RHS)[i];
+      if (fxi < -this->BoundPush) {
+        this->getSlacks(XSL)[i] = abs(fxi);
+      } else {
+        this->getSlacks(XSL)[i] = this->BoundPush;
+      }
+      this->getIqLmults(XSL)[i] = Mu / this->getSlacks(XSL)[i];
     }
     hp[i] = 1.0;
-    this->getIqLmults(XSL)[i] = Mu / this->getSlacks(XSL)[i];
   }
 
   RHS.tail(this->EqualCons + this->InequalCons).setZero();
@@ -796,10 +901,15 @@ Eigen::VectorXd ASSET::PSIOPT::init_impl(const Eigen::VectorXd& x, double Mu, bo
     print_Finished("KKT-Matrix Analysis ");
   }
 
-  Eigen::VectorXd dx = -this->KKTSol.solve(RHS);
+  if (warm) {
+    if (EqualCons > 0)
+      this->getEqLmults(XSL) = this->LastEqLmults;
+  } else {
+    Eigen::VectorXd dx = -this->KKTSol.solve(RHS);
 
-  if (EqualCons > 0)
-    this->getEqLmults(XSL) = this->getEqLmults(dx);
+    if (EqualCons > 0)
+      this->getEqLmults(XSL) = this->getEqLmults(dx);
+  }
   if (this->InequalCons > 0)
     this->nlp->setSlackDiags(0.0);
   this->nlp->setPrimalDiags(0.0);
@@ -991,16 +1101,18 @@ Eigen::VectorXd ASSET::PSIOPT::optimize(const Eigen::VectorXd& x) {
   Utils::Timer t;
   t.start();
 
-  bool docompute = analyze_KKT_Matrix();
+  bool docompute = analyze_KKT_Matrix(x);
 
-  Eigen::VectorXd XSL = this->init_impl(x, this->initMu, docompute);
+  bool warm = this->warm_start_ready();
+  double Mu0 = warm ? std::max(this->LastMu, this->MinMu) : this->initMu;
+  Eigen::VectorXd XSL = this->init_impl(x, Mu0, docompute, warm);
 
   Eigen::VectorXd XSLans(this->KKTdim);
   XSLans.setZero();
   if (this->PrintLevel < 2) {
     print_Beginning("Optimization Algorithm ");
   }
-  XSLans = this->alg_impl(OPT, this->OptBarMode, this->OptLSMode, this->ObjScale, this->initMu, XSL);
+  XSLans = this->alg_impl(OPT, this->OptBarMode, this->OptLSMode, this->ObjScale, Mu0, XSL);
   if (this->PrintLevel < 2) {
     print_Finished("Optimization Algorithm ");
   }
@@ -1011,6 +1123,7 @@ Eigen::VectorXd ASSET::PSIOPT::optimize(const Eigen::VectorXd& x) {
   double tottime = double(t.count<std::chrono::microseconds>()) / 1000.0;
   this->LastTotalTime = tottime / 1000.0;
   this->LastMiscTime = this->LastTotalTime - this->LastPreTime - this->LastKKTTime - this->LastFuncTime;
+  this->LastStats.finish(this->LastTotalTime, this->LastPreTime);
 
   if (this->PrintLevel < 2) {
     fmt::print(" PSIOPT Total Time : ");
@@ -1033,9 +1146,11 @@ Eigen::VectorXd ASSET::PSIOPT::solve_optimize(const Eigen::VectorXd& x) {
   Utils::Timer t;
   t.start();
 
-  bool docompute = analyze_KKT_Matrix();
+  bool docompute = analyze_KKT_Matrix(x);
 
-  Eigen::VectorXd XSL = this->init_impl(x, this->initMu, docompute);
+  bool warm = this->warm_start_ready();
+  double Mu0 = warm ? std::max(this->LastMu, this->MinMu) : this->initMu;
+  Eigen::VectorXd XSL = this->init_impl(x, Mu0, docompute, warm);
   Eigen::VectorXd XSLans(this->KKTdim);
   XSLans.setZero();
 
@@ -1044,7 +1159,7 @@ Eigen::VectorXd ASSET::PSIOPT::solve_optimize(const Eigen::VectorXd& x) {
   }
 
   XSLans =
-      this->alg_impl(this->SoeMode, this->SoeBarMode, this->SoeLSMode, this->ObjScale, this->initMu, XSL);
+      this->alg_impl(this->SoeMode, this->SoeBarMode, this->SoeLSMode, this->ObjScale, Mu0, XSL);
   if (this->PrintLevel < 2) {
     print_Finished("Solve Algorithm ");
   }
@@ -1060,6 +1175,7 @@ Eigen::VectorXd ASSET::PSIOPT::solve_optimize(const Eigen::VectorXd& x) {
   double tottime = double(t.count<std::chrono::microseconds>()) / 1000.0;
   this->LastTotalTime = tottime / 1000.0;
   this->LastMiscTime = this->LastTotalTime - this->LastPreTime - this->LastKKTTime - this->LastFuncTime;
+  this->LastStats.finish(this->LastTotalTime, this->LastPreTime);
 
   if (this->PrintLevel < 2) {
     print_Finished("Optimization Algorithm ");
@@ -1084,9 +1200,11 @@ Eigen::VectorXd ASSET::PSIOPT::solve_optimize_solve(const Eigen::VectorXd& x) {
   Utils::Timer t;
   t.start();
 
-  bool docompute = analyze_KKT_Matrix();
+  bool docompute = analyze_KKT_Matrix(x);
 
-  Eigen::VectorXd XSL = this->init_impl(x, this->initMu, docompute);
+  bool warm = this->warm_start_ready();
+  double Mu0 = warm ? std::max(this->LastMu, this->MinMu) : this->initMu;
+  Eigen::VectorXd XSL = this->init_impl(x, Mu0, docompute, warm);
   Eigen::VectorXd XSLans(this->KKTdim);
   XSLans.setZero();
 
@@ -1095,7 +1213,7 @@ Eigen::VectorXd ASSET::PSIOPT::solve_optimize_solve(const Eigen::VectorXd& x) {
   }
 
   XSLans =
-      this->alg_impl(this->SoeMode, this->SoeBarMode, this->SoeLSMode, this->ObjScale, this->initMu, XSL);
+      this->alg_impl(this->SoeMode, this->SoeBarMode, this->SoeLSMode, this->ObjScale, Mu0, XSL);
   if (this->PrintLevel < 2) {
     print_Finished("Solve Algorithm ");
   }
@@ -1129,6 +1247,7 @@ Eigen::VectorXd ASSET::PSIOPT::solve_optimize_solve(const Eigen::VectorXd& x) {
   double tottime = double(t.count<std::chrono::microseconds>()) / 1000.0;
   this->LastTotalTime = tottime / 1000.0;
   this->LastMiscTime = this->LastTotalTime - this->LastPreTime - this->LastKKTTime - this->LastFuncTime;
+  this->LastStats.finish(this->LastTotalTime, this->LastPreTime);
 
   if (this->PrintLevel < 2) {
     fmt::print(" PSIOPT Total Time : ");
@@ -1152,16 +1271,18 @@ Eigen::VectorXd ASSET::PSIOPT::optimize_solve(const Eigen::VectorXd& x) {
   Utils::Timer t;
   t.start();
 
-  bool docompute = analyze_KKT_Matrix();
+  bool docompute = analyze_KKT_Matrix(x);
 
-  Eigen::VectorXd XSL = this->init_impl(x, this->initMu, docompute);
+  bool warm = this->warm_start_ready();
+  double Mu0 = warm ? std::max(this->LastMu, this->MinMu) : this->initMu;
+  Eigen::VectorXd XSL = this->init_impl(x, Mu0, docompute, warm);
   Eigen::VectorXd XSLans(this->KKTdim);
 
   if (this->PrintLevel < 2) {
     print_Beginning("Optimization Algorithm ");
   }
 
-  XSLans = this->alg_impl(OPT, this->OptBarMode, this->OptLSMode, this->ObjScale, this->initMu, XSL);
+  XSLans = this->alg_impl(OPT, this->OptBarMode, this->OptLSMode, this->ObjScale, Mu0, XSL);
 
   if (this->PrintLevel < 2) {
     print_Finished("Optimization Algorithm ");
@@ -1187,6 +1308,7 @@ Eigen::VectorXd ASSET::PSIOPT::optimize_solve(const Eigen::VectorXd& x) {
   double tottime = double(t.count<std::chrono::microseconds>()) / 1000.0;
   this->LastTotalTime = tottime / 1000.0;
   this->LastMiscTime = this->LastTotalTime - this->LastPreTime - this->LastKKTTime - this->LastFuncTime;
+  this->LastStats.finish(this->LastTotalTime, this->LastPreTime);
 
   if (this->PrintLevel < 2) {
     fmt::print(" PSIOPT Total Time : ");
@@ -1210,21 +1332,24 @@ Eigen::VectorXd ASSET::PSIOPT::solve(const Eigen::VectorXd& x) {
   }
   Utils::Timer t;
   t.start();
-  bool docompute = analyze_KKT_Matrix();
+  bool docompute = analyze_KKT_Matrix(x);
 
-  Eigen::VectorXd XSL = this->init_impl(x, this->initMu, docompute);
+  bool warm = this->warm_start_ready();
+  double Mu0 = warm ? std::max(this->LastMu, this->MinMu) : this->initMu;
+  Eigen::VectorXd XSL = this->init_impl(x, Mu0, docompute, warm);
   Eigen::VectorXd XSLans(this->KKTdim);
   XSLans.setZero();
   if (this->PrintLevel < 2) {
     print_Beginning("Solve Algorithm ");
   }
   XSLans =
-      this->alg_impl(this->SoeMode, this->SoeBarMode, this->SoeLSMode, this->ObjScale, this->initMu, XSL);
+      this->alg_impl(this->SoeMode, this->SoeBarMode, this->SoeLSMode, this->ObjScale, Mu0, XSL);
 
   t.stop();
   double tottime = double(t.count<std::chrono::microseconds>()) / 1000.0;
   this->LastTotalTime = tottime / 1000.0;
   this->LastMiscTime = this->LastTotalTime - this->LastPreTime - this->LastKKTTime - this->LastFuncTime;
+  this->LastStats.finish(this->LastTotalTime, this->LastPreTime);
 
   if (this->PrintLevel < 2) {
     print_Finished("Solve Algorithm ");
@@ -1244,6 +1369,9 @@ void ASSET::PSIOPT::Build(py::module& m) {
   obj.def(py::init<std::shared_ptr<NonLinearProgram>>());
   obj.def(py::init<>());
 
+  IterateInfo::Build(m);
+  SolveStats::Build(m);
+
   obj.def("optimize", &PSIOPT::optimize, PSIOPT_optimize);
   obj.def("solve_optimize", &PSIOPT::solve_optimize, PSIOPT_solve_optimize);
   obj.def("solve", &PSIOPT::solve, PSIOPT_solve);
@@ -1275,6 +1403,21 @@ void ASSET::PSIOPT::Build(py::module& m) {
   obj.def_readwrite("LastMiscTime", &PSIOPT::LastMiscTime, PSIOPT_LastQPTime);
   obj.def_readwrite("LastIterNum", &PSIOPT::LastIterNum, PSIOPT_LastIterNum);
   obj.def_readwrite("LastObjVal", &PSIOPT::LastObjVal);
+  obj.def_readonly("LastStats", &PSIOPT::LastStats, PSIOPT_LastStats);
+  obj.def("getLastStats", &PSIOPT::getLastStats, PSIOPT_getLastStats);
+
+  obj.def_readonly("LastEqLmults", &PSIOPT::LastEqLmults);
+  obj.def_readonly("LastIqLmults", &PSIOPT::LastIqLmults);
+  obj.def_readonly("LastSlacks", &PSIOPT::LastSlacks);
+  obj.def_readwrite("LastMu", &PSIOPT::LastMu);
+  obj.def_readwrite("WarmStart", &PSIOPT::WarmStart);
+  obj.def_readwrite("WarmStartPush", &PSIOPT::WarmStartPush);
+  obj.def("setWarmStart",
+          &PSIOPT::setWarmStart,
+          py::arg("EqLmults"),
+          py::arg("IqLmults"),
+          py::arg("Slacks"),
+          py::arg("Mu"));
 
 
   obj.def_readwrite("ObjScale", &PSIOPT::ObjScale, PSIOPT_ObjScale);
@@ -1389,9 +1532,19 @@ void ASSET::PSIOPT::Build(py::module& m) {
   obj.def("set_SoeLSMode", py::overload_cast<LineSearchModes>(&PSIOPT::set_SoeLSMode));
   obj.def("set_SoeLSMode", py::overload_cast<const std::string&>(&PSIOPT::set_SoeLSMode));
 
+  //////////////////////////////////////////////////////////////////////////////////////////////////
+  obj.def_readwrite("HessianMode", &PSIOPT::HessianMode, PSIOPT_HessianMode);
+
+  obj.def("set_HessianMode", py::overload_cast<HessianModes>(&PSIOPT::set_HessianMode));
+  obj.def("set_HessianMode", py::overload_cast<const std::string&>(&PSIOPT::set_HessianMode));
+
   //////////////////////////////////////////////////////////////////////////////////////////////////
 
   obj.def_readwrite("ForceQPanalysis", &PSIOPT::ForceQPanalysis, PSIOPT_ForceQPanalysis);
+  obj.def_readwrite("ReuseQPanalysis", &PSIOPT::ReuseQPanalysis, PSIOPT_ReuseQPanalysis);
+  obj.def_readwrite("SparsityCacheDir", &PSIOPT::SparsityCacheDir, PSIOPT_SparsityCacheDir);
+  obj.def_readwrite("BalanceThreads", &PSIOPT::BalanceThreads, PSIOPT_BalanceThreads);
+  obj.def_readwrite("LockFreeKKT", &PSIOPT::LockFreeKKT, PSIOPT_LockFreeKKT);
   obj.def_readwrite("QPRefSteps", &PSIOPT::QPRefSteps, PSIOPT_QPRefSteps);
 
   obj.def_readwrite("QPPivotPerturb", &PSIOPT::QPPivotPerturb, PSIOPT_QPPivotPerturb);
@@ -1430,6 +1583,10 @@ void ASSET::PSIOPT::Build(py::module& m) {
       .value("LANG", LineSearchModes::LANG)
       .value("L1", LineSearchModes::L1)
       .value("NOLS", LineSearchModes::NOLS);
+  py::enum_<HessianModes>(m, "HessianModes")
+      .value("EXACT", HessianModes::EXACT)
+      .value("QN", HessianModes::QN)
+      .value("QNUNSAFE", HessianModes::QNUNSAFE);
   py::enum_<QPPivotModes>(m, "QPPivotModes")
       .value("OneByOne", QPPivotModes::OneByOne)
       .value("TwoByTwo", QPPivotModes::TwoByTwo);
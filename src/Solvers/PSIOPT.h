@@ -65,6 +65,12 @@ namespace ASSET {
       MaxEq
     };
 
+    enum HessianModes {
+      EXACT = 0,     // Exact second derivatives of every function
+      QN = 1,        // Damped BFGS blocks for every function
+      QNUNSAFE = 2,  // Damped BFGS blocks for functions that are not thread safe, exact for the rest
+    };
+
 
     static QPOrderingModes strto_OrderingMode(const std::string& str) {
 
@@ -100,6 +106,22 @@ namespace ASSET {
         return L1;
       }
     }
+    static HessianModes strto_HessianMode(const std::string& str) {
+
+      if (str.compare("EXACT") == 0)
+        return EXACT;
+      else if (str.compare("QN") == 0)
+        return QN;
+      else if (str.compare("QNUNSAFE") == 0)
+        return QNUNSAFE;
+      else {
+        auto msg = fmt::format("Unrecognized HessianMode: {0}\n"
+                               "Valid Options Are: EXACT, QN, QNUNSAFE ",
+                               str);
+        throw std::invalid_argument(msg);
+        return EXACT;
+      }
+    }
     static BarrierModes strto_BarrierMode(const std::string& str) {
 
       if (str.compare("PROBE") == 0)
@@ -147,6 +169,13 @@ namespace ASSET {
     bool QPPrint = false;
     bool QPanalyzed = false;
     bool ForceQPanalysis = false;
+    bool ReuseQPanalysis = true;
+    size_t QPPatternHash = 0;
+    std::string SparsityCacheDir = "";  // Directory for cached KKT sparsity analyses, disabled if empty
+    bool SparsityFromCache = false;     // True if the last sparsity analysis was loaded from SparsityCacheDir
+    bool BalanceThreads = false;        // Profile functions on the first solve and rebalance threads
+    bool ThreadsBalanced = false;
+    bool LockFreeKKT = false;           // Assemble the KKT matrix with per thread clash buffers instead of mutexes
     bool Diagnostic = false;
     int QPParSolve = 0;
 
@@ -221,6 +250,21 @@ namespace ASSET {
     }
 
 
+    /// <summary>
+    /// Hessian used in the KKT matrix when 'optimize' is called. The quasi-Newton modes skip the second
+    /// derivative pass of the selected functions and instead sum a damped BFGS approximation of the
+    /// Hessian of each function application into the same locations of the KKT matrix.
+    /// </summary>
+    HessianModes HessianMode = HessianModes::EXACT;
+
+    void set_HessianMode(HessianModes mode) {
+      this->HessianMode = mode;
+    }
+    void set_HessianMode(const std::string& str) {
+      this->HessianMode = strto_HessianMode(str);
+    }
+
+
     double MaxCPUtime = 1200;
     double ObjScale = 1.0;
 
@@ -403,6 +447,16 @@ namespace ASSET {
     double LastKKTTime = 0;
     int LastIterNum = 0;
 
+    /// <summary>
+    /// Per-phase timings, factorization/perturbation counts and iterates of the last
+    /// call to optimize/solve/etc. Unlike the totals above it is not printed, only recorded.
+    /// </summary>
+    SolveStats LastStats;
+
+    SolveStats getLastStats() const {
+      return this->LastStats;
+    }
+
     void zero_timing_stats() {
       this->LastTotalTime = 0;
       this->LastPreTime = 0;
@@ -410,6 +464,8 @@ namespace ASSET {
       this->LastFuncTime = 0;
       this->LastKKTTime = 0;
       this->LastIterNum = 0;
+      this->LastStats = SolveStats();
+      this->LastStats.CachedSparsity = this->SparsityFromCache;
     }
 
 
@@ -422,6 +478,53 @@ namespace ASSET {
     Eigen::VectorXd LastEqCons;
     Eigen::VectorXd LastIqCons;
 
+    Eigen::VectorXd LastSlacks;
+    double LastMu = 0.0;
+
+    /// <summary>
+    /// If true, the first stage of the next call to optimize/solve/etc. starts from the slacks,
+    /// multipliers and barrier parameter of the last solve (or those given to setWarmStart)
+    /// instead of reinitializing them. Ignored if the NLP's constraint counts differ from the data
+    /// or the data is not finite.
+    /// </summary>
+    bool WarmStart = false;
+
+    /// <summary>
+    /// Lower bound applied to warm started slacks and inequality multipliers
+    /// to keep them strictly interior.
+    /// </summary>
+    double WarmStartPush = 1.0e-9;
+
+    void setWarmStart(const Eigen::VectorXd& EqLmults,
+                      const Eigen::VectorXd& IqLmults,
+                      const Eigen::VectorXd& Slacks,
+                      double Mu) {
+      if (IqLmults.size() != Slacks.size()) {
+        throw std::invalid_argument("Inequality multipliers and slacks must be the same size.");
+      }
+      if (!(Mu > 0.0) || !std::isfinite(Mu)) {
+        throw std::invalid_argument("Warm start barrier parameter must be finite and greater than 0.");
+      }
+      if (!EqLmults.allFinite() || !IqLmults.allFinite() || !Slacks.allFinite()) {
+        throw std::invalid_argument("Warm start multipliers and slacks must be finite.");
+      }
+      this->LastEqLmults = EqLmults;
+      this->LastIqLmults = IqLmults;
+      this->LastSlacks = Slacks;
+      this->LastMu = Mu;
+      this->WarmStart = true;
+    }
+
+    bool warm_start_ready() const {
+      bool eqmatch = this->EqualCons == 0 || this->LastEqLmults.size() == this->EqualCons;
+      bool iqmatch = this->InequalCons == 0
+                     || (this->LastIqLmults.size() == this->InequalCons && this->LastSlacks.size() == this->SlackVars);
+      // A diverged or aborted last solve can leave NaNs, which std::max would pass straight through
+      bool finite = std::isfinite(this->LastMu) && this->LastEqLmults.allFinite()
+                    && this->LastIqLmults.allFinite() && this->LastSlacks.allFinite();
+      return this->WarmStart && this->LastMu > 0.0 && eqmatch && iqmatch && finite;
+    }
+
 
     bool ReturnBest = false;
     std::string BestCriteria = "ECons";// "ICons,Obj,KKT"
@@ -460,13 +563,28 @@ namespace ASSET {
     void release() {
       this->KKTSol.release();
       this->QPanalyzed = false;
+      this->QPPatternHash = 0;
       this->nlp = std::shared_ptr<NonLinearProgram>();
       this->LastEqLmults.resize(0);
       this->LastIqLmults.resize(0);
+      this->LastSlacks.resize(0);
+      this->LastMu = 0.0;
     }
 
 
     void setNLP(std::shared_ptr<NonLinearProgram> np);
+
+    /// <summary>
+    /// Computes or loads the sparsity pattern of the current NLP's KKT matrix.
+    /// </summary>
+    void analyzeSparsity();
+
+    /// <summary>
+    /// Hashes the sparsity pattern of the KKT matrix along with the QP parameters that
+    /// change the symbolic analysis. Used by setNLP to keep the ordering and symbolic
+    /// factorization of the last solve when a new NLP has an identical KKT structure.
+    /// </summary>
+    size_t hash_KKT_pattern() const;
     Eigen::MatrixXd getSPmat() {
       return this->spmat.toDense();
     }
@@ -643,6 +761,7 @@ namespace ASSET {
                  EigenRef<VectorXd> GX,
                  EigenRef<VectorXd> AGXS_FX,
                  Eigen::SparseMatrix<double, Eigen::RowMajor>& KKTmat) {
+      this->nlp->setHessianMode(this->HessianMode);
       this->nlp->evalKKT(ObjScale,
                          XSL.head(this->PrimalVars),
                          XSL.segment(this->PrimalVars + this->SlackVars, this->EqualCons),
@@ -772,7 +891,13 @@ namespace ASSET {
     int factor_impl(
         bool docompute, bool ZFac, double ipurt, double incpurt0, double incpurt, double& finalpert);
 
-    bool analyze_KKT_Matrix() {
+    bool analyze_KKT_Matrix(const Eigen::VectorXd& x) {
+      if (this->BalanceThreads && !this->ThreadsBalanced && this->nlp->Threads > 1) {
+        this->nlp->profileThreading(x, this->KKTSol.getMatrix());
+        this->analyzeSparsity();
+      }
+      this->ThreadsBalanced = true;
+
       bool docompute = true;
       if (this->QPanalyzed && !(this->ForceQPanalysis)) {
         docompute = false;
@@ -780,6 +905,7 @@ namespace ASSET {
         this->QPanalyzed = true;
         docompute = true;
       }
+      this->LastStats.ReusedAnalysis = !docompute;
       return docompute;
     }
 
@@ -791,7 +917,7 @@ namespace ASSET {
                              Eigen::Ref<Eigen::VectorXd> xsl);
 
 
-    Eigen::VectorXd init_impl(const Eigen::VectorXd& x, double Mu, bool docompute);
+    Eigen::VectorXd init_impl(const Eigen::VectorXd& x, double Mu, bool docompute, bool warm = false);
 
 
     double ls_impl(LineSearchModes lsmode,
@@ -747,6 +747,9 @@ namespace Eigen {
     MatrixType& getMatrix() {
       return m_matrix;
     }
+    const MatrixType& getMatrix() const {
+      return m_matrix;
+    }
     void setMatrix(const MatrixType& mat) {
       this->m_matrix = mat;
     }
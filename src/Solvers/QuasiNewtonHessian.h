@@ -0,0 +1,177 @@
+/*
+File Name: QuasiNewtonHessian.h
+
+File Description: Implements the QuasiNewtonBlocks struct, which replaces the exact second derivatives of
+every application of an objective or constraint function with a damped BFGS approximation (partitioned
+quasi-Newton). Each application keeps its own dense block over its input variables, which is summed into
+the same KKT matrix locations that the exact Hessian would have been, so NonLinearProgram's sparsity
+pattern and PSIOPT's inertia correction are unchanged.
+
+////////////////////////////////////////////////////////////////////////////////
+
+Usage of this source code is governed by the license found
+in the LICENSE file in ASSET's top level directory.
+
+*/
+
+#pragma once
+
+#include "VectorFunctions/IndexingData.h"
+#include "pch.h"
+
+namespace ASSET {
+
+  struct QuasiNewtonBlocks {
+    using MatrixXd = Eigen::MatrixXd;
+    using VectorXd = Eigen::VectorXd;
+    using VectorXi = Eigen::VectorXi;
+
+    bool Active = false;
+    int IRows = 0;
+
+    /// <summary>
+    /// Hessian approximation of each application, in the function's input ordering.
+    /// </summary>
+    std::vector<MatrixXd> Blocks;
+    std::vector<bool> Scaled;
+
+    /// <summary>
+    /// (KKT coefficient index, local row, local column) of every Hessian element of each application.
+    /// </summary>
+    std::vector<std::vector<std::array<int, 3>>> Slots;
+
+    QuasiNewtonBlocks() {
+    }
+
+    /*
+    Recovers which input pair of each application every Hessian element in KKTrows,KKTcols belongs to.
+    getKKTSpace claims the lower triangle of each application's Hessian column by column (j >= i) followed by
+    the Jacobian of that column, so the Hessian elements are an ordered subsequence of all (i,j>=i) pairs and
+    can be matched greedily. Rows and columns are compared without order since analyzeSparsity may have
+    transposed them.
+    */
+    void setup(const SolverIndexingData& data,
+               int numKKTPerAppl,
+               ConstEigenRef<VectorXi> KKTrows,
+               ConstEigenRef<VectorXi> KKTcols,
+               int PrimalVars) {
+      this->Active = true;
+      this->IRows = data.input_size;
+      int n = this->IRows;
+      int appls = data.NumAppl();
+
+      this->Blocks.assign(appls, MatrixXd::Zero(n, n));
+      this->Scaled.assign(appls, false);
+      this->Slots.assign(appls, {});
+
+      for (int V = 0; V < appls; V++) {
+        int i = 0;
+        int j = 0;
+        int start = data.InnerKKTStarts[V];
+        for (int k = start; k < start + numKKTPerAppl; k++) {
+          int r = KKTrows[k];
+          int c = KKTcols[k];
+          if (r >= PrimalVars || c >= PrimalVars)
+            continue;  // Jacobian element
+          int lo = std::min(r, c);
+          int hi = std::max(r, c);
+          while (i < n) {
+            int a = data.VLoc(i, V);
+            int b = data.VLoc(j, V);
+            int li = i;
+            int lj = j;
+            j++;
+            if (j == n) {
+              i++;
+              j = i;
+            }
+            if (std::min(a, b) == lo && std::max(a, b) == hi) {
+              this->Slots[V].push_back({k, lj, li});
+              break;
+            }
+          }
+        }
+      }
+    }
+
+    void reset() {
+      for (int V = 0; V < this->Blocks.size(); V++) {
+        this->Blocks[V].setZero();
+        this->Scaled[V] = false;
+      }
+    }
+
+    /*
+    Updates the block of each application from the step in its input variables and the change in its
+    (adjoint) gradient. GXnew and GXold are the full objective or constraint gradient coefficient vectors
+    of NonLinearProgram, which hold the gradient of each application starting at InnerGradientStarts.
+    */
+    void update(ConstEigenRef<VectorXd> X,
+                ConstEigenRef<VectorXd> LastX,
+                ConstEigenRef<VectorXd> GXnew,
+                ConstEigenRef<VectorXd> GXold,
+                const SolverIndexingData& data) {
+      VectorXd s(this->IRows);
+      VectorXd y(this->IRows);
+      for (int V = 0; V < this->Blocks.size(); V++) {
+        if (this->Slots[V].empty())
+          continue;
+        for (int i = 0; i < this->IRows; i++) {
+          int loc = data.VLoc(i, V);
+          s[i] = X[loc] - LastX[loc];
+        }
+        int gs = data.InnerGradientStarts[V];
+        y = GXnew.segment(gs, this->IRows) - GXold.segment(gs, this->IRows);
+        bool scaled = this->Scaled[V];
+        damped_bfgs(this->Blocks[V], s, y, scaled);
+        this->Scaled[V] = scaled;
+      }
+    }
+
+    void scatter(double* KKTvals, ConstEigenRef<VectorXi> KKTLocations) const {
+      for (int V = 0; V < this->Blocks.size(); V++) {
+        for (const auto& slot: this->Slots[V]) {
+          KKTvals[KKTLocations[slot[0]]] += this->Blocks[V](slot[1], slot[2]);
+        }
+      }
+    }
+
+    /*
+    Powell damped BFGS update, which keeps B positive definite even when s'y <= 0, as it is for the
+    indefinite Hessians of most constraint terms. B starts at zero and is set to the Shanno-Phua
+    scaled identity on the first step with any curvature, so terms that are linear in their inputs
+    never contribute.
+    */
+    static void damped_bfgs(MatrixXd& B, const VectorXd& s, const VectorXd& y, bool& scaled) {
+      double ss = s.squaredNorm();
+      double yy = y.squaredNorm();
+      if (ss == 0.0)
+        return;
+      double sy = s.dot(y);
+
+      if (!scaled) {
+        if (yy == 0.0)
+          return;
+        double gamma = (sy > 1.0e-8 * std::sqrt(ss * yy)) ? yy / sy : std::sqrt(yy / ss);
+        B.setIdentity();
+        B *= gamma;
+        scaled = true;
+      }
+
+      VectorXd Bs = B * s;
+      double sBs = s.dot(Bs);
+      if (!(sBs > 0.0))
+        return;
+
+      double theta = 1.0;
+      if (sy < 0.2 * sBs)
+        theta = 0.8 * sBs / (sBs - sy);
+
+      VectorXd r = theta * y + (1.0 - theta) * Bs;
+      double sr = s.dot(r);
+
+      B.noalias() += (r * r.transpose()) / sr - (Bs * Bs.transpose()) / sBs;
+    }
+  };
+
+}  // namespace ASSET
@@ -1,5 +1,6 @@
 #pragma once
 #include <Eigen/Core>
+#include <stdexcept>
 #include <vector>
 
 
@@ -25,5 +26,38 @@ namespace ASSET {
     return eigvec;
   }
 
+  template<class Scalar>
+  using RowMatrixX = Eigen::Matrix<Scalar, -1, -1, Eigen::RowMajor>;
+
+  /// <summary>
+  /// Packs a list of equally sized vectors into one contiguous matrix with a row per vector.
+  /// </summary>
+  template<class Scalar>
+  RowMatrixX<Scalar> stdvectors_to_rowmatrix(const std::vector<Eigen::Matrix<Scalar, -1, 1>>& vecs) {
+    int rows = vecs.size();
+    int cols = (rows > 0) ? vecs[0].size() : 0;
+    RowMatrixX<Scalar> mat(rows, cols);
+    for (int i = 0; i < rows; i++) {
+      if (vecs[i].size() != cols) {
+        throw std::invalid_argument("Vectors must all be the same size to be packed into a matrix");
+      }
+      mat.row(i) = vecs[i].transpose();
+    }
+    return mat;
+  }
+
+  /// <summary>
+  /// Splits the rows of a matrix into a list of vectors.
+  /// </summary>
+  template<class Derived>
+  std::vector<Eigen::Matrix<typename Derived::Scalar, -1, 1>> rowmatrix_to_stdvectors(
+      const Eigen::MatrixBase<Derived>& mat) {
+    std::vector<Eigen::Matrix<typename Derived::Scalar, -1, 1>> vecs(mat.rows());
+    for (int i = 0; i < mat.rows(); i++) {
+      vecs[i] = mat.row(i).transpose();
+    }
+    return vecs;
+  }
+
 
 }  // namespace ASSET
\ No newline at end of file
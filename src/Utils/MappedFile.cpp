@@ -0,0 +1,95 @@
+#include "MappedFile.h"
+
+#include <atomic>
+#include <cstdio>
+#include <random>
+#include <stdexcept>
+
+#ifdef _WIN32
+  #define WIN32_LEAN_AND_MEAN
+  #define VC_EXTRALEAN
+  #include <Windows.h>
+#else
+  #include <fcntl.h>
+  #include <sys/mman.h>
+  #include <sys/stat.h>
+  #include <unistd.h>
+#endif
+
+ASSET::MappedFile::MappedFile(const std::string& path) : path_(path) {
+#ifdef _WIN32
+  HANDLE file =
+      CreateFileA(path.c_str(), GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING, FILE_ATTRIBUTE_NORMAL, NULL);
+  if (file == INVALID_HANDLE_VALUE) {
+    throw std::invalid_argument("Could not open file for mapping: " + path);
+  }
+  LARGE_INTEGER fsize;
+  if (!GetFileSizeEx(file, &fsize) || fsize.QuadPart == 0) {
+    CloseHandle(file);
+    throw std::invalid_argument("Could not map empty file: " + path);
+  }
+  HANDLE mapping = CreateFileMappingA(file, NULL, PAGE_READONLY, 0, 0, NULL);
+  if (mapping == NULL) {
+    CloseHandle(file);
+    throw std::runtime_error("Could not map file: " + path);
+  }
+  void* ptr = MapViewOfFile(mapping, FILE_MAP_READ, 0, 0, 0);
+  if (ptr == NULL) {
+    CloseHandle(mapping);
+    CloseHandle(file);
+    throw std::runtime_error("Could not map file: " + path);
+  }
+  this->file_ = file;
+  this->mapping_ = mapping;
+  this->data_ = static_cast<const char*>(ptr);
+  this->size_ = size_t(fsize.QuadPart);
+#else
+  int fd = open(path.c_str(), O_RDONLY);
+  if (fd < 0) {
+    throw std::invalid_argument("Could not open file for mapping: " + path);
+  }
+  struct stat st;
+  if (fstat(fd, &st) != 0 || st.st_size == 0) {
+    close(fd);
+    throw std::invalid_argument("Could not map empty file: " + path);
+  }
+  void* ptr = mmap(nullptr, size_t(st.st_size), PROT_READ, MAP_SHARED, fd, 0);
+  // The mapping stays valid after the descriptor is closed
+  close(fd);
+  if (ptr == MAP_FAILED) {
+    throw std::runtime_error("Could not map file: " + path);
+  }
+  this->data_ = static_cast<const char*>(ptr);
+  this->size_ = size_t(st.st_size);
+#endif
+}
+
+ASSET::MappedFile::~MappedFile() {
+#ifdef _WIN32
+  UnmapViewOfFile(this->data_);
+  CloseHandle(this->mapping_);
+  CloseHandle(this->file_);
+#else
+  munmap(const_cast<char*>(this->data_), this->size_);
+#endif
+}
+
+std::string ASSET::TempFilePath(const std::string& path) {
+  static std::atomic<unsigned> counter {0};
+#ifdef _WIN32
+  unsigned long pid = GetCurrentProcessId();
+#else
+  unsigned long pid = static_cast<unsigned long>(getpid());
+#endif
+  unsigned tag = std::random_device {}() ^ (counter++ * 2654435761u);
+  return path + "." + std::to_string(pid) + "." + std::to_string(tag) + ".tmp";
+}
+
+bool ASSET::ReplaceFile(const std::string& from, const std::string& to) {
+#ifdef _WIN32
+  // Fails if another process still has the target mapped
+  return MoveFileExA(from.c_str(), to.c_str(), MOVEFILE_REPLACE_EXISTING) != 0;
+#else
+  return std::rename(from.c_str(), to.c_str()) == 0;
+#endif
+}
@@ -0,0 +1,53 @@
+#pragma once
+#include <cstddef>
+#include <string>
+
+namespace ASSET {
+
+  /// <summary>
+  /// Read-only memory map of an entire file. The mapping is shared with every other process
+  /// mapping the same file, so large data is only held once in the page cache.
+  /// Unmapped on destruction.
+  /// </summary>
+  class MappedFile {
+   public:
+    MappedFile(const std::string& path);
+    ~MappedFile();
+
+    MappedFile(const MappedFile&) = delete;
+    MappedFile& operator=(const MappedFile&) = delete;
+
+    const char* data() const {
+      return this->data_;
+    }
+    size_t size() const {
+      return this->size_;
+    }
+    const std::string& path() const {
+      return this->path_;
+    }
+
+   private:
+    std::string path_;
+    const char* data_ = nullptr;
+    size_t size_ = 0;
+#ifdef _WIN32
+    void* file_ = nullptr;
+    void* mapping_ = nullptr;
+#endif
+  };
+
+  /// <summary>
+  /// Returns a path next to path that is unique to this process and call, for writing a file
+  /// that is then moved into place with ReplaceFile.
+  /// </summary>
+  std::string TempFilePath(const std::string& path);
+
+  /// <summary>
+  /// Moves from over to, replacing any existing file. On POSIX this is atomic and processes that
+  /// still map the old file keep their view of it. Returns false on failure, in which case
+  /// from is left in place.
+  /// </summary>
+  bool ReplaceFile(const std::string& from, const std::string& to);
+
+}  // namespace ASSET
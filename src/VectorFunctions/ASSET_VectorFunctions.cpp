@@ -41,6 +41,8 @@ void ASSET::VectorFunctionBuild(FunctionRegistry& reg, py::module& m) {
 
   reg.Build_Register<PyVectorFunction<-1, -1>>(mod, "PyVectorFunction");
   reg.Build_Register<PyVectorFunction<-1, 1>>(mod, "PyScalarFunction");
+  reg.Build_Register<NumbaVectorFunction<-1, -1>>(mod, "NumbaVectorFunction");
+  reg.Build_Register<NumbaVectorFunction<-1, 1>>(mod, "NumbaScalarFunction");
 
   reg.Build_Register<Constant<-1, -1>>(mod, "ConstantVector");
   reg.Build_Register<Constant<-1, 1>>(mod, "ConstantScalar");
@@ -136,4 +136,21 @@ void ASSET::BulkOperationsBuild(FunctionRegistry& reg, py::module& m) {
     };
     return make_dynamic_sum<GenS, Scaled<ELEM>>(selems);
   });
-}
\ No newline at end of file
+
+  //////////////////////////////////////////////////////////
+
+  m.def("compile",
+        [](int inputs, const std::vector<Gen>& stages, const GenS& output) {
+          return GenS(TapeFunction<1>(inputs, stages, output));
+        },
+        py::arg("inputs"),
+        py::arg("stages"),
+        py::arg("output"));
+  m.def("compile",
+        [](int inputs, const std::vector<Gen>& stages, const Gen& output) {
+          return Gen(TapeFunction<-1>(inputs, stages, output));
+        },
+        py::arg("inputs"),
+        py::arg("stages"),
+        py::arg("output"));
+}
@@ -30,6 +30,7 @@
 #include "Scaled.h"
 #include "Segment.h"
 #include "SignFunction.h"
+#include "TapeFunction.h"
 #include "Stacked.h"
 #include "Summation.h"
 #include "Value.h"
@@ -0,0 +1,123 @@
+#pragma once
+#include <atomic>
+#include <list>
+#include <mutex>
+#include <unordered_map>
+
+#include "pch.h"
+
+namespace ASSET {
+
+  /// <summary>
+  /// Bounded, thread safe LRU cache of per-cell interpolation coefficients for the 3D and 4D tables.
+  /// Coefficients are computed on first touch and the least recently used cells are evicted once
+  /// the memory budget is exceeded. Cells are spread over independently locked shards so concurrent
+  /// readers of different cells rarely contend.
+  /// </summary>
+  template<class CoeffType>
+  struct InterpCoeffCache {
+
+    using KeyType = int64_t;
+    using ListType = std::list<std::pair<KeyType, CoeffType>>;
+
+    struct Shard {
+      std::mutex mut;
+      ListType lru;
+      std::unordered_map<KeyType, typename ListType::iterator> map;
+    };
+
+    // Approximate footprint of one cached cell including the list node and hash map entry
+    static constexpr size_t EntryBytes = sizeof(CoeffType) + sizeof(KeyType) + 8 * sizeof(void*);
+
+    std::vector<std::unique_ptr<Shard>> shards;
+    size_t MaxBytes = 0;
+    size_t ShardCapacity = 0;
+
+    std::atomic<size_t> Hits = 0;
+    std::atomic<size_t> Misses = 0;
+    std::atomic<size_t> Evictions = 0;
+
+    InterpCoeffCache(size_t maxbytes, int nshards) {
+      // Small budgets get fewer shards rather than rounding every shard up to one cell,
+      // so the total never exceeds maxbytes. A budget below one cell caches nothing.
+      size_t MaxCells = maxbytes / EntryBytes;
+      nshards = int(std::max(size_t(1), std::min(size_t(std::max(nshards, 1)), MaxCells)));
+      this->MaxBytes = maxbytes;
+      this->ShardCapacity = MaxCells / size_t(nshards);
+      for (int i = 0; i < nshards; i++) {
+        this->shards.emplace_back(std::make_unique<Shard>());
+      }
+    }
+
+    template<class CalcFunc>
+    CoeffType get(KeyType key, CalcFunc&& calc) {
+      Shard& shard = *this->shards[size_t(key) % this->shards.size()];
+      {
+        std::lock_guard<std::mutex> lock(shard.mut);
+        auto it = shard.map.find(key);
+        if (it != shard.map.end()) {
+          shard.lru.splice(shard.lru.begin(), shard.lru, it->second);
+          this->Hits++;
+          return it->second->second;
+        }
+      }
+      this->Misses++;
+
+      // Computed outside the lock, two threads missing on the same cell both compute it
+      // but only the first one is inserted.
+      CoeffType coeffs = calc();
+
+      std::lock_guard<std::mutex> lock(shard.mut);
+      if (shard.map.count(key) == 0) {
+        shard.lru.emplace_front(key, coeffs);
+        shard.map[key] = shard.lru.begin();
+        while (shard.lru.size() > this->ShardCapacity) {
+          shard.map.erase(shard.lru.back().first);
+          shard.lru.pop_back();
+          this->Evictions++;
+        }
+      }
+      return coeffs;
+    }
+
+    size_t size() {
+      size_t n = 0;
+      for (auto& shard: this->shards) {
+        std::lock_guard<std::mutex> lock(shard->mut);
+        n += shard->lru.size();
+      }
+      return n;
+    }
+
+    void clear() {
+      for (auto& shard: this->shards) {
+        std::lock_guard<std::mutex> lock(shard->mut);
+        shard->lru.clear();
+        shard->map.clear();
+      }
+      this->Hits = 0;
+      this->Misses = 0;
+      this->Evictions = 0;
+    }
+
+    /// <summary>
+    /// Returns a dict of hits, misses, evictions, hit rate, cached cells, bytes in use/allowed and shards.
+    /// </summary>
+    py::dict stats() {
+      py::dict d;
+      size_t hits = this->Hits;
+      size_t misses = this->Misses;
+      size_t cells = this->size();
+      d["hits"] = hits;
+      d["misses"] = misses;
+      d["evictions"] = size_t(this->Evictions);
+      d["hit_rate"] = (hits + misses) > 0 ? double(hits) / double(hits + misses) : 0.0;
+      d["cells"] = cells;
+      d["bytes"] = cells * EntryBytes;
+      d["max_bytes"] = this->MaxBytes;
+      d["shards"] = this->shards.size();
+      return d;
+    }
+  };
+
+}  // namespace ASSET
@@ -1,4 +1,5 @@
 #pragma once
+#include "InterpTableFile.h"
 #include "Utils/Timer.h"
 #include "VectorFunction.h"
 
@@ -15,11 +16,15 @@ namespace ASSET {
     Eigen::VectorXd ys;
 
     using MatType = Eigen::Matrix<double, -1, -1, Eigen::RowMajor>;
+    using MapType = Eigen::Map<const MatType>;
 
-    MatType zs;
-    MatType dzxs;
-    MatType dzys;
-    MatType dzys_dxs;
+    // Views of data owned by DataOwners, either copies made by the table or a memory mapped file
+    MapType zs {nullptr, 0, 0};
+    MapType dzxs {nullptr, 0, 0};
+    MapType dzys {nullptr, 0, 0};
+    MapType dzys_dxs {nullptr, 0, 0};
+
+    std::vector<std::shared_ptr<const void>> DataOwners;
 
     Eigen::Matrix<Eigen::Array4d, -1, -1, Eigen::RowMajor> all_dat;
 
@@ -42,10 +47,69 @@ namespace ASSET {
       set_data(Xs, Ys, Zs, kind);
     }
 
+    InterpTable2D(const std::string& path, std::string kind) {
+      load(path, kind);
+    }
+
 
     void set_data(const Eigen::VectorXd& Xs, const Eigen::VectorXd& Ys, const MatType& Zs, std::string kind) {
 
+      this->set_kind(kind);
+      this->reset_data();
 
+      this->xs = Xs;
+      this->ys = Ys;
+      this->bind(this->zs, Zs);
+      this->init_grid();
+
+      if (this->interp_kind == InterpType::cubic_interp)
+        calc_derivs();
+    }
+
+    /// <summary>
+    /// Maps a table written by save. Values (and derivatives if present) are used in place from
+    /// the mapping, so processes loading the same file share one copy. If kind is empty the
+    /// kind the table was saved with is used.
+    /// </summary>
+    void load(const std::string& path, std::string kind) {
+      InterpTableFile tfile(path, 2);
+      if (kind.empty()) {
+        kind = tfile.cubic() ? "cubic" : "linear";
+      }
+      this->set_kind(kind);
+      this->reset_data();
+
+      this->xs = tfile.axis(0);
+      this->ys = tfile.axis(1);
+      int64_t n = this->xs.size() * this->ys.size();
+      new (&this->zs) MapType(tfile.field(0, n), this->ys.size(), this->xs.size());
+      this->DataOwners.push_back(tfile.file);
+      this->init_grid();
+
+      if (this->interp_kind == InterpType::cubic_interp) {
+        if (tfile.nfields() == 4) {
+          new (&this->dzxs) MapType(tfile.field(1, n), this->ysize, this->xsize);
+          new (&this->dzys) MapType(tfile.field(2, n), this->ysize, this->xsize);
+          new (&this->dzys_dxs) MapType(tfile.field(3, n), this->ysize, this->xsize);
+        } else {
+          calc_derivs();
+        }
+      }
+    }
+
+    void save(const std::string& path) const {
+      std::vector<std::pair<const double*, int64_t>> fields;
+      fields.emplace_back(this->zs.data(), this->zs.size());
+      if (this->interp_kind == InterpType::cubic_interp) {
+        fields.emplace_back(this->dzxs.data(), this->dzxs.size());
+        fields.emplace_back(this->dzys.data(), this->dzys.size());
+        fields.emplace_back(this->dzys_dxs.data(), this->dzys_dxs.size());
+      }
+      InterpTableFile::write(
+          path, {this->xs, this->ys}, fields, this->interp_kind == InterpType::cubic_interp);
+    }
+
+    void set_kind(const std::string& kind) {
       if (kind == "cubic" || kind == "Cubic") {
         this->interp_kind = InterpType::cubic_interp;
       } else if (kind == "linear" || kind == "Linear") {
@@ -53,12 +117,23 @@ namespace ASSET {
       } else {
         throw std::invalid_argument("Unrecognized interpolation type");
       }
+    }
 
-      this->xs = Xs;
-      this->ys = Ys;
-      this->zs = Zs;
+    void reset_data() {
+      new (&this->zs) MapType(nullptr, 0, 0);
+      new (&this->dzxs) MapType(nullptr, 0, 0);
+      new (&this->dzys) MapType(nullptr, 0, 0);
+      new (&this->dzys_dxs) MapType(nullptr, 0, 0);
+      this->DataOwners.clear();
+    }
 
+    void bind(MapType& map, MatType data) {
+      auto owned = std::make_shared<MatType>(std::move(data));
+      new (&map) MapType(owned->data(), owned->rows(), owned->cols());
+      this->DataOwners.push_back(owned);
+    }
 
+    void init_grid() {
       xsize = xs.size();
       ysize = ys.size();
 
@@ -105,16 +180,13 @@ namespace ASSET {
       if (yerr > abs(ytotal) * 1.0e-12) {
         this->yeven = false;
       }
-
-      if (this->interp_kind == InterpType::cubic_interp)
-        calc_derivs();
     }
 
 
     void calc_derivs() {
-      dzxs.resize(ysize, xsize);
-      dzys.resize(ysize, xsize);
-      dzys_dxs.resize(ysize, xsize);
+      MatType dzx(ysize, xsize);
+      MatType dzy(ysize, xsize);
+      MatType dzydx(ysize, xsize);
       all_dat.resize(ysize, xsize);
 
 
@@ -157,7 +229,7 @@ namespace ASSET {
           stens.row(4) = stens.row(3).cwiseProduct(times.transpose());
           coeffs = stens.inverse() * rhs;
         }
-        dzys.row(i) = (coeffs / ystep).transpose() * this->zs.middleRows(start, 5);
+        dzy.row(i) = (coeffs / ystep).transpose() * this->zs.middleRows(start, 5);
       }
 
 
@@ -193,9 +265,13 @@ namespace ASSET {
           coeffs = stens.inverse() * rhs;
         }
 
-        dzxs.col(i) = this->zs.middleCols(start, 5) * (coeffs / xstep);
-        dzys_dxs.col(i) = this->dzys.middleCols(start, 5) * (coeffs / xstep);
+        dzx.col(i) = this->zs.middleCols(start, 5) * (coeffs / xstep);
+        dzydx.col(i) = dzy.middleCols(start, 5) * (coeffs / xstep);
       }
+
+      this->bind(this->dzxs, std::move(dzx));
+      this->bind(this->dzys, std::move(dzy));
+      this->bind(this->dzys_dxs, std::move(dzydx));
     }
 
 
@@ -501,6 +577,9 @@ namespace ASSET {
             py::arg("ys"),
             py::arg("Z"),
             py::arg("kind") = std::string("cubic"));
+    obj.def(py::init<const std::string&, std::string>(), py::arg("path"), py::arg("kind") = std::string(""));
+
+    obj.def("save", &InterpTable2D::save, py::arg("path"));
 
     obj.def("interp", py::overload_cast<double, double>(&InterpTable2D::interp, py::const_));
     obj.def("interp", py::overload_cast<const MatType&, const MatType&>(&InterpTable2D::interp, py::const_));
@@ -3,6 +3,8 @@
 
 #include <unsupported/Eigen/CXX11/Tensor>
 
+#include "InterpCoeffCache.h"
+#include "InterpTableFile.h"
 #include "VectorFunction.h"
 namespace ASSET {
 
@@ -17,21 +19,31 @@ namespace ASSET {
     Eigen::VectorXd ys;
     Eigen::VectorXd zs;
 
+    using TensorType = Eigen::Tensor<double, 3>;
+    using TensorMapType = Eigen::TensorMap<Eigen::Tensor<const double, 3>>;
+
+    // Views of data owned by DataOwners, either copies made by the table or a memory mapped file
+
     // numpy meshgrid ij format (x,y,z)
-    Eigen::Tensor<double, 3> fs;
+    TensorMapType fs {nullptr, 0, 0, 0};
+
+    TensorMapType fs_dx {nullptr, 0, 0, 0};
+    TensorMapType fs_dy {nullptr, 0, 0, 0};
+    TensorMapType fs_dz {nullptr, 0, 0, 0};
 
-    Eigen::Tensor<double, 3> fs_dx;
-    Eigen::Tensor<double, 3> fs_dy;
-    Eigen::Tensor<double, 3> fs_dz;
+    TensorMapType fs_dxdy {nullptr, 0, 0, 0};
+    TensorMapType fs_dxdz {nullptr, 0, 0, 0};
+    TensorMapType fs_dydz {nullptr, 0, 0, 0};
 
-    Eigen::Tensor<double, 3> fs_dxdy;
-    Eigen::Tensor<double, 3> fs_dxdz;
-    Eigen::Tensor<double, 3> fs_dydz;
+    TensorMapType fs_dxdydz {nullptr, 0, 0, 0};
 
-    Eigen::Tensor<double, 3> fs_dxdydz;
+    std::vector<std::shared_ptr<const void>> DataOwners;
 
     Eigen::Tensor<Eigen::Matrix<double, 64, 1>, 3> alphavecs;
 
+    // Bounded alternative to cache_alpha that computes cell coefficients on first use, see set_cache_budget
+    std::shared_ptr<InterpCoeffCache<Eigen::Matrix<double, 64, 1>>> alphacache;
+
 
     InterpType interp_kind = InterpType::linear_interp;
 
@@ -64,12 +76,64 @@ namespace ASSET {
       this->xs = Xs;
       this->ys = Ys;
       this->zs = Zs;
-      this->fs = Fs;
+      this->bind(this->fs, Fs);
+      this->cache_alpha = cache;
+      this->init_table(kind);
+    }
+
+    /// <summary>
+    /// Maps a table written by save. Values (and derivatives if present) are used in place from
+    /// the mapping, so processes loading the same file share one copy. If kind is empty the
+    /// kind the table was saved with is used.
+    /// </summary>
+    InterpTable3D(const std::string& path, std::string kind, bool cache) {
+      InterpTableFile tfile(path, 3);
+      if (kind.empty()) {
+        kind = tfile.cubic() ? "cubic" : "linear";
+      }
+      this->xs = tfile.axis(0);
+      this->ys = tfile.axis(1);
+      this->zs = tfile.axis(2);
+
+      int64_t n = this->xs.size() * this->ys.size() * this->zs.size();
+      auto map_field = [&](TensorMapType& map, int i) {
+        new (&map) TensorMapType(tfile.field(i, n), this->xs.size(), this->ys.size(), this->zs.size());
+      };
+      map_field(this->fs, 0);
+      if (tfile.nfields() == 8) {
+        map_field(this->fs_dx, 1);
+        map_field(this->fs_dy, 2);
+        map_field(this->fs_dz, 3);
+        map_field(this->fs_dxdy, 4);
+        map_field(this->fs_dxdz, 5);
+        map_field(this->fs_dydz, 6);
+        map_field(this->fs_dxdydz, 7);
+      }
+      this->DataOwners.push_back(tfile.file);
       this->cache_alpha = cache;
+      this->init_table(kind);
+    }
+
+    void save(const std::string& path) const {
+      std::vector<std::pair<const double*, int64_t>> fields;
+      fields.emplace_back(this->fs.data(), this->fs.size());
+      if (this->interp_kind == InterpType::cubic_interp) {
+        for (auto* f: {&fs_dx, &fs_dy, &fs_dz, &fs_dxdy, &fs_dxdz, &fs_dydz, &fs_dxdydz}) {
+          fields.emplace_back(f->data(), f->size());
+        }
+      }
+      InterpTableFile::write(
+          path, {this->xs, this->ys, this->zs}, fields, this->interp_kind == InterpType::cubic_interp);
+    }
+
+    void bind(TensorMapType& map, TensorType data) {
+      auto owned = std::make_shared<TensorType>(std::move(data));
+      new (&map) TensorMapType(owned->data(), owned->dimension(0), owned->dimension(1), owned->dimension(2));
+      this->DataOwners.push_back(owned);
+    }
+
+    void init_table(const std::string& kind) {
 
-      /// <summary>
-      /// ///////////////////////////////////////////
-      /// </summary>
       if (kind == "cubic" || kind == "Cubic") {
         this->interp_kind = InterpType::cubic_interp;
       } else if (kind == "linear" || kind == "Linear") {
@@ -148,7 +212,9 @@ namespace ASSET {
       }
 
       if (this->interp_kind == InterpType::cubic_interp) {
-        this->calc_derivs();
+        if (this->fs_dx.size() == 0) {
+          this->calc_derivs();
+        }
         if (this->cache_alpha) {
           this->cache_alphavecs();
         }
@@ -159,6 +225,16 @@ namespace ASSET {
 
     void calc_derivs() {
 
+      TensorType fs_dx;
+      TensorType fs_dy;
+      TensorType fs_dz;
+
+      TensorType fs_dxdy;
+      TensorType fs_dxdz;
+      TensorType fs_dydz;
+
+      TensorType fs_dxdydz;
+
       fs_dx.resize(fs.dimension(0), fs.dimension(1), fs.dimension(2));
       fs_dy.resize(fs.dimension(0), fs.dimension(1), fs.dimension(2));
       fs_dz.resize(fs.dimension(0), fs.dimension(1), fs.dimension(2));
@@ -217,17 +293,46 @@ namespace ASSET {
         }
       };
 
-      fdiffimpl(0, this->xeven, this->xs, this->fs, this->fs_dx);
-      fdiffimpl(1, this->yeven, this->ys, this->fs, this->fs_dy);
-      fdiffimpl(2, this->zeven, this->zs, this->fs, this->fs_dz);
+      fdiffimpl(0, this->xeven, this->xs, this->fs, fs_dx);
+      fdiffimpl(1, this->yeven, this->ys, this->fs, fs_dy);
+      fdiffimpl(2, this->zeven, this->zs, this->fs, fs_dz);
+
+      fdiffimpl(1, this->yeven, this->ys, fs_dx, fs_dxdy);
+      fdiffimpl(2, this->zeven, this->zs, fs_dx, fs_dxdz);
+      fdiffimpl(2, this->zeven, this->zs, fs_dy, fs_dydz);
+
+      fdiffimpl(2, this->zeven, this->zs, fs_dxdy, fs_dxdydz);
+
+      this->bind(this->fs_dx, std::move(fs_dx));
+      this->bind(this->fs_dy, std::move(fs_dy));
+      this->bind(this->fs_dz, std::move(fs_dz));
+      this->bind(this->fs_dxdy, std::move(fs_dxdy));
+      this->bind(this->fs_dxdz, std::move(fs_dxdz));
+      this->bind(this->fs_dydz, std::move(fs_dydz));
+      this->bind(this->fs_dxdydz, std::move(fs_dxdydz));
+    }
 
-      fdiffimpl(1, this->yeven, this->ys, this->fs_dx, this->fs_dxdy);
-      fdiffimpl(2, this->zeven, this->zs, this->fs_dx, this->fs_dxdz);
-      fdiffimpl(2, this->zeven, this->zs, this->fs_dy, this->fs_dydz);
 
-      fdiffimpl(2, this->zeven, this->zs, this->fs_dxdy, this->fs_dxdydz);
+    void set_cache_budget(double megabytes, int shards) {
+      if (megabytes < 0.0) {
+        throw std::invalid_argument("Cache budget must be non-negative");
+      }
+      this->cache_alpha = false;
+      this->alphavecs.resize(0,0,0);
+      if (megabytes > 0.0) {
+        this->alphacache = std::make_shared<InterpCoeffCache<Eigen::Matrix<double, 64, 1>>>(
+            size_t(megabytes * 1024.0 * 1024.0), shards);
+      } else {
+        this->alphacache = nullptr;
+      }
     }
 
+    py::dict cache_stats() const {
+      if (this->alphacache) {
+        return this->alphacache->stats();
+      }
+      return py::dict();
+    }
 
     void cache_alphavecs() {
       this->alphavecs.resize(fs.dimension(0) - 1, fs.dimension(1) - 1, fs.dimension(2) - 1);
@@ -386,6 +491,9 @@ namespace ASSET {
     Eigen::Matrix<double, 64, 1> get_alphavec(int xelem, int yelem, int zelem) const {
       if (this->cache_alpha) {
         return this->alphavecs(xelem, yelem, zelem);
+      } else if (this->alphacache) {
+        int64_t key = int64_t(xelem) + int64_t(xsize) * (int64_t(yelem) + int64_t(ysize) * int64_t(zelem));
+        return this->alphacache->get(key, [&]() { return this->calc_alphavec(xelem, yelem, zelem); });
       } else {
         return this->calc_alphavec(xelem, yelem, zelem);
       }
@@ -733,6 +841,12 @@ namespace ASSET {
             py::arg("fs"),
             py::arg("kind") = std::string("cubic"),
             py::arg("cache") = false);
+    obj.def(py::init<const std::string&, std::string, bool>(),
+            py::arg("path"),
+            py::arg("kind") = std::string(""),
+            py::arg("cache") = false);
+
+    obj.def("save", &InterpTable3D::save, py::arg("path"));
 
 
     obj.def("interp", py::overload_cast<double, double, double>(&InterpTable3D::interp, py::const_));
@@ -744,6 +858,12 @@ namespace ASSET {
     obj.def_readwrite("WarnOutOfBounds" , &InterpTable3D::WarnOutOfBounds);
     obj.def_readwrite("ThrowOutOfBounds", &InterpTable3D::ThrowOutOfBounds);
 
+    obj.def("set_cache_budget",
+            &InterpTable3D::set_cache_budget,
+            py::arg("megabytes"),
+            py::arg("shards") = 64);
+    obj.def("cache_stats", &InterpTable3D::cache_stats);
+
     obj.def("__call__",
             py::overload_cast<double, double, double>(&InterpTable3D::interp, py::const_),
             py::is_operator());
@@ -3,6 +3,8 @@
 
 #include <unsupported/Eigen/CXX11/Tensor>
 
+#include "InterpCoeffCache.h"
+#include "InterpTableFile.h"
 #include "VectorFunction.h"
     namespace ASSET {
 
@@ -20,15 +22,27 @@
     Eigen::VectorXd ws;
 
 
+    using TensorType = Eigen::Tensor<double, 4>;
+    using TensorMapType = Eigen::TensorMap<Eigen::Tensor<const double, 4>>;
+    using AllTensorType = Eigen::Tensor<Eigen::Matrix<double, 16, 1>, 4>;
+    using AllTensorMapType = Eigen::TensorMap<Eigen::Tensor<const Eigen::Matrix<double, 16, 1>, 4>>;
+
+    // Views of data owned by DataOwners, either copies made by the table or a memory mapped file
+
     // numpy meshgrid ij format (x,y,z,w)
-    Eigen::Tensor<double, 4> fs;
+    TensorMapType fs {nullptr, 0, 0, 0, 0};
 
     // Holds f, and all derivatives at each data point contiguously
     // Improved runtime by factor of two over holding separately like in the 3d table
-    Eigen::Tensor<Eigen::Matrix<double, 16, 1>, 4> fs_all;
+    AllTensorMapType fs_all {nullptr, 0, 0, 0, 0};
+
+    std::vector<std::shared_ptr<const void>> DataOwners;
 
     Eigen::Tensor<Eigen::Matrix<double, 256, 1>, 4> alphavecs;
 
+    // Bounded alternative to cache_alpha that computes cell coefficients on first use, see set_cache_budget
+    std::shared_ptr<InterpCoeffCache<Eigen::Matrix<double, 256, 1>>> alphacache;
+
 
     InterpType interp_kind = InterpType::linear_interp;
 
@@ -68,10 +82,63 @@
       this->zs = Zs;
       this->ws = Ws;
 
-      this->fs = Fs;
+      this->bind(this->fs, Fs);
       this->cache_alpha = cache;
+      this->init_table(kind);
+    }
+
+    /// <summary>
+    /// Maps a table written by save. Values (and derivatives if present) are used in place from
+    /// the mapping, so processes loading the same file share one copy. If kind is empty the
+    /// kind the table was saved with is used.
+    /// </summary>
+    InterpTable4D(const std::string& path, std::string kind, bool cache) {
+      InterpTableFile tfile(path, 4);
+      if (kind.empty()) {
+        kind = tfile.cubic() ? "cubic" : "linear";
+      }
+      this->xs = tfile.axis(0);
+      this->ys = tfile.axis(1);
+      this->zs = tfile.axis(2);
+      this->ws = tfile.axis(3);
+
+      int64_t n = this->xs.size() * this->ys.size() * this->zs.size() * this->ws.size();
+      new (&this->fs) TensorMapType(
+          tfile.field(0, n), this->xs.size(), this->ys.size(), this->zs.size(), this->ws.size());
+      if (tfile.nfields() == 2) {
+        new (&this->fs_all) AllTensorMapType(tfile.field<Eigen::Matrix<double, 16, 1>>(1, 16 * n),
+                                             this->xs.size(),
+                                             this->ys.size(),
+                                             this->zs.size(),
+                                             this->ws.size());
+      }
+      this->DataOwners.push_back(tfile.file);
+      this->cache_alpha = cache;
+      this->init_table(kind);
+    }
+
+    void save(const std::string& path) const {
+      std::vector<std::pair<const double*, int64_t>> fields;
+      fields.emplace_back(this->fs.data(), this->fs.size());
+      if (this->interp_kind == InterpType::cubic_interp) {
+        fields.emplace_back(this->fs_all.data()->data(), 16 * this->fs_all.size());
+      }
+      InterpTableFile::write(path,
+                             {this->xs, this->ys, this->zs, this->ws},
+                             fields,
+                             this->interp_kind == InterpType::cubic_interp);
+    }
+
+    template<class MapType, class DataType>
+    void bind(MapType& map, DataType data) {
+      auto owned = std::make_shared<DataType>(std::move(data));
+      new (&map) MapType(
+          owned->data(), owned->dimension(0), owned->dimension(1), owned->dimension(2), owned->dimension(3));
+      this->DataOwners.push_back(owned);
+    }
+
+    void init_table(const std::string& kind) {
 
-      
       if (kind == "cubic" || kind == "Cubic") {
         this->interp_kind = InterpType::cubic_interp;
       } else if (kind == "linear" || kind == "Linear") {
@@ -170,7 +237,9 @@
       }
 
       if (this->interp_kind == InterpType::cubic_interp) {
-        this->calc_derivs();
+        if (this->fs_all.size() == 0) {
+          this->calc_derivs();
+        }
         if (this->cache_alpha) {
           this->cache_alphavecs();
         }
@@ -322,6 +391,7 @@
 
       Eigen::Matrix<double, 16, 1> tmp;
 
+      AllTensorType fs_all;
       fs_all.resize(fs.dimension(0), fs.dimension(1), fs.dimension(2), fs.dimension(3));
 
       for (int i = 0; i < wsize ; i++) {
@@ -349,6 +419,8 @@
               }
           }
       }
+
+      this->bind(this->fs_all, std::move(fs_all));
     }
 
      Eigen::Matrix<double, 256, 1> calc_alphavec(int xelem, int yelem, int zelem,int welem) const {
@@ -413,11 +485,38 @@
     Eigen::Matrix<double, 256, 1> get_alphavec(int xelem, int yelem, int zelem,int welem) const {
       if (this->cache_alpha) {
         return this->alphavecs(xelem, yelem, zelem,welem);
+      } else if (this->alphacache) {
+        int64_t key = int64_t(welem);
+        key = int64_t(zelem) + int64_t(zsize) * key;
+        key = int64_t(yelem) + int64_t(ysize) * key;
+        key = int64_t(xelem) + int64_t(xsize) * key;
+        return this->alphacache->get(key, [&]() { return this->calc_alphavec(xelem, yelem, zelem, welem); });
       } else {
         return this->calc_alphavec(xelem, yelem, zelem,welem);
       }
     }
 
+    void set_cache_budget(double megabytes, int shards) {
+      if (megabytes < 0.0) {
+        throw std::invalid_argument("Cache budget must be non-negative");
+      }
+      this->cache_alpha = false;
+      this->alphavecs.resize(0,0,0,0);
+      if (megabytes > 0.0) {
+        this->alphacache = std::make_shared<InterpCoeffCache<Eigen::Matrix<double, 256, 1>>>(
+            size_t(megabytes * 1024.0 * 1024.0), shards);
+      } else {
+        this->alphacache = nullptr;
+      }
+    }
+
+    py::dict cache_stats() const {
+      if (this->alphacache) {
+        return this->alphacache->stats();
+      }
+      return py::dict();
+    }
+
     void cache_alphavecs() {
       this->alphavecs.resize(
           fs.dimension(0) - 1, 
@@ -1094,6 +1193,12 @@
           py::arg("fs"),
           py::arg("kind") = std::string("cubic"),
           py::arg("cache") = false);
+      obj.def(py::init<const std::string&, std::string, bool>(),
+              py::arg("path"),
+              py::arg("kind") = std::string(""),
+              py::arg("cache") = false);
+
+      obj.def("save", &InterpTable4D::save, py::arg("path"));
 
 
       obj.def("interp", py::overload_cast<double, double, double,double>(&InterpTable4D::interp, py::const_));
@@ -1105,6 +1210,12 @@
       obj.def_readwrite("WarnOutOfBounds", &InterpTable4D::WarnOutOfBounds);
       obj.def_readwrite("ThrowOutOfBounds", &InterpTable4D::ThrowOutOfBounds);
 
+      obj.def("set_cache_budget",
+              &InterpTable4D::set_cache_budget,
+              py::arg("megabytes"),
+              py::arg("shards") = 64);
+      obj.def("cache_stats", &InterpTable4D::cache_stats);
+
       obj.def("__call__",
           py::overload_cast<double, double, double, double>(&InterpTable4D::interp, py::const_),
           py::is_operator());
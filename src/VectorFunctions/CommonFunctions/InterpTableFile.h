@@ -0,0 +1,171 @@
+#pragma once
+#include <cstdint>
+#include <cstring>
+#include <fstream>
+
+#include "Utils/MappedFile.h"
+#include "pch.h"
+
+namespace ASSET {
+
+  /// <summary>
+  /// Binary file format shared by InterpTable2D/3D/4D for memory mapped tables.
+  ///
+  /// Layout: a fixed size header, the coordinate axes, then one or more data fields (the values
+  /// followed by any precomputed derivatives) stored in the table's native memory order. Every
+  /// section starts on a 64 byte boundary so it can be used in place from the mapping.
+  /// </summary>
+  struct InterpTableFile {
+
+    static constexpr char Magic[8] = {'A', 'S', 'S', 'E', 'T', 'T', 'B', 'L'};
+    static constexpr uint32_t Version = 1;
+    static constexpr int MaxDims = 4;
+    static constexpr int MaxFields = 16;
+    static constexpr size_t Alignment = 64;
+
+    struct Header {
+      char magic[8];
+      uint32_t version;
+      uint32_t ndims;
+      uint32_t nfields;
+      uint32_t cubic;
+      int64_t dims[MaxDims];
+      int64_t fieldsizes[MaxFields];
+    };
+
+    static size_t align(size_t offset) {
+      return ((offset + Alignment - 1) / Alignment) * Alignment;
+    }
+
+    static std::vector<size_t> section_offsets(const Header& head) {
+      std::vector<size_t> offsets;
+      size_t offset = align(sizeof(Header));
+      for (uint32_t i = 0; i < head.ndims; i++) {
+        offsets.push_back(offset);
+        offset = align(offset + sizeof(double) * size_t(head.dims[i]));
+      }
+      for (uint32_t i = 0; i < head.nfields; i++) {
+        offsets.push_back(offset);
+        offset = align(offset + sizeof(double) * size_t(head.fieldsizes[i]));
+      }
+      offsets.push_back(offset);
+      return offsets;
+    }
+
+    /// <summary>
+    /// Writes the axes and fields to path. Fields are (pointer,number of doubles) pairs.
+    /// The file is written to a temporary next to path and then renamed over it, so tables
+    /// currently mapped from path (including the one being saved) are never truncated.
+    /// </summary>
+    static void write(const std::string& path,
+                      const std::vector<Eigen::VectorXd>& axes,
+                      const std::vector<std::pair<const double*, int64_t>>& fields,
+                      bool cubic) {
+      if (axes.size() > MaxDims || fields.size() > MaxFields) {
+        throw std::invalid_argument("Too many axes or fields for an interpolation table file");
+      }
+      Header head;
+      std::memset(&head, 0, sizeof(Header));
+      std::memcpy(head.magic, Magic, sizeof(Magic));
+      head.version = Version;
+      head.ndims = uint32_t(axes.size());
+      head.nfields = uint32_t(fields.size());
+      head.cubic = cubic ? 1 : 0;
+      for (size_t i = 0; i < axes.size(); i++)
+        head.dims[i] = axes[i].size();
+      for (size_t i = 0; i < fields.size(); i++)
+        head.fieldsizes[i] = fields[i].second;
+
+      std::vector<size_t> offsets = section_offsets(head);
+
+      std::string tmppath = TempFilePath(path);
+      std::ofstream out(tmppath, std::ios::binary | std::ios::trunc);
+      if (!out) {
+        throw std::invalid_argument(fmt::format("Could not open interpolation table file: {0}", tmppath));
+      }
+      auto pad_to = [&](size_t offset) {
+        static const char zeros[Alignment] = {0};
+        size_t pos = size_t(out.tellp());
+        out.write(zeros, std::streamsize(offset - pos));
+      };
+
+      out.write(reinterpret_cast<const char*>(&head), sizeof(Header));
+      for (size_t i = 0; i < axes.size(); i++) {
+        pad_to(offsets[i]);
+        out.write(reinterpret_cast<const char*>(axes[i].data()), sizeof(double) * axes[i].size());
+      }
+      for (size_t i = 0; i < fields.size(); i++) {
+        pad_to(offsets[axes.size() + i]);
+        out.write(reinterpret_cast<const char*>(fields[i].first), sizeof(double) * fields[i].second);
+      }
+      pad_to(offsets.back());
+      out.close();
+      if (!out) {
+        std::remove(tmppath.c_str());
+        throw std::runtime_error(fmt::format("Failed writing interpolation table file: {0}", path));
+      }
+      if (!ReplaceFile(tmppath, path)) {
+        std::remove(tmppath.c_str());
+        throw std::runtime_error(fmt::format("Could not replace interpolation table file: {0}", path));
+      }
+    }
+
+    std::shared_ptr<MappedFile> file;
+    Header head;
+    std::vector<size_t> offsets;
+
+    InterpTableFile(const std::string& path, int ndims) {
+      this->file = std::make_shared<MappedFile>(path);
+      if (this->file->size() < sizeof(Header)) {
+        throw std::invalid_argument(fmt::format("{0} is not an interpolation table file", path));
+      }
+      std::memcpy(&this->head, this->file->data(), sizeof(Header));
+      if (std::memcmp(this->head.magic, Magic, sizeof(Magic)) != 0) {
+        throw std::invalid_argument(fmt::format("{0} is not an interpolation table file", path));
+      }
+      if (this->head.version != Version) {
+        throw std::invalid_argument(
+            fmt::format("Unsupported interpolation table file version {0} in {1}", this->head.version, path));
+      }
+      if (int(this->head.ndims) != ndims) {
+        throw std::invalid_argument(fmt::format(
+            "{0} holds a {1}-D table, expected a {2}-D table", path, this->head.ndims, ndims));
+      }
+      if (this->head.nfields < 1 || this->head.nfields > MaxFields) {
+        throw std::invalid_argument(fmt::format("Corrupt interpolation table file: {0}", path));
+      }
+      this->offsets = section_offsets(this->head);
+      if (this->offsets.back() > this->file->size()) {
+        throw std::invalid_argument(fmt::format("Truncated interpolation table file: {0}", path));
+      }
+    }
+
+    bool cubic() const {
+      return this->head.cubic != 0;
+    }
+    int nfields() const {
+      return int(this->head.nfields);
+    }
+    int64_t dim(int i) const {
+      return this->head.dims[i];
+    }
+    int64_t field_size(int i) const {
+      return this->head.fieldsizes[i];
+    }
+
+    Eigen::VectorXd axis(int i) const {
+      const double* ptr = reinterpret_cast<const double*>(this->file->data() + this->offsets[i]);
+      return Eigen::Map<const Eigen::VectorXd>(ptr, this->head.dims[i]);
+    }
+
+    template<class T = double>
+    const T* field(int i, int64_t expected_doubles) const {
+      if (i >= this->nfields() || this->head.fieldsizes[i] != expected_doubles) {
+        throw std::invalid_argument(
+            fmt::format("Interpolation table file {0} has missing or misshapen data", this->file->path()));
+      }
+      return reinterpret_cast<const T*>(this->file->data() + this->offsets[this->head.ndims + i]);
+    }
+  };
+
+}  // namespace ASSET
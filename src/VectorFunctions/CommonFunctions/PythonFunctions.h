@@ -83,40 +83,61 @@ namespace ASSET {
   };
 
 
+  /*
+  Vector function defined by numba cfunc addresses. None of them need the GIL, so the function is thread safe
+  by default and can be called from every PSIOPT thread. The cfunc signatures are:
+
+      Func           : void(double* X, double* F, int irows, int orows)
+      Jacobian       : void(double* X, double* F, double* J, int irows, int orows)   J is column major
+      AdjointHessian : void(double* X, double* L, double* H, int irows, int orows)   H = sum(L_i * hess(F_i))
+      Batch          : void(double* X, double* F, int n)                            n inputs, stored column major
+
+  Jacobian and AdjointHessian are optional and fall back to forward finite differences. If Batch is given,
+  vectorized callers (ex: the LGL defects) evaluate a whole SuperScalar pack of inputs with one call.
+
+  Contiguous inputs are handed to the cfuncs without a copy, so X (and L) are read only: a cfunc that
+  writes to them corrupts the caller's variables.
+  */
   template<int IRR, int ORR>
   struct NumbaVectorFunction : VectorFunction<NumbaVectorFunction<IRR, ORR>, IRR, ORR, FDiffFwd, FDiffFwd> {
     using Base = VectorFunction<NumbaVectorFunction<IRR, ORR>, IRR, ORR, FDiffFwd, FDiffFwd>;
-
-    template<class Scalar>
-    using Output = typename Base::template Output<Scalar>;
-    template<class Scalar>
-    using Input = typename Base::template Input<Scalar>;
+    DENSE_FUNCTION_BASE_TYPES(Base);
+    using Base::adjointhessian;
 
     using FType = long long unsigned int;
     typedef void (*FPtr)(double*, double*, int, int);
+    typedef void (*JPtr)(double*, double*, double*, int, int);
+    typedef void (*HPtr)(double*, double*, double*, int, int);
+    typedef void (*BPtr)(double*, double*, int);
 
-    bool threadSafe = false;
-    bool dojac = false;
-    FPtr fun;
-
-    template<class InType, class OutType>
-    inline void compute_impl(const Eigen::MatrixBase<InType>& x,
-                             Eigen::MatrixBase<OutType> const& fx_) const {
-      Eigen::MatrixBase<OutType>& fx = fx_.const_cast_derived();
+    static const bool IsVectorizable = true;
 
-      Input<double> xt = x;
-      Output<double> fxt = fx;
+    bool threadSafe = true;
+    FPtr fun = nullptr;
+    JPtr jacfun = nullptr;
+    HPtr hessfun = nullptr;
+    BPtr batchfun = nullptr;
 
-      this->fun(xt.data(), fxt.data(), this->IRows(), this->ORows());
-      fx = fxt;
-    }
-    NumbaVectorFunction(int irr, int orr, const FType& f, double js, double hs) {
+    NumbaVectorFunction(int irr,
+                        int orr,
+                        const FType& f,
+                        const FType& jac,
+                        const FType& hess,
+                        const FType& batch,
+                        double js,
+                        double hs) {
       this->setIORows(irr, orr);
       this->fun = (FPtr) f;
+      this->jacfun = (JPtr) jac;
+      this->hessfun = (HPtr) hess;
+      this->batchfun = (BPtr) batch;
       this->setJacFDSteps(js);
       this->setHessFDSteps(hs);
     }
-    NumbaVectorFunction(int irr, int orr, const FType& f) : NumbaVectorFunction(irr, orr, f, 1.0e-6, 1.0e-6) {
+    NumbaVectorFunction(int irr, int orr, const FType& f, double js, double hs)
+        : NumbaVectorFunction(irr, orr, f, 0, 0, 0, js, hs) {
+    }
+    NumbaVectorFunction(int irr, int orr, const FType& f) : NumbaVectorFunction(irr, orr, f, 1.0e-6, 1.0e-4) {
     }
     NumbaVectorFunction(const FType& f) : NumbaVectorFunction(IRR, ORR, f) {
     }
@@ -127,13 +148,161 @@ namespace ASSET {
     }
     NumbaVectorFunction(int irr, const FType& f) : NumbaVectorFunction(irr, ORR, f) {
     }
+    NumbaVectorFunction(
+        int irr, const FType& f, const FType& jac, const FType& hess, const FType& batch, double js, double hs)
+        : NumbaVectorFunction(irr, ORR, f, jac, hess, batch, js, hs) {
+    }
 
     bool thread_safe() const {
-      return threadSafe;
+      return this->threadSafe;
+    }
+
+    template<class InType, class OutType>
+    inline void compute_impl(ConstVectorBaseRef<InType> x, ConstVectorBaseRef<OutType> fx_) const {
+      typedef typename InType::Scalar Scalar;
+      VectorBaseRef<OutType> fx = fx_.const_cast_derived();
+      const int irows = this->IRows();
+      const int orows = this->ORows();
+
+      if constexpr (Is_SuperScalar<Scalar>::value) {
+        constexpr int vsize = Scalar::SizeAtCompileTime;
+        Eigen::Matrix<double, -1, vsize> X(irows, vsize);
+        Eigen::Matrix<double, -1, vsize> F(orows, vsize);
+        for (int i = 0; i < irows; i++)
+          for (int v = 0; v < vsize; v++)
+            X(i, v) = x[i][v];
+        F.setZero();
+
+        if (this->batchfun != nullptr) {
+          this->batchfun(X.data(), F.data(), vsize);
+        } else {
+          for (int v = 0; v < vsize; v++)
+            this->fun(X.col(v).data(), F.col(v).data(), irows, orows);
+        }
+
+        for (int i = 0; i < orows; i++)
+          for (int v = 0; v < vsize; v++)
+            fx[i][v] = F(i, v);
+      } else {
+        if constexpr (std::is_same<Scalar, double>::value
+                      && bool(Eigen::internal::traits<InType>::Flags & Eigen::DirectAccessBit)
+                      && bool(Eigen::internal::traits<OutType>::Flags & Eigen::DirectAccessBit)) {
+          // Contiguous inputs and outputs (the usual case) are handed to the cfunc without copies
+          if (x.derived().innerStride() == 1 && fx.derived().innerStride() == 1) {
+            this->fun(const_cast<double*>(x.derived().data()), fx.derived().data(), irows, orows);
+            return;
+          }
+        }
+        Input<double> xt = x;
+        Output<double> fxt = fx;
+        this->fun(xt.data(), fxt.data(), irows, orows);
+        fx = fxt;
+      }
+    }
+
+    template<class InType, class OutType, class JacType>
+    inline void compute_jacobian_impl(ConstVectorBaseRef<InType> x,
+                                      ConstVectorBaseRef<OutType> fx_,
+                                      ConstMatrixBaseRef<JacType> jx_) const {
+      typedef typename InType::Scalar Scalar;
+      if (this->jacfun == nullptr) {
+        Base::compute_jacobian_impl(x, fx_, jx_);
+        return;
+      }
+      VectorBaseRef<OutType> fx = fx_.const_cast_derived();
+      MatrixBaseRef<JacType> jx = jx_.const_cast_derived();
+      const int irows = this->IRows();
+      const int orows = this->ORows();
+
+      Input<double> xt(irows);
+      Output<double> fxt(orows);
+      Jacobian<double> jxt(orows, irows);
+
+      if constexpr (Is_SuperScalar<Scalar>::value) {
+        for (int v = 0; v < Scalar::SizeAtCompileTime; v++) {
+          for (int i = 0; i < irows; i++)
+            xt[i] = x[i][v];
+          fxt.setZero();
+          jxt.setZero();
+          this->jacfun(xt.data(), fxt.data(), jxt.data(), irows, orows);
+          for (int i = 0; i < orows; i++) {
+            fx[i][v] = fxt[i];
+            for (int j = 0; j < irows; j++)
+              jx(i, j)[v] = jxt(i, j);
+          }
+        }
+      } else {
+        xt = x;
+        fxt.setZero();
+        jxt.setZero();
+        this->jacfun(xt.data(), fxt.data(), jxt.data(), irows, orows);
+        fx = fxt;
+        jx = jxt;
+      }
+    }
+
+    template<class InType, class AdjHessType, class AdjVarType>
+    inline void adjointhessian(ConstVectorBaseRef<InType> x,
+                               ConstMatrixBaseRef<AdjHessType> adjhess_,
+                               ConstVectorBaseRef<AdjVarType> adjvars) const {
+      typedef typename InType::Scalar Scalar;
+      if (this->hessfun == nullptr) {
+        Base::adjointhessian(x, adjhess_, adjvars);
+        return;
+      }
+      MatrixBaseRef<AdjHessType> adjhess = adjhess_.const_cast_derived();
+      const int irows = this->IRows();
+      const int orows = this->ORows();
+
+      Input<double> xt(irows);
+      Output<double> lt(orows);
+      Hessian<double> ht(irows, irows);
+
+      if constexpr (Is_SuperScalar<Scalar>::value) {
+        for (int v = 0; v < Scalar::SizeAtCompileTime; v++) {
+          for (int i = 0; i < irows; i++)
+            xt[i] = x[i][v];
+          for (int i = 0; i < orows; i++)
+            lt[i] = adjvars[i][v];
+          ht.setZero();
+          this->hessfun(xt.data(), lt.data(), ht.data(), irows, orows);
+          for (int i = 0; i < irows; i++)
+            for (int j = 0; j < irows; j++)
+              adjhess(i, j)[v] += ht(i, j);
+        }
+      } else {
+        xt = x;
+        lt = adjvars;
+        ht.setZero();
+        this->hessfun(xt.data(), lt.data(), ht.data(), irows, orows);
+        adjhess += ht;
+      }
+    }
+
+    template<class InType,
+             class OutType,
+             class JacType,
+             class AdjGradType,
+             class AdjHessType,
+             class AdjVarType>
+    inline void compute_jacobian_adjointgradient_adjointhessian_impl(
+        ConstVectorBaseRef<InType> x,
+        ConstVectorBaseRef<OutType> fx_,
+        ConstMatrixBaseRef<JacType> jx_,
+        ConstVectorBaseRef<AdjGradType> adjgrad_,
+        ConstMatrixBaseRef<AdjHessType> adjhess_,
+        ConstVectorBaseRef<AdjVarType> adjvars) const {
+      if (this->hessfun == nullptr) {
+        Base::compute_jacobian_adjointgradient_adjointhessian_impl(x, fx_, jx_, adjgrad_, adjhess_, adjvars);
+        return;
+      }
+      this->compute_jacobian_adjointgradient(x, fx_, jx_, adjgrad_, adjvars);
+      this->adjointhessian(x, adjhess_, adjvars);
     }
 
     static void Build(py::module& m, const char* name) {
       auto obj = py::class_<NumbaVectorFunction>(m, name);
+
       obj.def(py::init<int, int, const FType&, double, double>());
       obj.def(py::init<int, int, const FType&>());
 
@@ -146,8 +315,32 @@ namespace ASSET {
         obj.def(py::init<const FType&, double, double>());
         obj.def(py::init<const FType&>());
       }
-      obj.def_readwrite("thread_safe", &NumbaVectorFunction::thread_safe);
+
+      // Registered last so that positional calls such as (IRows,1,Func) on the scalar version
+      // bind to the overloads above rather than reading ORows as Func
+      if constexpr (ORR != 1) {
+        obj.def(py::init<int, int, const FType&, const FType&, const FType&, const FType&, double, double>(),
+                py::arg("IRows"),
+                py::arg("ORows"),
+                py::arg("Func"),
+                py::arg("Jacobian") = 0,
+                py::arg("AdjointHessian") = 0,
+                py::arg("Batch") = 0,
+                py::arg("Jstepsize") = 1.0e-6,
+                py::arg("Hstepsize") = 1.0e-4);
+      } else {
+        obj.def(py::init<int, const FType&, const FType&, const FType&, const FType&, double, double>(),
+                py::arg("IRows"),
+                py::arg("Func"),
+                py::arg("Jacobian") = 0,
+                py::arg("AdjointHessian") = 0,
+                py::arg("Batch") = 0,
+                py::arg("Jstepsize") = 1.0e-6,
+                py::arg("Hstepsize") = 1.0e-4);
+      }
+      obj.def_readwrite("thread_safe", &NumbaVectorFunction::threadSafe);
       Base::DenseBaseBuild(obj);
+      Base::DenseBatchBuild(obj);
     }
   };
 
@@ -0,0 +1,258 @@
+#pragma once
+
+#include <random>
+
+#include "VectorFunction.h"
+
+namespace ASSET {
+
+  /*
+  Evaluates a function as a linear tape. The input x is extended with the outputs of a list of stages
+  (shared subexpressions), each computed once from x and the outputs of the stages before it:
+
+      tape = [x, t0(x), t1(x,t0), ... ]      output = f(tape)
+
+  Every stage and the output take the full tape as input, so they are built from Arguments(TapeRows)
+  and refer to earlier stages by element or segment. The first and second derivatives are propagated
+  through the tape in a single reverse sweep, so each stage is differentiated once no matter how many
+  times its result is used.
+  */
+  template<int OR>
+  struct TapeFunction : VectorFunction<TapeFunction<OR>, -1, OR> {
+    using Base = VectorFunction<TapeFunction<OR>, -1, OR>;
+    using Base::compute;
+    DENSE_FUNCTION_BASE_TYPES(Base);
+
+    using StageType = GenericFunction<-1, -1>;
+    using OutputType = GenericFunction<-1, OR>;
+
+    static const bool IsVectorizable = true;
+
+    std::vector<StageType> stages;
+    OutputType output;
+
+    std::vector<int> StageStarts;  // Location of each stage's output in the tape
+    int TapeRows = 0;
+    int MaxStageRows = 0;
+    int StageRows = 0;
+
+    TapeFunction() {
+    }
+    TapeFunction(int irows, const std::vector<StageType>& stages, const OutputType& output)
+        : stages(stages), output(output) {
+      this->TapeRows = irows;
+      for (auto& stage: this->stages) {
+        this->StageStarts.push_back(this->TapeRows);
+        this->TapeRows += stage.ORows();
+      }
+
+      auto CheckRows = [&](int frows, std::string fname) {
+        if (frows != this->TapeRows) {
+          auto msg = fmt::format("Tape {0} has {1} input rows, but the tape has {2} rows "
+                                 "({3} inputs plus the outputs of every stage).\n",
+                                 fname,
+                                 frows,
+                                 this->TapeRows,
+                                 irows);
+          throw std::invalid_argument(msg);
+        }
+      };
+      for (int i = 0; i < this->stages.size(); i++)
+        CheckRows(this->stages[i].IRows(), fmt::format("stage {0}", i));
+      CheckRows(this->output.IRows(), "output");
+
+      this->check_tape(irows);
+      this->setIORows(irows, this->output.ORows());
+    }
+
+    /*
+    Checks that no stage reads itself or a later stage. The rows each stage depends on are taken from the
+    non-zero columns of its jacobian, accumulated over several random points so that a dependency whose
+    derivative happens to vanish at one of them (ex: inside an inactive ifelse branch) is still seen.
+    Every stage is kept, since a numerically zero derivative says nothing about whether the output
+    actually uses a stage's value.
+    */
+    void check_tape(int irows, int probes = 4) {
+      std::mt19937 gen(this->TapeRows);
+      std::uniform_real_distribution<double> dist(0.5, 1.5);
+      Eigen::VectorXd xt(this->TapeRows);
+
+      for (int k = 0; k < this->stages.size(); k++) {
+        const auto& stage = this->stages[k];
+        int start = this->StageStarts[k];
+        Eigen::VectorXd fx(stage.ORows());
+        Eigen::MatrixXd jx(stage.ORows(), stage.IRows());
+        for (int p = 0; p < probes; p++) {
+          for (int j = 0; j < this->TapeRows; j++)
+            xt[j] = dist(gen);
+          fx.setZero();
+          jx.setZero();
+          stage.compute_jacobian(xt, fx, jx);
+          for (int j = start; j < this->TapeRows; j++) {
+            for (int i = 0; i < stage.ORows(); i++) {
+              if (!(jx(i, j) == 0.0)) {  // NaNs count as dependencies
+                auto msg = fmt::format("Tape stage {0} depends on tape row {1}, which is not computed until "
+                                       "after it. Stages may only use the inputs and the outputs of earlier "
+                                       "stages.\n",
+                                       k,
+                                       j);
+                throw std::invalid_argument(msg);
+              }
+            }
+          }
+        }
+        this->MaxStageRows = std::max(this->MaxStageRows, stage.ORows());
+      }
+      this->StageRows = this->TapeRows - irows;
+    }
+
+    template<class TapeType>
+    inline void forward_sweep(TapeType& tape) const {
+      for (int k = 0; k < this->stages.size(); k++) {
+        const auto& stage = this->stages[k];
+        stage.compute(tape, tape.segment(this->StageStarts[k], stage.ORows()));
+      }
+    }
+
+    ////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+    template<class InType, class OutType>
+    inline void compute_impl(ConstVectorBaseRef<InType> x, ConstVectorBaseRef<OutType> fx_) const {
+      typedef typename InType::Scalar Scalar;
+
+      auto Impl = [&](auto& tape) {
+        tape.setZero();
+        tape.head(this->IRows()) = x;
+        this->forward_sweep(tape);
+        this->output.compute(tape, fx_);
+      };
+
+      MemoryManager::allocate_run(
+          this->TapeRows, Impl, TempSpec<Eigen::Matrix<Scalar, -1, 1>>(this->TapeRows, 1));
+    }
+
+    template<class InType, class OutType, class JacType>
+    inline void compute_jacobian_impl(ConstVectorBaseRef<InType> x,
+                                      ConstVectorBaseRef<OutType> fx_,
+                                      ConstMatrixBaseRef<JacType> jx_) const {
+      typedef typename InType::Scalar Scalar;
+      MatrixBaseRef<JacType> jx = jx_.const_cast_derived();
+
+      auto Impl = [&](auto& tape, auto& jxs, auto& jxt) {
+        tape.setZero();
+        jxs.setZero();
+        jxt.setZero();
+        tape.head(this->IRows()) = x;
+
+        // Forward: values and jacobians of the stages, each stored in its own rows of jxs
+        int row = 0;
+        for (int k = 0; k < this->stages.size(); k++) {
+          const auto& stage = this->stages[k];
+          int rows = stage.ORows();
+          stage.compute_jacobian(
+              tape, tape.segment(this->StageStarts[k], rows), jxs.middleRows(row, rows));
+          row += rows;
+        }
+        this->output.compute_jacobian(tape, fx_, jxt);
+
+        // Reverse: fold the columns of each stage's outputs into the columns it was computed from
+        for (int k = int(this->stages.size()) - 1; k >= 0; k--) {
+          int rows = this->stages[k].ORows();
+          int start = this->StageStarts[k];
+          row -= rows;
+          jxt.leftCols(start).noalias() += jxt.middleCols(start, rows) * jxs.middleRows(row, rows).leftCols(start);
+        }
+
+        jx = jxt.leftCols(this->IRows());
+      };
+
+      MemoryManager::allocate_run(this->TapeRows,
+                                  Impl,
+                                  TempSpec<Eigen::Matrix<Scalar, -1, 1>>(this->TapeRows, 1),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(this->StageRows, this->TapeRows),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(this->ORows(), this->TapeRows));
+    }
+
+    template<class InType,
+             class OutType,
+             class JacType,
+             class AdjGradType,
+             class AdjHessType,
+             class AdjVarType>
+    inline void compute_jacobian_adjointgradient_adjointhessian_impl(
+        ConstVectorBaseRef<InType> x,
+        ConstVectorBaseRef<OutType> fx_,
+        ConstMatrixBaseRef<JacType> jx_,
+        ConstVectorBaseRef<AdjGradType> adjgrad_,
+        ConstMatrixBaseRef<AdjHessType> adjhess_,
+        ConstVectorBaseRef<AdjVarType> adjvars) const {
+      typedef typename InType::Scalar Scalar;
+      MatrixBaseRef<JacType> jx = jx_.const_cast_derived();
+      VectorBaseRef<AdjGradType> adjgrad = adjgrad_.const_cast_derived();
+      MatrixBaseRef<AdjHessType> adjhess = adjhess_.const_cast_derived();
+
+      /*
+      The reverse sweep carries the gradient gt and hessian ht of lambda^T f with respect to the tape rows
+      computed so far. Eliminating stage k, t = s(a), with jacobian J and adjoint mu = gt[t] gives:
+
+        gt[a]   += J^T mu
+        ht[a,a] += J^T ht[t,t] J + J^T ht[t,a] + ht[a,t] J + sum(mu_i * hess(s_i))
+      */
+      auto Impl = [&](auto& tape, auto& jxt, auto& gt, auto& ht, auto& fs, auto& js, auto& gs, auto& hs, auto& tmp) {
+        tape.setZero();
+        jxt.setZero();
+        gt.setZero();
+        ht.setZero();
+        tape.head(this->IRows()) = x;
+
+        this->forward_sweep(tape);
+        this->output.compute_jacobian_adjointgradient_adjointhessian(tape, fx_, jxt, gt, ht, adjvars);
+
+        for (int k = int(this->stages.size()) - 1; k >= 0; k--) {
+          const auto& stage = this->stages[k];
+          int rows = stage.ORows();
+          int start = this->StageStarts[k];
+
+          auto fk = fs.head(rows);
+          auto jk = js.topRows(rows);
+          fk.setZero();
+          jk.setZero();
+          gs.setZero();
+          hs.setZero();
+
+          stage.compute_jacobian_adjointgradient_adjointhessian(tape, fk, jk, gs, hs, gt.segment(start, rows));
+
+          auto ja = jk.leftCols(start);
+          auto tm = tmp.topLeftCorner(rows, start);
+
+          tm = ht.block(start, 0, rows, start);
+          tm.noalias() += ht.block(start, start, rows, rows) * ja;
+          ht.topLeftCorner(start, start).noalias() += ja.transpose() * tm;
+          ht.topLeftCorner(start, start).noalias() += ht.block(0, start, start, rows) * ja;
+          ht.topLeftCorner(start, start) += hs.topLeftCorner(start, start);
+
+          gt.head(start) += gs.head(start);
+          jxt.leftCols(start).noalias() += jxt.middleCols(start, rows) * ja;
+        }
+
+        jx = jxt.leftCols(this->IRows());
+        adjgrad += gt.head(this->IRows());
+        adjhess += ht.topLeftCorner(this->IRows(), this->IRows());
+      };
+
+      const int trows = this->TapeRows;
+      const int srows = std::max(this->MaxStageRows, 1);
+      MemoryManager::allocate_run(trows,
+                                  Impl,
+                                  TempSpec<Eigen::Matrix<Scalar, -1, 1>>(trows, 1),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(this->ORows(), trows),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, 1>>(trows, 1),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(trows, trows),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, 1>>(srows, 1),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(srows, trows),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, 1>>(trows, 1),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(trows, trows),
+                                  TempSpec<Eigen::Matrix<Scalar, -1, -1>>(srows, trows));
+    }
+  };
+
+}  // namespace ASSET
@@ -39,6 +39,8 @@ in the LICENSE file in ASSET's top level directory.
 #pragma once
 #include <bench/BenchTimer.h>
 
+#include <mutex>
+
 #include "AssigmentTypes.h"
 #include "BinaryMath.h"
 #include "CommonFunctions/ExpressionFwdDeclarations.h"
@@ -51,6 +53,22 @@ in the LICENSE file in ASSET's top level directory.
 
 namespace ASSET {
 
+  /*
+   * Thread pool shared by the batched function calls of every vector function type, so that repeated
+   * batch calls do not pay for starting and joining threads. It is grown on demand to hold at least
+   * thrs threads and is never shrunk.
+   */
+  inline std::shared_ptr<ctpl::ThreadPool> BatchThreadPool(int thrs) {
+    static std::shared_ptr<ctpl::ThreadPool> pool = std::make_shared<ctpl::ThreadPool>();
+    // The GIL is released during batch calls, so two python threads may get here at once
+    static std::mutex ResizeMutex;
+    std::lock_guard<std::mutex> lock(ResizeMutex);
+    if (pool->size() < thrs) {
+      pool->resize(thrs);
+    }
+    return pool;
+  }
+
 
   template<class Derived, int IR, int OR>
   struct DenseFunctionBase : Computable<Derived, IR, OR>, DomainHolder<IR> {
@@ -1055,6 +1073,248 @@ namespace ASSET {
     ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
+    using BatchMatrix = Eigen::Matrix<double, -1, -1, Eigen::RowMajor>;
+    using BatchArray = py::array_t<double, py::array::c_style>;
+
+    /*
+     * Evaluates derived at many input points in a single call. Each column (axis = 0) or row (axis = 1)
+     * of Xs and Ls is one call of the function. The results of the ith call are passed to store as
+     * store(i,fx,jx,gx,hx), where only the quantities computed by Mode are valid. Calls are split into
+     * contiguous chunks across thrs threads, and inside each chunk we make as many fully packed SuperScalar
+     * calls as possible before reverting to the scalar implementation, exactly as is done in constraints.
+     * Functions that are not thread safe are always evaluated on the calling thread.
+     */
+    template<BatchEvalModes Mode, class StoreOp>
+    void batch_evaluate(ConstEigenRef<BatchMatrix> Xs,
+                        ConstEigenRef<BatchMatrix> Ls,
+                        int axis,
+                        bool vectorize,
+                        int thrs,
+                        StoreOp store) const {
+
+      constexpr bool DoMults = (Mode != BatchCompute && Mode != BatchJacobian);
+      constexpr bool DoHessian = (Mode == BatchAdjointHessian || Mode == BatchComputeAll);
+
+      const int IRR = this->IRows();
+      const int ORR = this->ORows();
+      const int NumCalls = (axis == 0) ? Xs.cols() : Xs.rows();
+
+      auto ChunkImpl = [&](int start, int stop) {
+        Input<double> x(IRR);
+        Output<double> l(ORR);
+        Output<double> fx(ORR);
+        Jacobian<double> jx(ORR, IRR);
+        Gradient<double> gx(IRR);
+        Hessian<double> hx(IRR, IRR);
+
+        fx.setZero();
+        jx.setZero();
+        gx.setZero();
+        hx.setZero();
+
+        auto gather = [&](int i) {
+          if (axis == 0) {
+            x = Xs.col(i);
+            if constexpr (DoMults)
+              l = Ls.col(i);
+          } else {
+            x = Xs.row(i).transpose();
+            if constexpr (DoMults)
+              l = Ls.row(i).transpose();
+          }
+        };
+
+        auto ScalarImpl = [&](int start, int stop) {
+          for (int i = start; i < stop; i++) {
+            gather(i);
+            fx.setZero();
+            if constexpr (Mode == BatchCompute) {
+              this->derived().compute(x, fx);
+            } else if constexpr (Mode == BatchJacobian) {
+              jx.setZero();
+              this->derived().compute_jacobian(x, fx, jx);
+            } else if constexpr (Mode == BatchAdjointGradient) {
+              gx.setZero();
+              this->derived().compute_adjointgradient(x, fx, gx, l);
+            } else {
+              jx.setZero();
+              gx.setZero();
+              hx.setZero();
+              this->derived().compute_jacobian_adjointgradient_adjointhessian(x, fx, jx, gx, hx, l);
+            }
+            store(i, fx, jx, gx, hx);
+          }
+        };
+
+        auto VectorImpl = [&](int start, int stop) {
+          using SuperScalar = ASSET::DefaultSuperScalar;
+          constexpr int vsize = SuperScalar::SizeAtCompileTime;
+          int Packs = (stop - start) / vsize;
+
+          Input<SuperScalar> x_vect(IRR);
+          Output<SuperScalar> l_vect(ORR);
+          Output<SuperScalar> fx_vect(ORR);
+          Jacobian<SuperScalar> jx_vect(ORR, IRR);
+          Gradient<SuperScalar> gx_vect(IRR);
+          Hessian<SuperScalar> hx_vect(IRR, IRR);
+
+          for (int i = 0; i < Packs; i++) {
+            int V0 = start + i * vsize;
+            for (int j = 0; j < vsize; j++) {
+              gather(V0 + j);
+              for (int k = 0; k < IRR; k++) {
+                x_vect[k][j] = x[k];
+              }
+              if constexpr (DoMults) {
+                for (int k = 0; k < ORR; k++) {
+                  l_vect[k][j] = l[k];
+                }
+              }
+            }
+
+            fx_vect.setZero();
+            if constexpr (Mode == BatchCompute) {
+              this->derived().compute(x_vect, fx_vect);
+            } else if constexpr (Mode == BatchJacobian || Mode == BatchAdjointGradient) {
+              jx_vect.setZero();
+              this->derived().compute_jacobian(x_vect, fx_vect, jx_vect);
+            } else {
+              jx_vect.setZero();
+              gx_vect.setZero();
+              hx_vect.setZero();
+              this->derived().compute_jacobian_adjointgradient_adjointhessian(
+                  x_vect, fx_vect, jx_vect, gx_vect, hx_vect, l_vect);
+            }
+
+            for (int j = 0; j < vsize; j++) {
+              for (int k = 0; k < ORR; k++) {
+                fx[k] = fx_vect[k][j];
+              }
+              if constexpr (Mode != BatchCompute) {
+                for (int k = 0; k < IRR; k++) {
+                  for (int m = 0; m < ORR; m++) {
+                    jx(m, k) = jx_vect(m, k)[j];
+                  }
+                }
+              }
+              if constexpr (Mode == BatchAdjointGradient) {
+                for (int k = 0; k < ORR; k++) {
+                  l[k] = l_vect[k][j];
+                }
+                gx.noalias() = jx.transpose() * l;
+              } else if constexpr (DoHessian) {
+                for (int k = 0; k < IRR; k++) {
+                  gx[k] = gx_vect[k][j];
+                }
+                for (int k = 0; k < IRR; k++) {
+                  for (int m = 0; m < IRR; m++) {
+                    hx(m, k) = hx_vect(m, k)[j];
+                  }
+                }
+              }
+              store(V0 + j, fx, jx, gx, hx);
+            }
+          }
+          ScalarImpl(start + Packs * vsize, stop);
+        };
+
+        // Only try vectorized impl if Derived allows and it is requested
+        if constexpr (Derived::IsVectorizable) {
+          if (vectorize) {
+            VectorImpl(start, stop);
+          } else {
+            ScalarImpl(start, stop);
+          }
+        } else {
+          ScalarImpl(start, stop);
+        }
+      };
+
+      int nthrs = this->derived().thread_safe() ? std::max(1, std::min(thrs, NumCalls)) : 1;
+
+      if (nthrs == 1) {
+        ChunkImpl(0, NumCalls);
+      } else {
+        // The calling thread evaluates the first chunk, the pool the rest
+        auto pool = BatchThreadPool(nthrs - 1);
+        std::vector<std::future<void>> futures(nthrs - 1);
+        auto job = [&](int id, int start, int stop) { ChunkImpl(start, stop); };
+        for (int i = 1; i < nthrs; i++) {
+          int start = (i * NumCalls) / nthrs;
+          int stop = ((i + 1) * NumCalls) / nthrs;
+          futures[i - 1] = pool->push(job, start, stop);
+        }
+        ChunkImpl(0, NumCalls / nthrs);
+        for (auto& fut: futures) {
+          fut.get();
+        }
+      }
+    }
+
+   protected:
+    /*
+     * Checks that each column (axis = 0) or row (axis = 1) of a batched input/output array has size vsize,
+     * and returns the number of calls it contains.
+     */
+    static int batch_size(ConstEigenRef<BatchMatrix> Xs, int vsize, int axis, const char* name) {
+      if (axis != 0 && axis != 1) {
+        throw std::invalid_argument("Batched function call axis must be 0 or 1");
+      }
+      int rows = (axis == 0) ? Xs.rows() : Xs.cols();
+      if (rows != vsize) {
+        throw std::invalid_argument(fmt::format("Incorrectly sized {0:} array for batched function call", name));
+      }
+      return (axis == 0) ? Xs.cols() : Xs.rows();
+    }
+
+    /*
+     * Checks that a batched matrix output array has shape (rows,cols,n) for axis = 0 or (n,rows,cols)
+     * for axis = 1, and returns a pointer to its (C-contiguous) data.
+     */
+    static double* batch_matrix_data(BatchArray& Ms, int rows, int cols, int n, int axis, const char* name) {
+      bool goodshape = (Ms.ndim() == 3);
+      if (goodshape) {
+        if (axis == 0) {
+          goodshape = (Ms.shape(0) == rows && Ms.shape(1) == cols && Ms.shape(2) == n);
+        } else {
+          goodshape = (Ms.shape(0) == n && Ms.shape(1) == rows && Ms.shape(2) == cols);
+        }
+      }
+      if (!goodshape) {
+        throw std::invalid_argument(fmt::format("Incorrectly sized {0:} array for batched function call", name));
+      }
+      return Ms.mutable_data();
+    }
+
+    template<class VecType>
+    static void batch_store_vector(EigenRef<BatchMatrix> Vs, int i, int axis, const VecType& v) {
+      if (axis == 0) {
+        Vs.col(i) = v;
+      } else {
+        Vs.row(i) = v.transpose();
+      }
+    }
+
+    template<class MatType>
+    static void batch_store_matrix(double* Ms, int n, int i, int axis, const MatType& m) {
+      const int rows = m.rows();
+      const int cols = m.cols();
+      for (int r = 0; r < rows; r++) {
+        for (int c = 0; c < cols; c++) {
+          if (axis == 0) {
+            Ms[(r * cols + c) * n + i] = m(r, c);
+          } else {
+            Ms[(i * rows + r) * cols + c] = m(r, c);
+          }
+        }
+      }
+    }
+
+   public:
+
+    ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+    ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
+
     ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
     ///////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////////
 
@@ -1611,7 +1871,6 @@ namespace ASSET {
                 return std::tuple {fx, jx, gx, hx};
               });
 
-
       obj.def("rpt", &Derived::rpt);
       obj.def("vf", &Derived::template MakeGeneric<GenericFunction<-1, -1>>);
 
@@ -1621,6 +1880,190 @@ namespace ASSET {
       }
     }
 
+    /*
+     * Batched overloads of compute,jacobian etc. Inputs are 2D arrays where each column (axis = 0) or row
+     * (axis = 1) is one call of the function. Outputs are written into preallocated arrays, vector outputs
+     * are laid out the same way as the inputs, while matrix outputs must be C-contiguous 3D arrays of
+     * shape (rows,cols,n) for axis = 0 or (n,rows,cols) for axis = 1. These are only bound on GenericFunction
+     * and NumbaVectorFunction, rather than on every expression type in DenseBaseBuild.
+     */
+    template<class PYClass>
+    static void DenseBatchBuild(PYClass& obj) {
+
+      auto ComputeBatch = [](const Derived& func,
+                              ConstEigenRef<BatchMatrix> Xs,
+                              EigenRef<BatchMatrix> FXs,
+                              int axis,
+                              bool vectorize,
+                              int thrs) {
+        int n = batch_size(Xs, func.IRows(), axis, "input");
+        if (batch_size(FXs, func.ORows(), axis, "output") != n)
+          throw std::invalid_argument("Input and output arrays have different numbers of calls");
+
+        py::gil_scoped_release release;
+        func.derived().template batch_evaluate<BatchCompute>(
+            Xs,
+            Xs,
+            axis,
+            vectorize,
+            thrs,
+            [&](int i, const auto& fx, const auto& jx, const auto& gx, const auto& hx) {
+              batch_store_vector(FXs, i, axis, fx);
+            });
+      };
+
+      obj.def("compute",
+              ComputeBatch,
+              py::arg("Xs"),
+              py::arg("FXs"),
+              py::arg("axis"),
+              py::arg("vectorize") = true,
+              py::arg("thrs") = 1);
+      obj.def("__call__",
+              ComputeBatch,
+              py::arg("Xs"),
+              py::arg("FXs"),
+              py::arg("axis"),
+              py::arg("vectorize") = true,
+              py::arg("thrs") = 1);
+
+      obj.def(
+          "jacobian",
+          [](const Derived& func,
+             ConstEigenRef<BatchMatrix> Xs,
+             BatchArray JXs,
+             int axis,
+             bool vectorize,
+             int thrs) {
+            int n = batch_size(Xs, func.IRows(), axis, "input");
+            double* jxs = batch_matrix_data(JXs, func.ORows(), func.IRows(), n, axis, "jacobian");
+
+            py::gil_scoped_release release;
+            func.derived().template batch_evaluate<BatchJacobian>(
+                Xs,
+                Xs,
+                axis,
+                vectorize,
+                thrs,
+                [&](int i, const auto& fx, const auto& jx, const auto& gx, const auto& hx) {
+                  batch_store_matrix(jxs, n, i, axis, jx);
+                });
+          },
+          py::arg("Xs"),
+          py::arg("JXs").noconvert(),
+          py::arg("axis"),
+          py::arg("vectorize") = true,
+          py::arg("thrs") = 1);
+
+      obj.def(
+          "adjointgradient",
+          [](const Derived& func,
+             ConstEigenRef<BatchMatrix> Xs,
+             ConstEigenRef<BatchMatrix> Ls,
+             EigenRef<BatchMatrix> AGXs,
+             int axis,
+             bool vectorize,
+             int thrs) {
+            int n = batch_size(Xs, func.IRows(), axis, "input");
+            if (batch_size(Ls, func.ORows(), axis, "multiplier") != n
+                || batch_size(AGXs, func.IRows(), axis, "adjoint gradient") != n)
+              throw std::invalid_argument("Input and output arrays have different numbers of calls");
+
+            py::gil_scoped_release release;
+            func.derived().template batch_evaluate<BatchAdjointGradient>(
+                Xs,
+                Ls,
+                axis,
+                vectorize,
+                thrs,
+                [&](int i, const auto& fx, const auto& jx, const auto& gx, const auto& hx) {
+                  batch_store_vector(AGXs, i, axis, gx);
+                });
+          },
+          py::arg("Xs"),
+          py::arg("Ls"),
+          py::arg("AGXs"),
+          py::arg("axis"),
+          py::arg("vectorize") = true,
+          py::arg("thrs") = 1);
+
+      obj.def(
+          "adjointhessian",
+          [](const Derived& func,
+             ConstEigenRef<BatchMatrix> Xs,
+             ConstEigenRef<BatchMatrix> Ls,
+             BatchArray AHXs,
+             int axis,
+             bool vectorize,
+             int thrs) {
+            int n = batch_size(Xs, func.IRows(), axis, "input");
+            if (batch_size(Ls, func.ORows(), axis, "multiplier") != n)
+              throw std::invalid_argument("Input and multiplier arrays have different numbers of calls");
+            double* ahxs = batch_matrix_data(AHXs, func.IRows(), func.IRows(), n, axis, "adjoint hessian");
+
+            py::gil_scoped_release release;
+            func.derived().template batch_evaluate<BatchAdjointHessian>(
+                Xs,
+                Ls,
+                axis,
+                vectorize,
+                thrs,
+                [&](int i, const auto& fx, const auto& jx, const auto& gx, const auto& hx) {
+                  batch_store_matrix(ahxs, n, i, axis, hx);
+                });
+          },
+          py::arg("Xs"),
+          py::arg("Ls"),
+          py::arg("AHXs").noconvert(),
+          py::arg("axis"),
+          py::arg("vectorize") = true,
+          py::arg("thrs") = 1);
+
+      obj.def(
+          "computeall",
+          [](const Derived& func,
+             ConstEigenRef<BatchMatrix> Xs,
+             ConstEigenRef<BatchMatrix> Ls,
+             EigenRef<BatchMatrix> FXs,
+             BatchArray JXs,
+             EigenRef<BatchMatrix> AGXs,
+             BatchArray AHXs,
+             int axis,
+             bool vectorize,
+             int thrs) {
+            int n = batch_size(Xs, func.IRows(), axis, "input");
+            if (batch_size(Ls, func.ORows(), axis, "multiplier") != n
+                || batch_size(FXs, func.ORows(), axis, "output") != n
+                || batch_size(AGXs, func.IRows(), axis, "adjoint gradient") != n)
+              throw std::invalid_argument("Input and output arrays have different numbers of calls");
+            double* jxs = batch_matrix_data(JXs, func.ORows(), func.IRows(), n, axis, "jacobian");
+            double* ahxs = batch_matrix_data(AHXs, func.IRows(), func.IRows(), n, axis, "adjoint hessian");
+
+            py::gil_scoped_release release;
+            func.derived().template batch_evaluate<BatchComputeAll>(
+                Xs,
+                Ls,
+                axis,
+                vectorize,
+                thrs,
+                [&](int i, const auto& fx, const auto& jx, const auto& gx, const auto& hx) {
+                  batch_store_vector(FXs, i, axis, fx);
+                  batch_store_matrix(jxs, n, i, axis, jx);
+                  batch_store_vector(AGXs, i, axis, gx);
+                  batch_store_matrix(ahxs, n, i, axis, hx);
+                });
+          },
+          py::arg("Xs"),
+          py::arg("Ls"),
+          py::arg("FXs"),
+          py::arg("JXs").noconvert(),
+          py::arg("AGXs"),
+          py::arg("AHXs").noconvert(),
+          py::arg("axis"),
+          py::arg("vectorize") = true,
+          py::arg("thrs") = 1);
+    }
+
     template<class PYClass>
     static void DoubleMathBuild(PYClass& obj) {
       using Gen = GenericFunction<-1, -1>;
@@ -52,4 +52,12 @@ namespace ASSET {
     Inactive = 3,
     BiLinear = 4,
   };
+
+  enum BatchEvalModes {
+    BatchCompute,
+    BatchJacobian,
+    BatchAdjointGradient,
+    BatchAdjointHessian,
+    BatchComputeAll,
+  };
 }  // namespace ASSET
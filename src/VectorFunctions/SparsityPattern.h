@@ -0,0 +1,138 @@
+/*
+File Name: SparsityPattern.h
+
+File Description: Implements the SparsityPattern struct, which detects the structurally non-zero elements of
+a dense vector function's jacobian and adjoint hessian by evaluating them at sample inputs. A function holding
+one reports only those elements through the JacobianElemIsNonZero/HessianElemIsNonZero and AddJacobianElem/
+AddHessianElem hooks of DenseFunctionBase, so that NonLinearProgram only reserves and fills those entries
+of the KKT matrix.
+
+////////////////////////////////////////////////////////////////////////////////
+
+Usage of this source code is governed by the license found
+in the LICENSE file in ASSET's top level directory.
+
+*/
+
+#pragma once
+
+#include <random>
+
+#include "pch.h"
+
+namespace ASSET {
+
+  struct SparsityPattern {
+    using BoolMatrix = Eigen::Matrix<bool, -1, -1>;
+
+    /// <summary>
+    /// If false, every element is reported as non-zero.
+    /// </summary>
+    bool Active = false;
+    BoolMatrix JacobianNZ;
+    BoolMatrix HessianNZ;
+
+    SparsityPattern() {
+    }
+
+    void reset() {
+      this->Active = false;
+      this->JacobianNZ.resize(0, 0);
+      this->HessianNZ.resize(0, 0);
+    }
+
+    inline bool jacobian_nz(int row, int col) const {
+      return !this->Active || this->JacobianNZ(row, col);
+    }
+    inline bool hessian_nz(int row, int col) const {
+      return !this->Active || this->HessianNZ(row, col);
+    }
+
+    inline void add_jacobian_elem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      if (this->jacobian_nz(row, col)) {
+        mpt[lpt[freeloc]] += v;
+        freeloc++;
+      }
+    }
+    inline void add_hessian_elem(double v, int row, int col, double* mpt, const int* lpt, int& freeloc) const {
+      if (this->hessian_nz(row, col)) {
+        mpt[lpt[freeloc]] += v;
+        freeloc++;
+      }
+    }
+
+    int jacobian_nnz() const {
+      return this->JacobianNZ.count();
+    }
+    /// <summary>
+    /// Non-zeros in the lower triangle of the hessian, which is all that is placed in the KKT matrix.
+    /// </summary>
+    int hessian_nnz() const {
+      int nnz = 0;
+      for (int i = 0; i < this->HessianNZ.cols(); i++)
+        nnz += this->HessianNZ.col(i).tail(this->HessianNZ.rows() - i).count();
+      return nnz;
+    }
+
+    /*
+    Evaluates the jacobian and adjoint hessian of func a few times around each sample input, every time
+    with a small relative perturbation and random positive multipliers, and marks every element that is
+    non-zero (or NaN) at any of them. Elements that vanish at every probe are treated as structurally zero.
+    This is exact for derivatives that are either identically zero or zero only on a set of measure zero,
+    but functions that branch (ifelse, sign, etc.) must be sampled in every branch they can take.
+    */
+    template<class Func>
+    void detect(const Func& func, const std::vector<Eigen::VectorXd>& xs, int probes = 3) {
+      using Input = typename Func::template Input<double>;
+      using Output = typename Func::template Output<double>;
+      using Jacobian = typename Func::template Jacobian<double>;
+      using Gradient = typename Func::template Gradient<double>;
+      using Hessian = typename Func::template Hessian<double>;
+
+      const int irows = func.IRows();
+      const int orows = func.ORows();
+
+      this->JacobianNZ.setConstant(orows, irows, false);
+      this->HessianNZ.setConstant(irows, irows, false);
+
+      std::mt19937 gen(irows + 101 * orows);
+      std::uniform_real_distribution<double> pert(-1.0, 1.0);
+      std::uniform_real_distribution<double> mult(0.5, 1.5);
+
+      Input x(irows);
+      Output fx(orows);
+      Output lm(orows);
+      Jacobian jx(orows, irows);
+      Gradient gx(irows);
+      Hessian hx(irows, irows);
+
+      for (const auto& x0: xs) {
+        if (x0.size() != irows) {
+          auto msg = fmt::format("Sparsity sample input has {0} rows, but the function has {1} input rows.\n",
+                                 x0.size(),
+                                 irows);
+          throw std::invalid_argument(msg);
+        }
+        for (int p = 0; p < probes; p++) {
+          for (int i = 0; i < irows; i++)
+            x[i] = x0[i] + 1.0e-6 * (1.0 + std::abs(x0[i])) * pert(gen);
+          for (int i = 0; i < orows; i++)
+            lm[i] = mult(gen);
+
+          fx.setZero();
+          jx.setZero();
+          gx.setZero();
+          hx.setZero();
+          func.compute_jacobian_adjointgradient_adjointhessian(x, fx, jx, gx, hx, lm);
+
+          // != is true for NaNs, so they are kept as non-zeros
+          this->JacobianNZ = this->JacobianNZ.array() || (jx.array() != 0.0);
+          this->HessianNZ = this->HessianNZ.array() || (hx.array() != 0.0) || (hx.transpose().array() != 0.0);
+        }
+      }
+
+      this->Active = !xs.empty();
+    }
+  };
+
+}  // namespace ASSET
@@ -402,6 +402,7 @@ namespace ASSET {
       obj.def("SpeedTest", &Derived::SpeedTest);
 
       Base::DenseBaseBuild(obj);
+      Base::DenseBatchBuild(obj);
     }
   };
 